@@ -0,0 +1 @@
+"""Performance benchmarks for the documentation tools (not shipped with the package)."""
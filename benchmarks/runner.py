@@ -0,0 +1,394 @@
+"""Benchmark every documentation tool against synthetic catalogues of several sizes."""
+
+import argparse
+import gc
+import json
+import logging
+import platform
+import random
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from j_quants_doc_mcp import server
+from j_quants_doc_mcp.loadtest import sample_property_name
+from j_quants_doc_mcp.metrics import percentile
+from j_quants_doc_mcp.resources.snapshot import DataSnapshot
+from j_quants_doc_mcp.resources.store import set_snapshot
+
+from .synthetic import generate_documents, load_shipped_documents
+
+# レポートの形式のバージョン(キーを変更した場合に上げる)
+REPORT_FORMAT = 1
+
+# 既定で計測する倍率(1は同梱データそのまま)
+DEFAULT_SCALES = (1, 10, 100, 1000)
+
+# 既定の計測回数(ツールごと、倍率ごと)
+DEFAULT_ITERATIONS = 200
+
+# 計測前に実行する回数(キャッシュやインデックスの初回構築を計測から除く)
+WARMUP_ITERATIONS = 5
+
+# メモリ計測で実行する回数(tracemalloc は実行を遅くするため、時間の計測とは分ける)
+MEMORY_ITERATIONS = 20
+
+# 検索で使うキーワード(日本語・英語・複数語)
+SEARCH_KEYWORDS = (
+    "株価",
+    "財務",
+    "equities",
+    "daily bars",
+    "指数 日次",
+    "信用取引",
+    "オプション",
+    "calendar",
+)
+
+# FAQ回答で使う質問
+QUESTIONS = (
+    "認証方法は?",
+    "レート制限について教えて",
+    "ページネーションの使い方",
+    "過去の株価を一括でダウンロードしたい",
+    "財務情報の取得方法",
+)
+
+BENCHMARKED_TOOLS = (
+    "search_endpoints",
+    "describe_endpoint",
+    "generate_sample_code",
+    "answer_question",
+    "lookup_property",
+    "get_pattern",
+)
+
+Workload = list[tuple[Callable[..., Any], dict[str, Any]]]
+
+
+def _build_workloads(
+    snapshot: DataSnapshot, iterations: int, seed: int
+) -> dict[str, Workload]:
+    """ツールごとの呼び出し(関数と引数)の列を、カタログから乱数で作成する。"""
+    rng = random.Random(seed)
+    names = [endpoint["name"] for endpoint in snapshot.endpoints]
+    faq_questions = [faq["question"] for faq in snapshot.faqs]
+    pattern_names = [pattern["pattern_name"] for pattern in snapshot.patterns]
+
+    def lookup_args() -> dict[str, Any]:
+        endpoint = rng.choice(snapshot.endpoints)
+        return {
+            "property_name": sample_property_name(endpoint, rng),
+            "endpoint_name": endpoint["name"] if rng.random() < 0.5 else None,
+        }
+
+    generators: dict[str, Callable[[], dict[str, Any]]] = {
+        "search_endpoints": lambda: {"keyword": rng.choice(SEARCH_KEYWORDS)},
+        "describe_endpoint": lambda: {"endpoint_name": rng.choice(names)},
+        "generate_sample_code": lambda: {"endpoint_name": rng.choice(names)},
+        "answer_question": lambda: {
+            "question": rng.choice(QUESTIONS + tuple(rng.sample(faq_questions, 1)))
+        },
+        "lookup_property": lookup_args,
+        "get_pattern": lambda: {
+            "pattern_name": rng.choice(pattern_names) if rng.random() < 0.8 else None
+        },
+    }
+    count = WARMUP_ITERATIONS + iterations
+    return {
+        name: [(getattr(server, name), generate()) for _ in range(count)]
+        for name, generate in generators.items()
+    }
+
+
+def _measure_tool(workload: Workload) -> dict[str, Any]:
+    """1つのツールの処理時間(各呼び出し)とピークメモリを計測する。"""
+    for func, kwargs in workload[:WARMUP_ITERATIONS]:
+        func(**kwargs)
+
+    calls = workload[WARMUP_ITERATIONS:]
+    latencies = []
+    gc.collect()
+    started = time.perf_counter()
+    for func, kwargs in calls:
+        call_started = time.perf_counter()
+        func(**kwargs)
+        latencies.append(time.perf_counter() - call_started)
+    elapsed = time.perf_counter() - started
+
+    tracemalloc.start()
+    baseline, _ = tracemalloc.get_traced_memory()
+    for func, kwargs in calls[:MEMORY_ITERATIONS]:
+        func(**kwargs)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    latencies.sort()
+    return {
+        "calls": len(calls),
+        "throughput_per_second": round(len(calls) / elapsed, 1),
+        "latency_ms": {
+            "p50": round(percentile(latencies, 50) * 1000, 4),
+            "p95": round(percentile(latencies, 95) * 1000, 4),
+            "p99": round(percentile(latencies, 99) * 1000, 4),
+            "mean": round(sum(latencies) / len(latencies) * 1000, 4),
+            "max": round(latencies[-1] * 1000, 4),
+        },
+        "peak_memory_bytes": peak - baseline,
+    }
+
+
+def _max_rss_bytes() -> int:
+    """プロセスの最大常駐メモリ(バイト)。"""
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux はキロバイト、macOS はバイト単位
+    return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+def benchmark_scale(
+    scale: int,
+    iterations: int = DEFAULT_ITERATIONS,
+    seed: int = 0,
+    base: dict[str, dict[str, Any]] | None = None,
+    tools: tuple[str, ...] = BENCHMARKED_TOOLS,
+) -> dict[str, Any]:
+    """1つの倍率のカタログで各ツールを計測する。
+
+    Args:
+        scale: 同梱データに対する倍率
+        iterations: ツールごとの計測回数
+        seed: 呼び出す引数を選ぶ乱数のシード(同じ値なら同じ呼び出し列になる)
+        base: 複製元のデータ(省略時は同梱のデータファイル)
+        tools: 計測するツール名
+
+    Returns:
+        catalogue(件数と構築時間)と tools(ツール名から計測結果)を含む辞書
+    """
+    documents = generate_documents(scale, base)
+    started = time.perf_counter()
+    snapshot = DataSnapshot.from_documents(
+        endpoints=documents["endpoints.json"],
+        faqs=documents["faq.json"],
+        reference_data=documents["reference_data.json"],
+        patterns=documents["patterns.json"],
+    )
+    build_seconds = time.perf_counter() - started
+    del documents
+
+    set_snapshot(snapshot)
+    try:
+        workloads = _build_workloads(snapshot, iterations, seed)
+        results = {name: _measure_tool(workloads[name]) for name in tools}
+    finally:
+        set_snapshot(None)
+
+    return {
+        "catalogue": {
+            "endpoints": len(snapshot.endpoints),
+            "faqs": len(snapshot.faqs),
+            "reference_data": len(snapshot.reference_data),
+            "patterns": len(snapshot.patterns),
+            "build_seconds": round(build_seconds, 3),
+            "process_max_rss_bytes": _max_rss_bytes(),
+        },
+        "tools": results,
+    }
+
+
+def _git_commit() -> str | None:
+    """計測対象のコミット(git が使えない場合はNone)。"""
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=Path(__file__).parent,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+
+def run_benchmarks(
+    scales: tuple[int, ...] = DEFAULT_SCALES,
+    iterations: int = DEFAULT_ITERATIONS,
+    seed: int = 0,
+    tools: tuple[str, ...] = BENCHMARKED_TOOLS,
+    progress: Callable[[str], None] | None = None,
+) -> dict[str, Any]:
+    """全ての倍率で計測し、比較可能なレポートを返す。
+
+    Args:
+        scales: 計測する倍率
+        iterations: ツールごとの計測回数
+        seed: 呼び出す引数を選ぶ乱数のシード
+        tools: 計測するツール名
+        progress: 進捗メッセージを受け取る関数
+
+    Returns:
+        format、environment、settings、scales(倍率から benchmark_scale の結果)を含む辞書
+    """
+    base = load_shipped_documents()
+    report_scales = {}
+    for scale in scales:
+        if progress is not None:
+            progress(f"Benchmarking scale {scale}x")
+        report_scales[str(scale)] = benchmark_scale(
+            scale, iterations=iterations, seed=seed, base=base, tools=tools
+        )
+    return {
+        "format": REPORT_FORMAT,
+        "environment": {
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "settings": {"iterations": iterations, "seed": seed, "tools": list(tools)},
+        "scales": report_scales,
+    }
+
+
+def _change(after: float, before: float) -> float | None:
+    """before に対する after の変化率(before が0の場合はNone)。"""
+    return after / before - 1 if before else None
+
+
+def compare_reports(
+    baseline: dict[str, Any], current: dict[str, Any]
+) -> list[dict[str, Any]]:
+    """2つのレポートで共通する倍率・ツールについて、計測値の変化率を求める。
+
+    Returns:
+        scale、tool、p50・p95・p99・throughput の変化率(current / baseline - 1)の辞書のリスト。
+        処理時間は正の値、スループットは負の値が悪化を表す。
+    """
+    rows = []
+    for scale, result in current["scales"].items():
+        baseline_tools = baseline["scales"].get(scale, {}).get("tools", {})
+        for tool, measured in result["tools"].items():
+            before = baseline_tools.get(tool)
+            if before is None:
+                continue
+            row = {"scale": int(scale), "tool": tool}
+            for key in ("p50", "p95", "p99"):
+                row[key] = _change(
+                    measured["latency_ms"][key], before["latency_ms"][key]
+                )
+            row["throughput"] = _change(
+                measured["throughput_per_second"], before["throughput_per_second"]
+            )
+            rows.append(row)
+    return rows
+
+
+def _print_summary(report: dict[str, Any]) -> None:
+    """レポートを表形式で標準出力に表示する。"""
+    print(
+        f"{'scale':>6} {'tool':<22} {'ops/s':>10} {'p50 ms':>9} {'p95 ms':>9} "
+        f"{'p99 ms':>9} {'peak KiB':>9}"
+    )
+    for scale, result in report["scales"].items():
+        for tool, measured in result["tools"].items():
+            latency = measured["latency_ms"]
+            print(
+                f"{scale + 'x':>6} {tool:<22} {measured['throughput_per_second']:>10} "
+                f"{latency['p50']:>9.3f} {latency['p95']:>9.3f} {latency['p99']:>9.3f} "
+                f"{measured['peak_memory_bytes'] // 1024:>9}"
+            )
+
+
+def main(argv: list[str] | None = None) -> int:
+    """ベンチマークを実行し、レポートを書き出す。
+
+    Returns:
+        終了コード(--max-regression を超えて悪化した場合は1)
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Benchmark the documentation tools on synthetic catalogues.",
+    )
+    parser.add_argument(
+        "--scales",
+        default=",".join(str(scale) for scale in DEFAULT_SCALES),
+        help="comma-separated catalogue sizes relative to the shipped data "
+        "(default: %(default)s)",
+    )
+    parser.add_argument(
+        "--iterations",
+        type=int,
+        default=DEFAULT_ITERATIONS,
+        help="timed calls per tool and scale (default: %(default)s)",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="workload seed")
+    parser.add_argument(
+        "--tools",
+        default=",".join(BENCHMARKED_TOOLS),
+        help="comma-separated tools to benchmark (default: all)",
+    )
+    parser.add_argument(
+        "--output", type=Path, help="write the JSON report to this path"
+    )
+    parser.add_argument(
+        "--baseline", type=Path, help="JSON report of an earlier run to compare with"
+    )
+    parser.add_argument(
+        "--max-regression",
+        type=float,
+        help="exit with status 1 if any p95 latency grew by more than this "
+        "fraction over the baseline (e.g. 0.2)",
+    )
+    args = parser.parse_args(argv)
+
+    # ツールのログ出力は計測対象外のため、エラー以外は出力しない
+    logging.getLogger("j_quants_doc_mcp").setLevel(logging.ERROR)
+
+    scales = tuple(int(scale) for scale in args.scales.split(","))
+    tools = tuple(tool for tool in args.tools.split(",") if tool)
+    unknown = set(tools) - set(BENCHMARKED_TOOLS)
+    if unknown:
+        parser.error(f"unknown tools: {', '.join(sorted(unknown))}")
+
+    report = run_benchmarks(
+        scales,
+        iterations=args.iterations,
+        seed=args.seed,
+        tools=tools,
+        progress=lambda message: print(message, file=sys.stderr),
+    )
+    _print_summary(report)
+
+    if args.output is not None:
+        args.output.write_text(
+            json.dumps(report, indent=2, sort_keys=True) + "\n", encoding="utf-8"
+        )
+        print(f"Report written to {args.output}", file=sys.stderr)
+
+    if args.baseline is None:
+        return 0
+
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    regressed = False
+    print()
+    print(f"{'scale':>6} {'tool':<22} {'p50':>8} {'p95':>8} {'p99':>8} {'ops/s':>8}")
+    for row in compare_reports(baseline, report):
+        changes = [
+            "n/a" if row[key] is None else f"{row[key]:+.1%}"
+            for key in ("p50", "p95", "p99", "throughput")
+        ]
+        print(
+            f"{str(row['scale']) + 'x':>6} {row['tool']:<22} "
+            + " ".join(f"{change:>8}" for change in changes)
+        )
+        if (
+            args.max_regression is not None
+            and row["p95"] is not None
+            and row["p95"] > args.max_regression
+        ):
+            regressed = True
+    return 1 if regressed else 0
@@ -0,0 +1,141 @@
+"""Synthetic catalogues scaled up from the shipped data files, for benchmarking."""
+
+import copy
+import json
+from pathlib import Path
+from typing import Any
+
+from j_quants_doc_mcp.models.endpoint import EndpointCollection
+from j_quants_doc_mcp.models.pattern import PatternCollection
+from j_quants_doc_mcp.resources.specifications import DATA_FILES, get_data_directory
+
+
+def load_shipped_documents(data_dir: Path | None = None) -> dict[str, dict[str, Any]]:
+    """同梱のデータファイルを、ファイル名から内容(辞書)への辞書として読み込む。"""
+    if data_dir is None:
+        data_dir = get_data_directory()
+    documents = {}
+    for file_name in DATA_FILES:
+        with open(data_dir / file_name, encoding="utf-8") as f:
+            documents[file_name] = json.load(f)
+    return documents
+
+
+def _replica_name(name: str, replica: int) -> str:
+    """複製番号を付けたエンドポイント名(0番目は元の名前のまま)。"""
+    return name if replica == 0 else f"{name}-s{replica}"
+
+
+def _replicate_endpoint(endpoint: dict[str, Any], replica: int) -> dict[str, Any]:
+    """エンドポイント定義を複製し、名前・パス・説明を複製ごとに変える。"""
+    endpoint = copy.deepcopy(endpoint)
+    endpoint["name"] = _replica_name(endpoint["name"], replica)
+    endpoint["path"] = f"{endpoint['path']}/s{replica}"
+    if endpoint.get("path_old"):
+        endpoint["path_old"] = f"{endpoint['path_old']}/s{replica}"
+    endpoint["name_ja"] = f"{endpoint['name_ja']} 第{replica}系列"
+    endpoint["name_en"] = f"{endpoint['name_en']} Series {replica}"
+    endpoint["description"] = f"{endpoint['description']} (合成データ 第{replica}系列)"
+    return endpoint
+
+
+def _replicate_faq(faq: dict[str, Any], replica: int) -> dict[str, Any]:
+    """FAQを複製し、質問文と関連エンドポイントを複製ごとに変える。"""
+    faq = copy.deepcopy(faq)
+    faq["question"] = f"{faq['question']} (第{replica}系列)"
+    faq["related_endpoints"] = [
+        _replica_name(name, replica) for name in faq.get("related_endpoints", [])
+    ]
+    return faq
+
+
+def _replicate_reference(entry: dict[str, Any], replica: int) -> dict[str, Any]:
+    """参照データを複製し、名前と関連プロパティのエンドポイントを複製ごとに変える。"""
+    entry = copy.deepcopy(entry)
+    entry["name"] = _replica_name(entry["name"], replica)
+    for prop in entry.get("related_properties", []):
+        prop["endpoint"] = _replica_name(prop["endpoint"], replica)
+    return entry
+
+
+def _replicate_pattern(pattern: dict[str, Any], replica: int) -> dict[str, Any]:
+    """実装パターンを複製し、名前と関連エンドポイントを複製ごとに変える。"""
+    pattern = copy.deepcopy(pattern)
+    if replica:
+        pattern["pattern_name"] = f"{pattern['pattern_name']} #{replica}"
+    pattern["related_endpoints"] = [
+        _replica_name(name, replica) for name in pattern.get("related_endpoints", [])
+    ]
+    return pattern
+
+
+def generate_documents(
+    scale: int, base: dict[str, dict[str, Any]] | None = None
+) -> dict[str, dict[str, Any]]:
+    """同梱データを scale 倍に複製した合成カタログを生成する。
+
+    0番目の複製は同梱データそのままのため、実在のエンドポイント名
+    (例: eq-master)も引き続き参照できる。複製ごとに名前・パス・説明文を
+    変えるため、検索インデックスの語彙と文書数も scale 倍になる。
+    生成結果は EndpointCollection と PatternCollection で検証する。
+
+    Args:
+        scale: 同梱データに対する倍率(1以上)
+        base: 複製元のデータ(省略時は同梱のデータファイル)
+
+    Returns:
+        ファイル名(endpoints.json 等)から内容への辞書
+
+    Raises:
+        ValueError: scale が1未満の場合
+        pydantic.ValidationError: 生成したデータが検証に失敗した場合
+    """
+    if scale < 1:
+        raise ValueError(f"scale must be at least 1: {scale}")
+    if base is None:
+        base = load_shipped_documents()
+
+    replicas = range(scale)
+    documents = {
+        "endpoints.json": {
+            "endpoints": [
+                _replicate_endpoint(endpoint, replica)
+                for replica in replicas
+                for endpoint in base["endpoints.json"]["endpoints"]
+            ]
+        },
+        "faq.json": {
+            "faqs": [
+                _replicate_faq(faq, replica)
+                for replica in replicas
+                for faq in base["faq.json"]["faqs"]
+            ]
+        },
+        "reference_data.json": {
+            "reference_data": [
+                _replicate_reference(entry, replica)
+                for replica in replicas
+                for entry in base["reference_data.json"]["reference_data"]
+            ]
+        },
+        "patterns.json": {
+            "patterns": [
+                _replicate_pattern(pattern, replica)
+                for replica in replicas
+                for pattern in base["patterns.json"]["patterns"]
+            ]
+        },
+    }
+
+    EndpointCollection(**documents["endpoints.json"])
+    PatternCollection(**documents["patterns.json"])
+    return documents
+
+
+def write_documents(documents: dict[str, dict[str, Any]], data_dir: Path) -> Path:
+    """生成したカタログをデータディレクトリ形式で書き出す(load_snapshot で読み込める)。"""
+    data_dir.mkdir(parents=True, exist_ok=True)
+    for file_name, document in documents.items():
+        with open(data_dir / file_name, "w", encoding="utf-8") as f:
+            json.dump(document, f, ensure_ascii=False)
+    return data_dir
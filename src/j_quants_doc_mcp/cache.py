@@ -0,0 +1,104 @@
+"""Bounded, thread-safe LRU cache with generation-based invalidation."""
+
+import threading
+from collections import OrderedDict
+from collections.abc import Hashable
+from typing import Any
+
+
+class LRUCache:
+    """サイズ上限付きのLRUキャッシュ。
+
+    キャッシュした値は「世代」(データやテンプレートのバージョン)に紐づく。
+    validate() で現在の世代を渡し、前回と異なる場合は全エントリを破棄する。
+    複数スレッドから同時に呼び出しても安全。
+    """
+
+    def __init__(self, maxsize: int = 128):
+        """キャッシュを初期化。
+
+        Args:
+            maxsize: 保持する最大エントリ数(1以上)
+
+        Raises:
+            ValueError: maxsize が1未満の場合
+        """
+        if maxsize < 1:
+            raise ValueError("maxsize は1以上を指定してください")
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[Hashable, Any] = OrderedDict()
+        self._generation: Hashable = None
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def validate(self, generation: Hashable) -> None:
+        """現在の世代を通知し、世代が変わっていればキャッシュを破棄する。
+
+        Args:
+            generation: キャッシュした値の元になったデータの世代
+        """
+        with self._lock:
+            if generation != self._generation:
+                if self._entries:
+                    self.invalidations += 1
+                self._entries.clear()
+                self._generation = generation
+
+    def get(self, key: Hashable) -> Any | None:
+        """キーに対応する値を取得する(存在しない場合はNone)。"""
+        with self._lock:
+            try:
+                value = self._entries[key]
+            except KeyError:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any, generation: Hashable = None) -> None:
+        """値を保存する。上限を超えた場合は最も古く使われたエントリを破棄する。
+
+        Args:
+            key: キー
+            value: 値
+            generation: 値の元になったデータの世代(validate() に渡したもの)。
+                指定した場合、その後に世代が変わっていれば古いデータから作った値を
+                新しい世代のキャッシュに残さないよう、保存しない。
+        """
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """全エントリと統計情報を破棄する。"""
+        with self._lock:
+            self._entries.clear()
+            self._generation = None
+            self.hits = 0
+            self.misses = 0
+            self.invalidations = 0
+
+    def info(self) -> dict[str, int]:
+        """キャッシュの統計情報を返す。
+
+        Returns:
+            hits, misses, invalidations, size, maxsize を含む辞書
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+            }
@@ -2,9 +2,145 @@
 
 from __future__ import annotations
 
+import math
 import sys
 
 
+def _get_option(argv: list[str], name: str) -> str | None:
+    """--name value または --name=value 形式のオプション値を取得する。"""
+    for i, arg in enumerate(argv):
+        if arg == name and i + 1 < len(argv):
+            return argv[i + 1]
+        if arg.startswith(name + "="):
+            return arg.split("=", 1)[1]
+    return None
+
+
+def _build_snapshot(argv: list[str]) -> int:
+    """コンパイル済みスナップショットとプリコンパイル済みテンプレートを生成する。"""
+    from pathlib import Path
+
+    from jinja2 import TemplateError
+
+    from j_quants_doc_mcp.resources.specifications import (
+        DataLoadError,
+        compile_snapshot,
+    )
+    from j_quants_doc_mcp.resources.templates import compile_templates
+
+    output = _get_option(argv, "--output")
+    try:
+        output_path = compile_snapshot(output_path=Path(output) if output else None)
+    except DataLoadError as e:
+        print(f"Error building snapshot: {e}", file=sys.stderr)
+        return 1
+
+    print(f"Snapshot written to {output_path}")
+
+    try:
+        templates_path = compile_templates()
+    except (OSError, TemplateError) as e:
+        print(f"Error compiling templates: {e}", file=sys.stderr)
+        return 1
+
+    print(f"Templates compiled to {templates_path}")
+    return 0
+
+
+def _load_test(argv: list[str]) -> int:
+    """並行するMCPセッションからツールを呼び出し、ツールごとの性能を表示する。"""
+    import asyncio
+    import json
+    import os
+    import shlex
+    from pathlib import Path
+
+    from j_quants_doc_mcp.loadtest import (
+        DEFAULT_CALLS,
+        DEFAULT_MIX,
+        DEFAULT_SESSIONS,
+        SESSION_ERRORS,
+        build_workloads,
+        format_report,
+        http_connector,
+        parse_mix,
+        run_load,
+        stdio_connector,
+    )
+    from j_quants_doc_mcp.resources.specifications import (
+        DataLoadError,
+        load_snapshot,
+    )
+
+    url = _get_option(argv, "--url")
+    command = _get_option(argv, "--command")
+    if url and command:
+        print("--url and --command are mutually exclusive", file=sys.stderr)
+        return 1
+
+    counts: dict[str, int] = {}
+    for name, default, minimum in (
+        ("--sessions", DEFAULT_SESSIONS, 1),
+        ("--calls", DEFAULT_CALLS, 1),
+        ("--seed", 0, 0),
+    ):
+        count_option = _get_option(argv, name)
+        try:
+            counts[name] = default if count_option is None else int(count_option)
+        except ValueError:
+            counts[name] = minimum - 1
+        if counts[name] < minimum:
+            print(f"Invalid {name}: {count_option}", file=sys.stderr)
+            return 1
+
+    mix_option = _get_option(argv, "--mix")
+    try:
+        mix = parse_mix(mix_option) if mix_option else DEFAULT_MIX
+    except ValueError as e:
+        print(f"Invalid --mix: {e}", file=sys.stderr)
+        return 1
+
+    try:
+        snapshot = load_snapshot()
+    except DataLoadError as e:
+        print(f"Error loading data files: {e}", file=sys.stderr)
+        return 1
+    workloads = build_workloads(
+        snapshot, mix, counts["--sessions"], counts["--calls"], counts["--seed"]
+    )
+
+    # stdio で起動したサーバのログは表示しない
+    try:
+        with open(os.devnull, "w") as errlog:
+            if url:
+                connect = http_connector(url)
+            elif command:
+                connect = stdio_connector(shlex.split(command), errlog)
+            else:
+                connect = stdio_connector(
+                    [sys.executable, "-m", "j_quants_doc_mcp.cli"], errlog
+                )
+            report = asyncio.run(run_load(connect, workloads))
+    except Exception as e:
+        # 接続エラーはタスクグループの例外にまとめられるため、元の例外を確認する
+        cause: BaseException = e
+        while getattr(cause, "exceptions", None):
+            cause = cause.exceptions[0]
+        if not isinstance(cause, SESSION_ERRORS):
+            raise
+        print(f"Error running load test: {cause!r}", file=sys.stderr)
+        return 1
+
+    print(format_report(report))
+    output = _get_option(argv, "--output")
+    if output:
+        Path(output).write_text(
+            json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8"
+        )
+        print(f"Report written to {output}")
+    return 1 if report["errors"] else 0
+
+
 def main(argv: list[str] | None = None) -> int:
     """Entry point for j-quants-doc-mcp CLI.
 
@@ -21,21 +157,117 @@ def main(argv: list[str] | None = None) -> int:
         print("J-Quants Documentation MCP Server")
         print()
         print("Usage: j-quants-doc-mcp [options]")
+        print("       j-quants-doc-mcp build-snapshot [--output PATH]")
+        print("       j-quants-doc-mcp loadtest [--url URL | --command CMD]")
+        print(
+            "                                 [--sessions N] [--calls N] [--mix SPEC]"
+        )
+        print("                                 [--seed N] [--output PATH]")
+        print()
+        print("Commands:")
+        print("  build-snapshot Validate data files and write a compiled snapshot")
+        print("                 and precompiled code generation templates")
+        print("  loadtest       Replay a mix of tools over concurrent MCP sessions")
+        print("                 and report throughput and latency per tool.")
+        print("                 Connects to --url (streamable-http) or starts one")
+        print("                 stdio server per session (--command, default: this")
+        print("                 server). --mix takes tool=weight pairs separated")
+        print("                 by commas.")
         print()
         print("Options:")
         print("  -h, --help     Show this help message and exit")
         print("  --version      Show version information")
+        print("  --reload-interval SECONDS")
+        print("                 Reload data files when they change on disk")
+        print("  --transport {stdio,streamable-http,sse}")
+        print("                 Transport to serve over (default: stdio)")
+        print("  --host HOST    Host to listen on for HTTP transports")
+        print("                 (default: 127.0.0.1)")
+        print("  --port PORT    Port to listen on for HTTP transports (default: 8000)")
+        print("  --workers N    Number of worker processes for streamable-http")
+        print("                 (default: 1). Data is loaded once and shared by")
+        print("                 forked workers.")
+        print("  --query-threads N")
+        print("                 Threads per process for search, describe and Q&A")
+        print("                 tools (default: 4)")
+        print("  --codegen-threads N")
+        print("                 Threads per process for code generation tools")
+        print("                 (default: 2)")
         return 0
 
     if "--version" in argv:
         print("j-quants-doc-mcp version 0.1.0")
         return 0
 
+    if argv and argv[0] == "build-snapshot":
+        return _build_snapshot(argv[1:])
+
+    if argv and argv[0] == "loadtest":
+        return _load_test(argv[1:])
+
+    reload_interval = None
+    reload_option = _get_option(argv, "--reload-interval")
+    if reload_option is not None:
+        try:
+            reload_interval = float(reload_option)
+        except ValueError:
+            reload_interval = math.nan
+        if not (math.isfinite(reload_interval) and reload_interval > 0):
+            print(f"Invalid --reload-interval: {reload_option}", file=sys.stderr)
+            return 1
+
+    transport = _get_option(argv, "--transport") or "stdio"
+    if transport not in ("stdio", "streamable-http", "sse"):
+        print(f"Invalid --transport: {transport}", file=sys.stderr)
+        return 1
+
+    host = _get_option(argv, "--host") or "127.0.0.1"
+
+    port_option = _get_option(argv, "--port") or "8000"
+    workers_option = _get_option(argv, "--workers") or "1"
+    try:
+        port = int(port_option)
+    except ValueError:
+        print(f"Invalid --port: {port_option}", file=sys.stderr)
+        return 1
+    try:
+        workers = int(workers_option)
+    except ValueError:
+        workers = 0
+    if workers < 1:
+        print(f"Invalid --workers: {workers_option}", file=sys.stderr)
+        return 1
+    if workers > 1 and transport != "streamable-http":
+        print("--workers requires --transport streamable-http", file=sys.stderr)
+        return 1
+
+    threads: dict[str, int | None] = {}
+    for name in ("--query-threads", "--codegen-threads"):
+        threads_option = _get_option(argv, name)
+        if threads_option is None:
+            threads[name] = None
+            continue
+        try:
+            threads[name] = int(threads_option)
+        except ValueError:
+            threads[name] = 0
+        if threads[name] < 1:
+            print(f"Invalid {name}: {threads_option}", file=sys.stderr)
+            return 1
+
     # Start the MCP server
     from j_quants_doc_mcp.server import run_server
 
     try:
-        run_server()
+        run_server(
+            reload_interval=reload_interval,
+            transport=transport,
+            host=host,
+            port=port,
+            workers=workers,
+            query_threads=threads["--query-threads"],
+            codegen_threads=threads["--codegen-threads"],
+        )
         return 0
     except KeyboardInterrupt:
         print("\nServer stopped by user")
@@ -73,7 +73,10 @@ def format_validation_error(field: str, message: str) -> dict[str, Any]:
 
 
 def format_not_found_error(
-    resource_type: str, identifier: str, suggestion: str | None = None
+    resource_type: str,
+    identifier: str,
+    suggestion: str | None = None,
+    candidates: list[dict[str, Any]] | None = None,
 ) -> dict[str, Any]:
     """リソース未検出エラーを整形したメッセージを返す。
 
@@ -81,6 +84,7 @@ def format_not_found_error(
         resource_type: リソースの種類(例: "エンドポイント", "カテゴリ")
         identifier: リソースの識別子
         suggestion: オプションの提案メッセージ
+        candidates: オプションの候補(類似度の高い順)。指定した場合は details に含める
 
     Returns:
         エラー情報を含む辞書
@@ -89,14 +93,15 @@ def format_not_found_error(
     if suggestion:
         message += f" {suggestion}"
 
-    return NotFoundError(
-        message=message,
-        details={
-            "resource_type": resource_type,
-            "identifier": identifier,
-            "suggestion": suggestion,
-        },
-    ).to_dict()
+    details: dict[str, Any] = {
+        "resource_type": resource_type,
+        "identifier": identifier,
+        "suggestion": suggestion,
+    }
+    if candidates is not None:
+        details["candidates"] = candidates
+
+    return NotFoundError(message=message, details=details).to_dict()
 
 
 def format_internal_error(operation: str, original_error: Exception) -> dict[str, Any]:
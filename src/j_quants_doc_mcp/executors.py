@@ -0,0 +1,101 @@
+"""Bounded thread pools for running CPU-heavy tool handlers off the event loop."""
+
+import asyncio
+import contextvars
+import functools
+import threading
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+# 検索・詳細取得・FAQ回答を実行するプール
+QUERY_POOL = "query"
+# テンプレートの描画(コード生成)を実行するプール
+CODEGEN_POOL = "codegen"
+
+# プールごとのスレッド数の既定値(同時に実行する呼び出し数の上限)
+DEFAULT_POOL_SIZES: dict[str, int] = {QUERY_POOL: 4, CODEGEN_POOL: 2}
+
+_pool_sizes: dict[str, int] = dict(DEFAULT_POOL_SIZES)
+_executors: dict[str, ThreadPoolExecutor] = {}
+_lock = threading.Lock()
+
+
+def configure_pools(**sizes: int) -> None:
+    """プールごとのスレッド数を設定する。
+
+    作成済みのプールは停止し、次の呼び出し時に新しいスレッド数で作成し直す。
+
+    Args:
+        **sizes: プール名からスレッド数への指定(例: query=8, codegen=2)
+
+    Raises:
+        ValueError: 未知のプール名、または1未満のスレッド数を指定した場合
+    """
+    for name, size in sizes.items():
+        if name not in DEFAULT_POOL_SIZES:
+            raise ValueError(f"Unknown pool: {name}")
+        if size < 1:
+            raise ValueError(f"Pool size must be at least 1: {name}={size}")
+
+    with _lock:
+        for name, size in sizes.items():
+            _pool_sizes[name] = size
+            executor = _executors.pop(name, None)
+            if executor is not None:
+                executor.shutdown(wait=False)
+
+
+def get_pool_sizes() -> dict[str, int]:
+    """プールごとのスレッド数を返す。"""
+    return dict(_pool_sizes)
+
+
+def _get_executor(name: str) -> ThreadPoolExecutor:
+    """プールを取得する(初回の呼び出し時に作成)。
+
+    fork 前にスレッドを作らないよう、プールは実際に使われるまで作成しない。
+    """
+    with _lock:
+        executor = _executors.get(name)
+        if executor is None:
+            executor = ThreadPoolExecutor(
+                max_workers=_pool_sizes[name], thread_name_prefix=f"{name}-pool"
+            )
+            _executors[name] = executor
+        return executor
+
+
+async def run_in_pool(
+    name: str, func: Callable[..., T], *args: Any, **kwargs: Any
+) -> T:
+    """関数を指定したプールのスレッドで実行し、結果を待つ。
+
+    プールのスレッドが全て使用中の場合、呼び出しはそのプールの空きを待つ。
+    イベントループはブロックしないため、他のプールや他の接続の処理は継続する。
+    呼び出し元のコンテキスト変数(pin_snapshot 等)は実行スレッドに引き継ぐ。
+
+    Args:
+        name: プール名(QUERY_POOL または CODEGEN_POOL)
+        func: 実行する同期関数
+        *args: func の位置引数
+        **kwargs: func のキーワード引数
+
+    Returns:
+        func の戻り値
+    """
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    call = functools.partial(context.run, func, *args, **kwargs)
+    return await loop.run_in_executor(_get_executor(name), call)
+
+
+def shutdown_pools() -> None:
+    """作成済みのプールを全て停止する。"""
+    with _lock:
+        executors = list(_executors.values())
+        _executors.clear()
+    for executor in executors:
+        executor.shutdown(wait=True)
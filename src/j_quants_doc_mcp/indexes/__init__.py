@@ -0,0 +1 @@
+"""Precomputed indexes over the J-Quants documentation data."""
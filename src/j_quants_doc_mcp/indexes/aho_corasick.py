@@ -0,0 +1,79 @@
+"""Aho-Corasick automaton for matching many keywords in one pass."""
+
+from collections import deque
+from collections.abc import Iterable, Iterator
+
+
+class AhoCorasick:
+    """複数キーワードを1回の走査で検出するAho-Corasickオートマトン。
+
+    パターンIDは構築時に渡した順序(重複と空文字列を除く)で 0 から振られる。
+    """
+
+    def __init__(self, patterns: Iterable[str]):
+        """オートマトンを構築。
+
+        Args:
+            patterns: 検出対象の文字列
+        """
+        self.patterns: list[str] = []
+        self._pattern_ids: dict[str, int] = {}
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._output: list[tuple[int, ...]] = [()]
+
+        for pattern in patterns:
+            if not pattern or pattern in self._pattern_ids:
+                continue
+            pattern_id = len(self.patterns)
+            self._pattern_ids[pattern] = pattern_id
+            self.patterns.append(pattern)
+
+            state = 0
+            for char in pattern:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append(())
+                state = next_state
+            self._output[state] += (pattern_id,)
+
+        # 幅優先で失敗遷移を計算し、失敗先の出力を引き継ぐ
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(char, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                self._output[next_state] += self._output[self._fail[next_state]]
+
+    def __len__(self) -> int:
+        return len(self.patterns)
+
+    def pattern_id(self, pattern: str) -> int | None:
+        """パターン文字列からパターンIDを取得する。"""
+        return self._pattern_ids.get(pattern)
+
+    def iter_matches(self, text: str) -> Iterator[tuple[int, int]]:
+        """テキスト中の全ての出現を (終了位置, パターンID) として列挙する。"""
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        state = 0
+        for position, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for pattern_id in output[state]:
+                yield position, pattern_id
+
+    def find(self, text: str) -> set[int]:
+        """テキストに含まれるパターンIDの集合を返す。"""
+        return {pattern_id for _, pattern_id in self.iter_matches(text)}
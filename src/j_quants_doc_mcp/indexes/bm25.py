@@ -0,0 +1,127 @@
+"""Field-weighted BM25 ranking over a fixed document collection."""
+
+import heapq
+import math
+from collections.abc import Iterable
+
+
+class BM25Index:
+    """フィールド重み付きBM25(BM25F簡易版)の転置インデックス。
+
+    各フィールドの出現回数に重みを掛けて合算した値を単語頻度として扱う。
+    文書IDは構築時に渡したリストの位置(0始まり)。
+    """
+
+    def __init__(
+        self,
+        documents: list[dict[str, list[str]]],
+        field_weights: dict[str, float],
+        k1: float = 1.2,
+        b: float = 0.75,
+    ):
+        """インデックスを構築。
+
+        Args:
+            documents: 文書ごとのフィールド名からトークン列への辞書のリスト
+            field_weights: フィールド名から重みへの辞書(含まれないフィールドは無視)
+            k1: 単語頻度の飽和パラメータ
+            b: 文書長の正規化パラメータ
+        """
+        self.k1 = k1
+        self.b = b
+        self._postings: dict[str, dict[int, float]] = {}
+        self._doc_lengths: list[float] = []
+
+        for doc_id, fields in enumerate(documents):
+            length = 0.0
+            for field_name, tokens in fields.items():
+                weight = field_weights.get(field_name)
+                if not weight:
+                    continue
+                length += weight * len(tokens)
+                for token in tokens:
+                    postings = self._postings.setdefault(token, {})
+                    postings[doc_id] = postings.get(doc_id, 0.0) + weight
+            self._doc_lengths.append(length)
+
+        count = len(self._doc_lengths)
+        self._avg_length = (sum(self._doc_lengths) / count) if count else 0.0
+        self._idf = {
+            token: math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for token, postings in self._postings.items()
+        }
+
+    def __len__(self) -> int:
+        return len(self._doc_lengths)
+
+    def max_score(self, tokens: Iterable[str]) -> float:
+        """クエリトークンに対して1文書が取り得るスコアの上限を返す。
+
+        スコアを0〜1の関連度に正規化する際の分母として使う。
+        インデックスに存在しないトークンは寄与しない。
+        """
+        return sum(self._idf.get(token, 0.0) for token in set(tokens)) * (self.k1 + 1)
+
+    def score(
+        self, tokens: Iterable[str], candidates: Iterable[int] | None = None
+    ) -> dict[int, float]:
+        """クエリトークンに対する各文書のスコアを計算する。
+
+        Args:
+            tokens: クエリのトークン列
+            candidates: スコアを計算する文書IDの集合(Noneの場合はトークンを含む全文書)
+
+        Returns:
+            文書IDからスコアへの辞書(スコアが付かない文書は含まない)
+        """
+        candidate_set = set(candidates) if candidates is not None else None
+        scores: dict[int, float] = {}
+        avg_length = self._avg_length or 1.0
+
+        for token in set(tokens):
+            postings = self._postings.get(token)
+            if not postings:
+                continue
+            idf = self._idf[token]
+
+            if candidate_set is not None and len(candidate_set) < len(postings):
+                items = (
+                    (doc_id, postings[doc_id])
+                    for doc_id in candidate_set
+                    if doc_id in postings
+                )
+            else:
+                items = postings.items()
+
+            for doc_id, frequency in items:
+                if candidate_set is not None and doc_id not in candidate_set:
+                    continue
+                norm = self.k1 * (
+                    1 - self.b + self.b * self._doc_lengths[doc_id] / avg_length
+                )
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * (
+                    frequency * (self.k1 + 1) / (frequency + norm)
+                )
+
+        return scores
+
+
+def top_k(scores: dict[int, float], k: int | None = None) -> list[tuple[int, float]]:
+    """スコアの高い順に(文書ID, スコア)を返す。
+
+    同点の場合は文書IDの小さい順。kを指定した場合はヒープで上位k件のみを取り出す。
+
+    Args:
+        scores: 文書IDからスコアへの辞書
+        k: 取得件数(Noneの場合は全件)
+
+    Returns:
+        (文書ID, スコア)のリスト
+    """
+
+    def key(item: tuple[int, float]) -> tuple[float, int]:
+        return (item[1], -item[0])
+
+    if k is None:
+        return sorted(scores.items(), key=key, reverse=True)
+    return heapq.nlargest(k, scores.items(), key=key)
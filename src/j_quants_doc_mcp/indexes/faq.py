@@ -0,0 +1,126 @@
+"""Keyword and BM25 index for matching user questions against FAQ entries."""
+
+from typing import Any
+
+from .aho_corasick import AhoCorasick
+from .bm25 import BM25Index, top_k
+from .substring import SubstringIndex
+from .text import content_tokens, normalize
+
+# 質問文がFAQの質問文に含まれる場合のスコア
+EXACT_MATCH_SCORE = 100
+# マッチしたキーワード1件あたりのスコア
+KEYWORD_SCORE = 10
+# BM25関連度(0〜1)に掛ける係数。関連度が最大でもキーワード1件分に相当する
+BM25_SCORE = 10
+# キーワードが一致しないFAQをBM25だけで候補にする場合の関連度の下限
+BM25_MIN_RELEVANCE = 0.2
+# BM25の対象フィールドと重み(質問文 > 回答)
+FIELD_WEIGHTS = {"question": 2.0, "answer": 1.0}
+
+
+class FaqIndex:
+    """FAQの質問文・回答・キーワードのインデックス。
+
+    全FAQのキーワードから1つのAho-Corasickオートマトンを構築し、
+    質問文を1回走査するだけで一致する全キーワードとそのFAQを求める。
+    質問文全体がFAQの質問文に含まれるかは文字n-gramインデックスで判定する。
+    キーワードが定義されていない言い回しにも答えられるよう、質問文と回答を
+    文字n-gramでトークン化したBM25インデックスも併せて持つ。
+    """
+
+    def __init__(self, faqs: list[dict[str, Any]]):
+        """インデックスを構築。
+
+        Args:
+            faqs: FAQのリスト
+        """
+        self.faqs = faqs
+        self._questions = SubstringIndex(
+            [(normalize(faq.get("question", "")),) for faq in faqs]
+        )
+        self._faq_keywords: list[list[tuple[str, str]]] = [
+            [(keyword, normalize(keyword)) for keyword in faq.get("keywords", [])]
+            for faq in faqs
+        ]
+        self._matcher = AhoCorasick(
+            normalized for keywords in self._faq_keywords for _, normalized in keywords
+        )
+
+        keyword_faqs: list[list[int]] = [[] for _ in range(len(self._matcher))]
+        for faq_id, keywords in enumerate(self._faq_keywords):
+            for _, normalized in keywords:
+                pattern_id = self._matcher.pattern_id(normalized)
+                if pattern_id is not None and faq_id not in keyword_faqs[pattern_id]:
+                    keyword_faqs[pattern_id].append(faq_id)
+        self._keyword_faqs = [tuple(faq_ids) for faq_ids in keyword_faqs]
+
+        self._bm25 = BM25Index(
+            [
+                {key: content_tokens(faq.get(key, "")) for key in FIELD_WEIGHTS}
+                for faq in faqs
+            ],
+            FIELD_WEIGHTS,
+        )
+
+    def __len__(self) -> int:
+        return len(self.faqs)
+
+    def match(self, question: str, limit: int | None = None) -> list[dict[str, Any]]:
+        """質問文に一致するFAQをスコアの高い順に返す。
+
+        質問文がFAQの質問文に含まれる場合は EXACT_MATCH_SCORE、それ以外は
+        一致したキーワード数 × KEYWORD_SCORE を基本スコアとし、質問文・回答に
+        対するBM25の関連度(0〜1) × BM25_SCORE を加算する。
+        キーワードが一致しないFAQは関連度が BM25_MIN_RELEVANCE 以上の場合のみ含める。
+        同点の場合はFAQの定義順。
+
+        Args:
+            question: ユーザーからの質問
+            limit: 返す最大件数(Noneの場合は全件)
+
+        Returns:
+            score, faq, matched_keywords(キーワード一致の場合のみ)を含む辞書のリスト
+        """
+        normalized_question = normalize(question)
+
+        exact_ids = self._questions.find(normalized_question)
+        matched_patterns = self._matcher.find(normalized_question)
+        keyword_ids: set[int] = set()
+        for pattern_id in matched_patterns:
+            keyword_ids.update(self._keyword_faqs[pattern_id])
+
+        tokens = content_tokens(question)
+        max_score = self._bm25.max_score(tokens)
+        relevance = {
+            faq_id: score / max_score
+            for faq_id, score in self._bm25.score(tokens).items()
+        }
+
+        scores: dict[int, float] = {}
+        for faq_id, value in relevance.items():
+            if value >= BM25_MIN_RELEVANCE:
+                scores[faq_id] = value * BM25_SCORE
+        for faq_id in exact_ids:
+            scores[faq_id] = EXACT_MATCH_SCORE + relevance.get(faq_id, 0.0) * BM25_SCORE
+
+        matched_keywords: dict[int, list[str]] = {}
+        for faq_id in keyword_ids - exact_ids:
+            # キーワードでのマッチング(FAQに定義された順序を維持)
+            matched_keywords[faq_id] = [
+                keyword
+                for keyword, normalized in self._faq_keywords[faq_id]
+                if self._matcher.pattern_id(normalized) in matched_patterns
+            ]
+            scores[faq_id] = (
+                len(matched_keywords[faq_id]) * KEYWORD_SCORE
+                + relevance.get(faq_id, 0.0) * BM25_SCORE
+            )
+
+        matches = []
+        for faq_id, score in top_k(scores, limit):
+            match: dict[str, Any] = {"score": round(score, 2), "faq": self.faqs[faq_id]}
+            if faq_id in matched_keywords:
+                match["matched_keywords"] = matched_keywords[faq_id]
+            matches.append(match)
+        return matches
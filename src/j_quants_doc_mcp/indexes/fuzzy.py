@@ -0,0 +1,156 @@
+"""Trigram candidate index with edit-distance ranking for "did you mean" suggestions."""
+
+import re
+from collections import Counter
+from typing import Any
+
+from .text import char_ngrams, normalize
+
+# エンドポイントを引くキーに使うフィールド
+FUZZY_KEY_FIELDS = ("name", "path", "path_old", "name_en")
+
+# 候補の絞り込みに使う文字n-gramの長さ
+_GRAM = 3
+
+# 編集距離で順位付けする候補数の上限(共有するn-gramの多い順)
+_RERANK_LIMIT = 50
+
+# 候補として返す類似度の下限
+MIN_SIMILARITY = 0.5
+
+# 自動補正する類似度の下限と、2番目の候補との類似度の差の下限
+AUTO_RESOLVE_MIN_SIMILARITY = 0.8
+AUTO_RESOLVE_MIN_MARGIN = 0.1
+
+# 区切り文字(記号・空白の連続)
+_SEPARATOR_PATTERN = re.compile(r"[\W_]+")
+
+
+def canonicalize(text: str) -> str:
+    """比較用にキーを正規化する(NFKC・小文字化し、記号と空白の連続を "-" にする)。
+
+    例えば "/fins/summary"、"fins_summary"、"Fins Summary" は全て "fins-summary" になる。
+    """
+    return _SEPARATOR_PATTERN.sub("-", normalize(text)).strip("-")
+
+
+def _grams(key: str) -> set[str]:
+    # 先頭と末尾の一致も数えるため、前後に区切りを付けてn-gramを作る
+    return set(char_ngrams(f" {key} ", _GRAM))
+
+
+def levenshtein(a: str, b: str) -> int:
+    """2つの文字列の編集距離(挿入・削除・置換の最小回数)を返す。"""
+    if len(a) < len(b):
+        a, b = b, a
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(
+                min(
+                    previous[j] + 1,
+                    current[j - 1] + 1,
+                    previous[j - 1] + (char_a != char_b),
+                )
+            )
+        previous = current
+    return previous[-1]
+
+
+def similarity(a: str, b: str) -> float:
+    """編集距離を長い方の文字列長で割って正規化した類似度(0〜1)を返す。"""
+    if not a and not b:
+        return 1.0
+    return 1.0 - levenshtein(a, b) / max(len(a), len(b))
+
+
+class FuzzyIndex:
+    """エンドポイント名・パス・旧パス・英語名のあいまい検索インデックス。
+
+    文字trigramの転置インデックスで候補を絞り込み、編集距離による類似度で
+    順位付けする。1つのエンドポイントが複数のキーに一致した場合は、
+    最も類似度の高いキーの値を使う。
+    """
+
+    def __init__(self, endpoints: list[dict[str, Any]]):
+        """インデックスを構築。
+
+        Args:
+            endpoints: エンドポイント定義のリスト
+        """
+        self._keys: list[tuple[str, str]] = []
+        seen = set()
+        for endpoint in endpoints:
+            for field in FUZZY_KEY_FIELDS:
+                value = endpoint.get(field)
+                if not value:
+                    continue
+                key = canonicalize(value)
+                if key and (key, endpoint["name"]) not in seen:
+                    seen.add((key, endpoint["name"]))
+                    self._keys.append((key, endpoint["name"]))
+
+        self._postings: dict[str, list[int]] = {}
+        for key_id, (key, _) in enumerate(self._keys):
+            for gram in _grams(key):
+                self._postings.setdefault(gram, []).append(key_id)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def suggest(
+        self, term: str, limit: int = 5, min_similarity: float = MIN_SIMILARITY
+    ) -> list[tuple[str, float]]:
+        """term に似たエンドポイントを類似度の高い順に返す。
+
+        Args:
+            term: 見つからなかったエンドポイント名またはパス(正規化前でよい)
+            limit: 返す最大件数
+            min_similarity: 返す候補の類似度の下限
+
+        Returns:
+            (エンドポイント名, 類似度) のリスト(類似度の降順、同じ場合は名前順)
+        """
+        query = canonicalize(term)
+        if not query:
+            return []
+
+        shared: Counter[int] = Counter()
+        for gram in _grams(query):
+            shared.update(self._postings.get(gram, ()))
+
+        best: dict[str, float] = {}
+        for key_id, _ in shared.most_common(_RERANK_LIMIT):
+            key, name = self._keys[key_id]
+            score = similarity(query, key)
+            if score > best.get(name, -1.0):
+                best[name] = score
+
+        ranked = sorted(
+            ((name, round(score, 3)) for name, score in best.items()),
+            key=lambda item: (-item[1], item[0]),
+        )
+        return [item for item in ranked if item[1] >= min_similarity][:limit]
+
+    def resolve(self, term: str) -> tuple[str, float] | None:
+        """term が1つのエンドポイントを明確に指している場合に、その候補を返す。
+
+        最上位の候補の類似度が AUTO_RESOLVE_MIN_SIMILARITY 以上で、かつ
+        2番目の候補との差が AUTO_RESOLVE_MIN_MARGIN 以上の場合に限る。
+
+        Args:
+            term: 見つからなかったエンドポイント名またはパス(正規化前でよい)
+
+        Returns:
+            (エンドポイント名, 類似度)、または None(明確な候補がない場合)
+        """
+        candidates = self.suggest(term, limit=2, min_similarity=0.0)
+        if not candidates or candidates[0][1] < AUTO_RESOLVE_MIN_SIMILARITY:
+            return None
+        if (
+            len(candidates) > 1
+            and candidates[0][1] - candidates[1][1] < AUTO_RESOLVE_MIN_MARGIN
+        ):
+            return None
+        return candidates[0]
@@ -0,0 +1,100 @@
+"""Inverted index from property names to endpoints and reference data."""
+
+from dataclasses import dataclass, field
+from typing import Any
+
+
+@dataclass(frozen=True)
+class PropertyEntry:
+    """1つのプロパティ名(大文字小文字を区別しない)に対応するインデックス項目。
+
+    Attributes:
+        endpoints: エンドポイント名から方向("request"/"response")のタプルへの辞書。
+                   エンドポイント定義の順序を保持する。
+        references: related_properties が一致する参照データのリスト(定義順)
+        references_by_endpoint: エンドポイント名から最初に一致する参照データへの辞書
+    """
+
+    endpoints: dict[str, tuple[str, ...]] = field(default_factory=dict)
+    references: tuple[dict[str, Any], ...] = ()
+    references_by_endpoint: dict[str, dict[str, Any]] = field(default_factory=dict)
+
+    def occurrences(self) -> list[dict[str, str]]:
+        """プロパティを含む全エンドポイントと方向の一覧を返す。"""
+        return [
+            {"endpoint": endpoint_name, "direction": direction}
+            for endpoint_name, directions in self.endpoints.items()
+            for direction in directions
+        ]
+
+
+class PropertyIndex:
+    """プロパティ名の大文字小文字を無視した転置インデックス。
+
+    エンドポイントのパラメータ(request)とレスポンスフィールド(response)、
+    および参照データの related_properties を1度だけ走査して構築する。
+    """
+
+    def __init__(
+        self, endpoints: list[dict[str, Any]], reference_data: list[dict[str, Any]]
+    ):
+        """インデックスを構築。
+
+        Args:
+            endpoints: エンドポイント定義のリスト
+            reference_data: 参照データのリスト
+        """
+        occurrences: dict[str, dict[str, list[str]]] = {}
+        for endpoint in endpoints:
+            endpoint_name = endpoint.get("name")
+            names = [
+                (param.get("name", ""), "request")
+                for param in endpoint.get("parameters", [])
+            ] + [
+                (response_field.get("name", ""), "response")
+                for response_field in endpoint.get("response", {}).get("fields", [])
+            ]
+            for name, direction in names:
+                directions = occurrences.setdefault(name.casefold(), {}).setdefault(
+                    endpoint_name, []
+                )
+                if direction not in directions:
+                    directions.append(direction)
+
+        references: dict[str, list[dict[str, Any]]] = {}
+        for ref_entry in reference_data:
+            for related_prop in ref_entry.get("related_properties", []):
+                references.setdefault(
+                    related_prop.get("property", "").casefold(), []
+                ).append(
+                    {
+                        "name": ref_entry.get("name"),
+                        "description": ref_entry.get("description"),
+                        "endpoint": related_prop.get("endpoint"),
+                        "direction": related_prop.get("direction"),
+                        "fields": ref_entry.get("fields", []),
+                        "values": ref_entry.get("reference_data", []),
+                    }
+                )
+
+        self._entries: dict[str, PropertyEntry] = {}
+        for key in occurrences.keys() | references.keys():
+            matches = references.get(key, [])
+            by_endpoint: dict[str, dict[str, Any]] = {}
+            for match in matches:
+                by_endpoint.setdefault(match["endpoint"], match)
+            self._entries[key] = PropertyEntry(
+                endpoints={
+                    name: tuple(directions)
+                    for name, directions in occurrences.get(key, {}).items()
+                },
+                references=tuple(matches),
+                references_by_endpoint=by_endpoint,
+            )
+
+    def get(self, property_name: str) -> PropertyEntry | None:
+        """プロパティ名(大文字小文字を区別しない)からインデックス項目を取得する。"""
+        return self._entries.get(property_name.casefold())
+
+    def __len__(self) -> int:
+        return len(self._entries)
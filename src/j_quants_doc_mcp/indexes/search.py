@@ -0,0 +1,147 @@
+"""Ranked full-text search index over endpoint definitions."""
+
+import heapq
+from typing import Any
+
+from .bm25 import BM25Index
+from .substring import SubstringIndex
+from .text import normalize, tokenize
+
+# 検索対象フィールドと重み(名前 > パス > 説明)
+FIELD_WEIGHTS = {
+    "name": 3.0,
+    "name_ja": 3.0,
+    "name_en": 3.0,
+    "path": 2.0,
+    "path_old": 2.0,
+    "description": 1.0,
+}
+
+# 部分文字列としてのみ一致した場合のスコア(フィールドの重みに掛ける係数)
+SUBSTRING_SCORE = 0.01
+
+
+class EndpointSearchIndex:
+    """エンドポイント検索用のインデックス。
+
+    各検索語(空白区切り)が部分文字列として含まれるエンドポイントを、文字n-gramの
+    転置インデックスで候補を絞り込んでから確認する。全ての語を含むエンドポイントが
+    ない場合は、いずれかの語を含むエンドポイントにフォールバックし、含む語の数が
+    多い順に並べる。同じ数の中ではフィールド重み付きBM25のスコア順に並べる。
+    """
+
+    def __init__(self, endpoints: list[dict[str, Any]]):
+        """インデックスを構築。
+
+        Args:
+            endpoints: エンドポイント定義のリスト
+        """
+        self._summaries: list[dict[str, str]] = []
+        self._categories: list[str] = []
+        texts = []
+        documents = []
+
+        for endpoint in endpoints:
+            path = endpoint.get("path", "")
+            self._summaries.append(
+                {
+                    "name": endpoint.get("name", ""),
+                    "name_ja": endpoint.get("name_ja", ""),
+                    "name_en": endpoint.get("name_en", ""),
+                    "path": path,
+                    "description": endpoint.get("description", ""),
+                }
+            )
+            # パスからカテゴリを抽出 (例: /listed/*, /prices/*, /fins/*)
+            self._categories.append(path.split("/")[1].lower() if "/" in path else "")
+
+            values = {key: endpoint.get(key) or "" for key in FIELD_WEIGHTS}
+            texts.append(tuple(normalize(value) for value in values.values()))
+            documents.append({key: tokenize(value) for key, value in values.items()})
+
+        self._texts = texts
+        self._substrings = SubstringIndex(texts)
+        self._bm25 = BM25Index(documents, FIELD_WEIGHTS)
+
+    def __len__(self) -> int:
+        return len(self._summaries)
+
+    def search(
+        self, keyword: str, category: str | None = None, limit: int | None = None
+    ) -> list[dict[str, Any]]:
+        """キーワードでエンドポイントを検索し、関連度順に返す。
+
+        Args:
+            keyword: 検索キーワード(空白区切りで複数指定可能)
+            category: パスの先頭要素によるカテゴリフィルタ
+            limit: 返す最大件数(Noneの場合は全件)
+
+        Returns:
+            エンドポイント概要(name, name_ja, name_en, path, description, score)のリスト
+        """
+        terms = normalize(keyword).split()
+        if not terms:
+            return []
+
+        if category:
+            category_lower = category.lower()
+            allowed = {
+                doc_id
+                for doc_id, doc_category in enumerate(self._categories)
+                if doc_category == category_lower
+            }
+        else:
+            allowed = None
+
+        # 各文書が部分文字列として含む検索語の数
+        coverage: dict[int, int] = {}
+        for term in terms:
+            for doc_id in self._substrings.find(term):
+                if allowed is None or doc_id in allowed:
+                    coverage[doc_id] = coverage.get(doc_id, 0) + 1
+        if not coverage:
+            return []
+
+        # 全ての検索語を含む文書があればそれだけを返す
+        if any(count == len(terms) for count in coverage.values()):
+            coverage = {
+                doc_id: count
+                for doc_id, count in coverage.items()
+                if count == len(terms)
+            }
+
+        scores = self._bm25.score(tokenize(keyword), coverage)
+        # 部分文字列として一致したがトークンとしては一致しない文書
+        # (1文字の語など)は、一致したフィールドの重みに応じた小さなスコアを付ける
+        for doc_id in coverage:
+            if scores.get(doc_id, 0.0) <= 0.0:
+                scores[doc_id] = self._substring_score(doc_id, terms)
+
+        # 含む検索語の数、スコアの高い順(同点の場合は文書IDの小さい順)
+        def rank(doc_id: int) -> tuple[int, float, int]:
+            return (-coverage[doc_id], -scores[doc_id], doc_id)
+
+        if limit is None:
+            ranked = sorted(coverage, key=rank)
+        else:
+            ranked = heapq.nsmallest(limit, coverage, key=rank)
+
+        return [
+            {**self._summaries[doc_id], "score": round(scores[doc_id], 4)}
+            for doc_id in ranked
+        ]
+
+    def _substring_score(self, doc_id: int, terms: list[str]) -> float:
+        """部分文字列としてのみ一致した文書のスコア(BM25のスコアより小さい値)。"""
+        texts = self._texts[doc_id]
+        return SUBSTRING_SCORE * sum(
+            max(
+                (
+                    weight
+                    for weight, text in zip(FIELD_WEIGHTS.values(), texts)
+                    if term in text
+                ),
+                default=0.0,
+            )
+            for term in terms
+        )
@@ -0,0 +1,59 @@
+"""Character n-gram index for substring lookups over many documents."""
+
+from .text import char_ngrams
+
+# 候補の絞り込みに使う文字n-gramの長さ
+_MIN_GRAM = 2
+_MAX_GRAM = 3
+
+
+def _grams(text: str) -> set[str]:
+    grams: set[str] = set()
+    for n in range(_MIN_GRAM, _MAX_GRAM + 1):
+        grams.update(char_ngrams(text, n))
+    return grams
+
+
+class SubstringIndex:
+    """部分文字列検索用の文字n-gram転置インデックス。
+
+    検索語のn-gramを全て含む文書に候補を絞り込み、実際に部分文字列として
+    含まれるかを確認する。検索語が短くn-gramを作れない場合は全文書を確認する。
+    """
+
+    def __init__(self, documents: list[tuple[str, ...]]):
+        """インデックスを構築。
+
+        Args:
+            documents: 文書ごとの正規化済みテキスト(複数フィールド)のリスト
+        """
+        self._documents = documents
+        self._postings: dict[str, list[int]] = {}
+        for doc_id, texts in enumerate(documents):
+            for gram in set().union(*(_grams(text) for text in texts)):
+                self._postings.setdefault(gram, []).append(doc_id)
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def find(self, term: str) -> set[int]:
+        """いずれかのフィールドに term を部分文字列として含む文書IDを返す。
+
+        Args:
+            term: 正規化済みの検索語
+
+        Returns:
+            文書IDの集合
+        """
+        grams = _grams(term)
+        if grams:
+            postings = sorted((self._postings.get(gram, []) for gram in grams), key=len)
+            candidates = set(postings[0]).intersection(*postings[1:])
+        else:
+            candidates = set(range(len(self._documents)))
+
+        return {
+            doc_id
+            for doc_id in candidates
+            if any(term in text for text in self._documents[doc_id])
+        }
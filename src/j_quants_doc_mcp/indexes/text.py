@@ -0,0 +1,64 @@
+"""Text normalization and tokenization shared by the search indexes."""
+
+import re
+import unicodedata
+
+# ASCII の単語(英数字の連続)
+_WORD_PATTERN = re.compile(r"[a-z0-9]+")
+# ひらがな・カタカナ・漢字の連続
+_CJK_PATTERN = re.compile(
+    r"[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff々〆]+"
+)
+# ひらがな(と長音符)だけのトークン。助詞や活用語尾が大半を占める
+_HIRAGANA_PATTERN = re.compile(r"[\u3040-\u309fー]+")
+
+
+def normalize(text: str) -> str:
+    """検索用に文字列を正規化する(NFKC正規化と小文字化)。
+
+    全角英数字や全角スペースは半角に統一される。
+    """
+    return unicodedata.normalize("NFKC", text).lower()
+
+
+def char_ngrams(text: str, n: int) -> list[str]:
+    """文字n-gramのリストを返す(文字列がnより短い場合は空リスト)。"""
+    return [text[i : i + n] for i in range(len(text) - n + 1)]
+
+
+def tokenize(text: str) -> list[str]:
+    """ランキング用のトークン列を生成する。
+
+    ASCII部分は英数字の単語単位、日本語部分は文字bigramとtrigramに分割する。
+    1文字だけの日本語はその文字自体をトークンとする。
+
+    Args:
+        text: 対象文字列(正規化前でよい)
+
+    Returns:
+        トークンのリスト(重複を含む)
+    """
+    normalized = normalize(text)
+    tokens = _WORD_PATTERN.findall(normalized)
+    for run in _CJK_PATTERN.findall(normalized):
+        if len(run) == 1:
+            tokens.append(run)
+        else:
+            tokens.extend(char_ngrams(run, 2))
+            tokens.extend(char_ngrams(run, 3))
+    return tokens
+
+
+def content_tokens(text: str) -> list[str]:
+    """ひらがなだけのトークンを除いたトークン列を生成する。
+
+    「の」「です」「ますか」のような助詞・活用語尾のn-gramは多くの文書に現れ、
+    自然文同士を比較するときに無関係な文書を拾う原因になるため除外する。
+
+    Args:
+        text: 対象文字列(正規化前でよい)
+
+    Returns:
+        トークンのリスト(重複を含む)
+    """
+    return [token for token in tokenize(text) if not _HIRAGANA_PATTERN.fullmatch(token)]
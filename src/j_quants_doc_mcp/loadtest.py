@@ -0,0 +1,314 @@
+"""Load generator replaying a mix of documentation tools over concurrent MCP sessions."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import random
+import sys
+import time
+from collections.abc import AsyncIterator, Callable
+from contextlib import AbstractAsyncContextManager, asynccontextmanager
+from typing import Any, TextIO
+
+import anyio
+import httpx
+from mcp.client.session import ClientSession
+from mcp.client.stdio import StdioServerParameters, stdio_client
+from mcp.client.streamable_http import streamablehttp_client
+from mcp.shared.exceptions import McpError
+
+from j_quants_doc_mcp.metrics import PERCENTILES, percentile
+from j_quants_doc_mcp.resources.snapshot import DataSnapshot
+
+# 負荷をかけるツール
+LOAD_TESTED_TOOLS = (
+    "search_endpoints",
+    "describe_endpoint",
+    "generate_sample_code",
+    "answer_question",
+    "lookup_property",
+    "get_pattern",
+)
+
+# 既定の呼び出し比率(検索と詳細取得が多く、パターン取得は少ない想定)
+DEFAULT_MIX = {
+    "search_endpoints": 30.0,
+    "describe_endpoint": 25.0,
+    "generate_sample_code": 15.0,
+    "answer_question": 15.0,
+    "lookup_property": 10.0,
+    "get_pattern": 5.0,
+}
+
+# 既定の同時セッション数
+DEFAULT_SESSIONS = 8
+
+# 既定のセッションごとの呼び出し回数
+DEFAULT_CALLS = 50
+
+# 接続やセッションの失敗として報告する例外(起動コマンドがない、接続できない、
+# サーバが途中で終了した等)
+SESSION_ERRORS = (
+    OSError,
+    httpx.HTTPError,
+    McpError,
+    anyio.BrokenResourceError,
+    anyio.ClosedResourceError,
+)
+
+Call = tuple[str, dict[str, Any]]
+Connector = Callable[[], AbstractAsyncContextManager[ClientSession]]
+
+
+def parse_mix(spec: str) -> dict[str, float]:
+    """ "tool=weight,tool=weight" 形式の呼び出し比率を解析する。
+
+    Args:
+        spec: 呼び出し比率(例: "search_endpoints=3,describe_endpoint=1")
+
+    Returns:
+        ツール名から比率への辞書
+
+    Raises:
+        ValueError: 未知のツール名、数値でない比率、0以下の比率を指定した場合
+    """
+    mix = {}
+    for item in spec.split(","):
+        name, _, weight = item.strip().partition("=")
+        if name not in LOAD_TESTED_TOOLS:
+            raise ValueError(f"unknown tool in mix: {name}")
+        try:
+            mix[name] = float(weight or 1)
+        except ValueError:
+            raise ValueError(f"invalid weight for {name}: {weight}") from None
+        if mix[name] <= 0:
+            raise ValueError(f"weight for {name} must be positive: {weight}")
+    return mix
+
+
+def sample_property_name(endpoint: dict[str, Any], rng: random.Random) -> str:
+    """lookup_property に渡す項目名を、エンドポイントのレスポンス項目から選ぶ。
+
+    レスポンス項目が定義されていないエンドポイントでは "Code" を返す。
+    """
+    fields = endpoint["response"].get("fields") or [{"name": "Code"}]
+    return rng.choice(fields)["name"]
+
+
+def _argument_generators(
+    snapshot: DataSnapshot, rng: random.Random
+) -> dict[str, Callable[[], dict[str, Any]]]:
+    """ツールごとに、データファイルの内容から引数を作成する関数を返す。"""
+    endpoints = snapshot.endpoints
+    names = [endpoint["name"] for endpoint in endpoints]
+    keywords = [
+        keyword
+        for endpoint in endpoints
+        for keyword in (endpoint["name_ja"], endpoint["name_en"])
+    ]
+    questions = [faq["question"] for faq in snapshot.faqs]
+    pattern_names = [pattern["pattern_name"] for pattern in snapshot.patterns]
+
+    def lookup_args() -> dict[str, Any]:
+        endpoint = rng.choice(endpoints)
+        args: dict[str, Any] = {"property_name": sample_property_name(endpoint, rng)}
+        if rng.random() < 0.5:
+            args["endpoint_name"] = endpoint["name"]
+        return args
+
+    return {
+        "search_endpoints": lambda: {"keyword": rng.choice(keywords)},
+        "describe_endpoint": lambda: {"endpoint_name": rng.choice(names)},
+        "generate_sample_code": lambda: {
+            "endpoint_name": rng.choice(names),
+            "language": rng.choice(("python", "python-async")),
+        },
+        "answer_question": lambda: {"question": rng.choice(questions)},
+        "lookup_property": lookup_args,
+        "get_pattern": lambda: (
+            {"pattern_name": rng.choice(pattern_names)} if rng.random() < 0.8 else {}
+        ),
+    }
+
+
+def build_workloads(
+    snapshot: DataSnapshot,
+    mix: dict[str, float],
+    sessions: int,
+    calls_per_session: int,
+    seed: int = 0,
+) -> list[list[Call]]:
+    """セッションごとの呼び出し(ツール名と引数)の列を、比率に従って乱数で作成する。
+
+    Args:
+        snapshot: 引数の作成に使うデータ
+        mix: ツール名から呼び出し比率への辞書
+        sessions: セッション数
+        calls_per_session: セッションごとの呼び出し回数
+        seed: 乱数のシード(同じシードなら同じ呼び出し列になる)
+
+    Returns:
+        セッションごとの (ツール名, 引数) のリスト
+    """
+    rng = random.Random(seed)
+    generators = _argument_generators(snapshot, rng)
+    tools = list(mix)
+    weights = [mix[tool] for tool in tools]
+    workloads = []
+    for _ in range(sessions):
+        chosen = rng.choices(tools, weights=weights, k=calls_per_session)
+        workloads.append([(tool, generators[tool]()) for tool in chosen])
+    return workloads
+
+
+def stdio_connector(command: list[str], errlog: TextIO = sys.stderr) -> Connector:
+    """セッションごとにサーバを起動し、stdio で接続する関数を返す。
+
+    Args:
+        command: サーバを起動するコマンド
+        errlog: サーバの標準エラー出力(ログ)の書き出し先
+    """
+
+    @asynccontextmanager
+    async def connect() -> AsyncIterator[ClientSession]:
+        params = StdioServerParameters(command=command[0], args=command[1:])
+        async with (
+            stdio_client(params, errlog) as (read, write),
+            ClientSession(read, write) as session,
+        ):
+            await session.initialize()
+            yield session
+
+    return connect
+
+
+def http_connector(url: str) -> Connector:
+    """起動済みのサーバに streamable-http で接続する関数を返す。"""
+
+    @asynccontextmanager
+    async def connect() -> AsyncIterator[ClientSession]:
+        async with (
+            streamablehttp_client(url) as (read, write, _),
+            ClientSession(read, write) as session,
+        ):
+            await session.initialize()
+            yield session
+
+    return connect
+
+
+def _is_error(result: Any) -> bool:
+    """ツールの呼び出し結果がエラーかどうか"""
+    if result.isError:
+        return True
+    try:
+        payload = json.loads(result.content[0].text)
+    except (IndexError, AttributeError, ValueError):
+        return False
+    return isinstance(payload, dict) and payload.get("error") is True
+
+
+async def run_load(connect: Connector, workloads: list[list[Call]]) -> dict[str, Any]:
+    """セッションごとの呼び出し列を同時に実行し、ツールごとの性能を集計する。
+
+    全てのセッションの接続と初期化が終わってから計測を始めるため、
+    サーバの起動時間は結果に含まれない。
+
+    Args:
+        connect: セッションを作成する関数
+        workloads: セッションごとの (ツール名, 引数) のリスト
+
+    Returns:
+        sessions、calls、errors、elapsed_seconds、throughput_per_second と、
+        tools(ツール名から calls、errors、throughput_per_second、
+        latency_ms の p50・p95・p99・max)を含む辞書
+    """
+    latencies: dict[str, list[float]] = {}
+    errors: dict[str, int] = {}
+    connected = 0
+    all_connected = asyncio.Event()
+    start = asyncio.Event()
+
+    async def run_session(calls: list[Call]) -> None:
+        nonlocal connected
+        async with connect() as session:
+            connected += 1
+            if connected == len(workloads):
+                all_connected.set()
+            await start.wait()
+            for name, arguments in calls:
+                started = time.perf_counter()
+                try:
+                    failed = _is_error(await session.call_tool(name, arguments))
+                except McpError:
+                    failed = True
+                latencies.setdefault(name, []).append(time.perf_counter() - started)
+                errors[name] = errors.get(name, 0) + failed
+
+    tasks = [asyncio.create_task(run_session(calls)) for calls in workloads]
+    waiter = asyncio.create_task(all_connected.wait())
+    try:
+        # 接続に失敗したセッションがあれば、その例外をここで送出する
+        done, _ = await asyncio.wait(
+            [waiter, *tasks], return_when=asyncio.FIRST_COMPLETED
+        )
+        for task in done - {waiter}:
+            task.result()
+        started = time.perf_counter()
+        start.set()
+        await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - started
+    finally:
+        # 失敗したセッションがあっても、残りのセッション(stdio のサブプロセス)を
+        # 終了させてから戻る
+        waiter.cancel()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(waiter, *tasks, return_exceptions=True)
+
+    tools = {}
+    for name in sorted(latencies):
+        values = sorted(latencies[name])
+        latency_ms = {
+            f"p{p}": round(percentile(values, p) * 1000, 3) for p in PERCENTILES
+        }
+        latency_ms["max"] = round(values[-1] * 1000, 3)
+        tools[name] = {
+            "calls": len(values),
+            "errors": errors[name],
+            "throughput_per_second": round(len(values) / elapsed, 1),
+            "latency_ms": latency_ms,
+        }
+    total_calls = sum(len(calls) for calls in workloads)
+    return {
+        "sessions": len(workloads),
+        "calls": total_calls,
+        "errors": sum(errors.values()),
+        "elapsed_seconds": round(elapsed, 3),
+        "throughput_per_second": round(total_calls / elapsed, 1),
+        "tools": tools,
+    }
+
+
+def format_report(report: dict[str, Any]) -> str:
+    """集計結果を表形式の文字列にする。"""
+    columns = ["calls", "errors", "req/s", *(f"p{p} ms" for p in PERCENTILES)]
+    lines = [
+        (
+            f"{report['sessions']} sessions, {report['calls']} calls, "
+            f"{report['errors']} errors in {report['elapsed_seconds']}s "
+            f"({report['throughput_per_second']} req/s)"
+        ),
+        "",
+        f"{'tool':<22}" + "".join(f"{column:>10}" for column in columns),
+    ]
+    for name, measured in report["tools"].items():
+        values = [
+            measured["calls"],
+            measured["errors"],
+            measured["throughput_per_second"],
+            *(measured["latency_ms"][f"p{p}"] for p in PERCENTILES),
+        ]
+        lines.append(f"{name:<22}" + "".join(f"{value:>10}" for value in values))
+    return "\n".join(lines)
@@ -0,0 +1,267 @@
+"""Per-tool call metrics: latency and payload histograms, call and error counts."""
+
+import bisect
+import json
+import os
+import threading
+import time
+from collections import Counter
+from collections.abc import Sequence
+from typing import Any
+
+# 処理時間のヒストグラムのバケット上限(秒)
+LATENCY_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+# レスポンスサイズのヒストグラムのバケット上限(バイト)
+PAYLOAD_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+# metrics ツールで返すパーセンタイル
+PERCENTILES = (50, 95, 99)
+
+# Prometheus 形式で出力するメトリクス名の接頭辞
+METRIC_PREFIX = "jquants_doc_mcp"
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class Histogram:
+    """固定バケットのヒストグラム。
+
+    値ごとにバケットの件数を数えるだけのため、呼び出し回数によらず
+    メモリ使用量は一定。パーセンタイルはバケット内の線形補間で推定する
+    (Prometheus の histogram_quantile と同じ方法)。
+    """
+
+    def __init__(self, buckets: Sequence[float]):
+        """ヒストグラムを初期化。
+
+        Args:
+            buckets: 昇順のバケット上限(最後に上限なしのバケットを追加する)
+        """
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        """値を1件記録する。"""
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def quantile(self, q: float) -> float | None:
+        """q (0〜1) 分位点の推定値を返す(記録がない場合はNone)。"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        cumulative = 0
+        for i, count in enumerate(self.counts):
+            if count and cumulative + count >= rank:
+                lower = self.buckets[i - 1] if i > 0 else 0.0
+                upper = self.buckets[i] if i < len(self.buckets) else self.max
+                estimate = lower + (upper - lower) * (rank - cumulative) / count
+                return min(estimate, self.max)
+            cumulative += count
+        return self.max
+
+    def summary(self, scale: float = 1.0) -> dict[str, float | None]:
+        """パーセンタイル、平均、最大値を scale 倍した辞書を返す。"""
+
+        def scaled(value: float | None) -> float | None:
+            return None if value is None else round(value * scale, 3)
+
+        result = {f"p{p}": scaled(self.quantile(p / 100)) for p in PERCENTILES}
+        result["mean"] = scaled(self.sum / self.count if self.count else None)
+        result["max"] = scaled(self.max if self.count else None)
+        return result
+
+
+def percentile(sorted_values: Sequence[float], percent: float) -> float:
+    """昇順に並んだ値の percent パーセンタイル(最近接順位法)。
+
+    ヒストグラムを使わずに全ての値を保持できる、負荷試験やベンチマークの集計に使う。
+    """
+    index = max(0, round(percent / 100 * len(sorted_values)) - 1)
+    return sorted_values[min(index, len(sorted_values) - 1)]
+
+
+class ToolMetrics:
+    """1つのツールの呼び出し回数、エラー数、処理時間、レスポンスサイズ。"""
+
+    def __init__(self):
+        self.calls = 0
+        self.errors: Counter[str] = Counter()
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.payload = Histogram(PAYLOAD_BUCKETS)
+
+
+_lock = threading.Lock()
+_tools: dict[str, ToolMetrics] = {}
+_started = time.monotonic()
+
+
+def payload_size(result: Any) -> int:
+    """ツールの戻り値をJSONにした場合のおおよそのバイト数を返す。"""
+    if isinstance(result, str):
+        return len(result.encode())
+    return len(json.dumps(result, ensure_ascii=False, default=str).encode())
+
+
+def error_type_of(result: Any) -> str | None:
+    """戻り値がエラー辞書の場合、その error_type を返す。"""
+    if isinstance(result, dict) and result.get("error") is True:
+        return str(result.get("error_type", "UnknownError"))
+    return None
+
+
+def record_call(
+    tool: str,
+    seconds: float,
+    result: Any = None,
+    error_type: str | None = None,
+    size: int | None = None,
+) -> None:
+    """ツールの呼び出し1回分を記録する。
+
+    Args:
+        tool: ツール名
+        seconds: 処理時間(秒)
+        result: ツールの戻り値(レスポンスサイズとエラー種別の判定に使用)
+        error_type: 例外が発生した場合の例外クラス名(指定した場合は result を使わない)
+        size: 計算済みのレスポンスサイズ(省略時は result から計算する)
+    """
+    if error_type is None:
+        error_type = error_type_of(result)
+        if size is None:
+            size = payload_size(result)
+    else:
+        size = None
+
+    with _lock:
+        metrics = _tools.get(tool)
+        if metrics is None:
+            metrics = _tools[tool] = ToolMetrics()
+        metrics.calls += 1
+        metrics.latency.observe(seconds)
+        if size is not None:
+            metrics.payload.observe(size)
+        if error_type is not None:
+            metrics.errors[error_type] += 1
+
+
+def get_metrics() -> dict[str, Any]:
+    """ツールごとの集計結果を返す。
+
+    Returns:
+        pid、uptime_seconds、tools(ツール名から calls、errors、error_types、
+        latency_ms、payload_bytes への辞書)を含む辞書
+    """
+    with _lock:
+        tools = {
+            name: {
+                "calls": metrics.calls,
+                "errors": sum(metrics.errors.values()),
+                "error_types": dict(metrics.errors),
+                "latency_ms": metrics.latency.summary(scale=1000),
+                "payload_bytes": {
+                    **metrics.payload.summary(),
+                    "total": metrics.payload.sum,
+                },
+            }
+            for name, metrics in sorted(_tools.items())
+        }
+    return {
+        "pid": os.getpid(),
+        "uptime_seconds": round(time.monotonic() - _started, 3),
+        "tools": tools,
+    }
+
+
+def _label(value: str) -> str:
+    """Prometheus のラベル値をエスケープする。"""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _histogram_lines(name: str, labels: str, histogram: Histogram) -> list[str]:
+    """ヒストグラムを Prometheus 形式の行(累積バケット、合計、件数)に変換する。"""
+    lines = []
+    cumulative = 0
+    for bound, count in zip(histogram.buckets, histogram.counts, strict=False):
+        cumulative += count
+        lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+    lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {histogram.count}')
+    lines.append(f"{name}_sum{{{labels}}} {histogram.sum}")
+    lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+    return lines
+
+
+def render_prometheus() -> str:
+    """集計結果を Prometheus のテキスト形式で返す。
+
+    集計はプロセスごとのため、全ての系列に pid ラベルを付ける。複数ワーカーの
+    場合は、スクレイプしたワーカーごとに別の系列になる(合計は pid を除いて集約する)。
+    """
+    pid = os.getpid()
+
+    def labels(tool: str) -> str:
+        return f'pid="{pid}",tool="{_label(tool)}"'
+
+    calls = f"{METRIC_PREFIX}_tool_calls_total"
+    errors = f"{METRIC_PREFIX}_tool_errors_total"
+    duration = f"{METRIC_PREFIX}_tool_duration_seconds"
+    payload = f"{METRIC_PREFIX}_tool_response_bytes"
+
+    with _lock:
+        tools = sorted(_tools.items())
+        lines = [
+            f"# HELP {calls} Number of tool calls.",
+            f"# TYPE {calls} counter",
+            *(f"{calls}{{{labels(name)}}} {m.calls}" for name, m in tools),
+            f"# HELP {errors} Number of tool calls that returned an error, by error type.",
+            f"# TYPE {errors} counter",
+            *(
+                f'{errors}{{{labels(name)},error_type="{_label(error_type)}"}} {count}'
+                for name, m in tools
+                for error_type, count in sorted(m.errors.items())
+            ),
+            f"# HELP {duration} Tool call latency in seconds.",
+            f"# TYPE {duration} histogram",
+            *(
+                line
+                for name, m in tools
+                for line in _histogram_lines(duration, labels(name), m.latency)
+            ),
+            f"# HELP {payload} Size of tool responses in bytes.",
+            f"# TYPE {payload} histogram",
+            *(
+                line
+                for name, m in tools
+                for line in _histogram_lines(payload, labels(name), m.payload)
+            ),
+        ]
+    return "\n".join(lines) + "\n"
+
+
+def reset_metrics() -> None:
+    """全ての集計結果を破棄する。"""
+    global _started
+    with _lock:
+        _tools.clear()
+        _started = time.monotonic()
@@ -0,0 +1,201 @@
+"""Immutable in-memory snapshot of the J-Quants documentation data."""
+
+import hashlib
+import json
+from dataclasses import dataclass, field
+from typing import Any
+
+from j_quants_doc_mcp.indexes.faq import FaqIndex
+from j_quants_doc_mcp.indexes.fuzzy import FuzzyIndex
+from j_quants_doc_mcp.indexes.property import PropertyIndex
+from j_quants_doc_mcp.indexes.search import EndpointSearchIndex
+
+# コンパイル済みスナップショットの形式バージョン。
+# DataSnapshot やインデックスの構造を変更した場合は値を更新すること。
+SNAPSHOT_FORMAT_VERSION = 8
+
+
+class FrozenDict(dict):
+    """変更不可の辞書。
+
+    dict のサブクラスのため、JSONシリアライズや dict との比較はそのまま行える。
+    変更が必要な場合は dict(...) でコピーしてから操作すること。
+    """
+
+    def _readonly(self, *args: Any, **kwargs: Any) -> Any:
+        raise TypeError("FrozenDict は変更できません")
+
+    __setitem__ = _readonly
+    __delitem__ = _readonly
+    __ior__ = _readonly
+    clear = _readonly
+    pop = _readonly
+    popitem = _readonly
+    setdefault = _readonly
+    update = _readonly
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return (FrozenDict, (dict(self),))
+
+
+class FrozenList(list):
+    """変更不可のリスト。
+
+    list のサブクラスのため、JSONシリアライズや list との比較はそのまま行える。
+    """
+
+    def _readonly(self, *args: Any, **kwargs: Any) -> Any:
+        raise TypeError("FrozenList は変更できません")
+
+    __setitem__ = _readonly
+    __delitem__ = _readonly
+    __iadd__ = _readonly
+    __imul__ = _readonly
+    append = _readonly
+    clear = _readonly
+    extend = _readonly
+    insert = _readonly
+    pop = _readonly
+    remove = _readonly
+    reverse = _readonly
+    sort = _readonly
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return (FrozenList, (list(self),))
+
+
+def freeze(value: Any) -> Any:
+    """JSON互換の値を再帰的に変更不可の形へ変換する。
+
+    Args:
+        value: json.load で得られる値
+
+    Returns:
+        dict は FrozenDict、list は FrozenList に置き換えた値
+    """
+    if isinstance(value, dict):
+        return FrozenDict({k: freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return FrozenList(freeze(v) for v in value)
+    return value
+
+
+def compute_version(*documents: Any) -> str:
+    """ドキュメント内容からスナップショットのバージョン文字列を計算する。"""
+    digest = hashlib.sha256()
+    for document in documents:
+        digest.update(
+            json.dumps(document, ensure_ascii=False, sort_keys=True).encode("utf-8")
+        )
+    return digest.hexdigest()[:16]
+
+
+def build_endpoint_index(endpoints: list[dict[str, Any]]) -> FrozenDict:
+    """エンドポイント名・パス・旧パスからエンドポイントを引くインデックスを構築する。
+
+    キーが重複する場合は、名前 > パス > 旧パスの順で優先し、
+    同じ種類の中ではファイル内で先に定義されたものを優先する。
+
+    Args:
+        endpoints: エンドポイント定義のリスト
+
+    Returns:
+        キーからエンドポイント定義への辞書
+    """
+    index: dict[str, Any] = {}
+    for key in ("name", "path", "path_old"):
+        for endpoint in endpoints:
+            value = endpoint.get(key)
+            if value:
+                index.setdefault(value, endpoint)
+    return FrozenDict(index)
+
+
+@dataclass(frozen=True)
+class DataSnapshot:
+    """ドキュメントデータの1世代分のスナップショット。
+
+    各ツールは呼び出しごとに1つのスナップショットだけを参照することで、
+    同一呼び出し内で一貫したデータを扱う。
+
+    Attributes:
+        endpoints: endpoints.json の endpoints 配列
+        faqs: faq.json の faqs 配列
+        reference_data: reference_data.json の reference_data 配列
+        patterns: patterns.json の patterns 配列(PatternCollectionで検証済み)
+        version: データ内容から計算したバージョン文字列
+        endpoint_index: 名前・パス・旧パスからエンドポイントへのインデックス
+        property_index: プロパティ名からエンドポイントと参照データへの転置インデックス
+        search_index: エンドポイントの全文検索インデックス
+        faq_index: FAQの質問文・キーワードのインデックス
+        fuzzy_index: 名前・パス・旧パス・英語名のあいまい検索インデックス
+    """
+
+    endpoints: FrozenList
+    faqs: FrozenList
+    reference_data: FrozenList
+    patterns: FrozenList
+    version: str
+    # インデックスはデータから導出されるため、比較対象に含めない
+    endpoint_index: FrozenDict = field(compare=False)
+    property_index: PropertyIndex = field(compare=False)
+    search_index: EndpointSearchIndex = field(compare=False)
+    faq_index: FaqIndex = field(compare=False)
+    fuzzy_index: FuzzyIndex = field(compare=False)
+
+    def find_endpoint(self, name_or_path: str) -> dict[str, Any] | None:
+        """エンドポイント名、パス、または旧パスからエンドポイント定義を取得する。
+
+        Args:
+            name_or_path: エンドポイント名(例: eq-bars-daily)またはパス
+                          (例: /equities/bars/daily, /prices/daily_quotes)
+
+        Returns:
+            エンドポイント定義、またはNone(見つからない場合)
+        """
+        return self.endpoint_index.get(name_or_path)
+
+    @classmethod
+    def from_documents(
+        cls,
+        endpoints: dict[str, Any] | None = None,
+        faqs: dict[str, Any] | None = None,
+        reference_data: dict[str, Any] | None = None,
+        patterns: dict[str, Any] | None = None,
+        version: str | None = None,
+    ) -> "DataSnapshot":
+        """各JSONファイルと同じ形式の辞書からスナップショットを構築する。
+
+        Args:
+            endpoints: endpoints.json 形式の辞書
+            faqs: faq.json 形式の辞書
+            reference_data: reference_data.json 形式の辞書
+            patterns: patterns.json 形式の辞書
+            version: バージョン文字列(省略時は内容から計算)
+
+        Returns:
+            DataSnapshot: 構築したスナップショット
+        """
+        endpoints = endpoints or {}
+        faqs = faqs or {}
+        reference_data = reference_data or {}
+        patterns = patterns or {}
+        if version is None:
+            version = compute_version(endpoints, faqs, reference_data, patterns)
+
+        frozen_endpoints = freeze(endpoints.get("endpoints", []))
+        frozen_faqs = freeze(faqs.get("faqs", []))
+        frozen_reference_data = freeze(reference_data.get("reference_data", []))
+
+        return cls(
+            endpoints=frozen_endpoints,
+            faqs=frozen_faqs,
+            reference_data=frozen_reference_data,
+            patterns=freeze(patterns.get("patterns", [])),
+            version=version,
+            endpoint_index=build_endpoint_index(frozen_endpoints),
+            property_index=PropertyIndex(frozen_endpoints, frozen_reference_data),
+            search_index=EndpointSearchIndex(frozen_endpoints),
+            faq_index=FaqIndex(frozen_faqs),
+            fuzzy_index=FuzzyIndex(frozen_endpoints),
+        )
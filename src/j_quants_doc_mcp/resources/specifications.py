@@ -1,18 +1,28 @@
 """API specifications resource for J-Quants."""
 
+import hashlib
 import json
 import logging
+import pickle
 from pathlib import Path
 
 from pydantic import ValidationError
 
 from j_quants_doc_mcp.models.endpoint import EndpointCollection
 from j_quants_doc_mcp.models.pattern import PatternCollection
+from j_quants_doc_mcp.resources.snapshot import SNAPSHOT_FORMAT_VERSION, DataSnapshot
 
 # ロガーの設定
 logger = logging.getLogger(__name__)
 
 
+# スナップショットを構成するデータファイル
+DATA_FILES = ("endpoints.json", "faq.json", "reference_data.json", "patterns.json")
+
+# ビルド時に生成するコンパイル済みスナップショットのファイル名
+COMPILED_SNAPSHOT_FILE = "snapshot.pickle"
+
+
 class DataLoadError(Exception):
     """データ読み込みエラー用の例外クラス"""
 
@@ -29,6 +39,31 @@ def get_templates_directory() -> Path:
     return Path(__file__).parent.parent / "templates"
 
 
+def get_data_file_stats(data_dir: Path | None = None) -> tuple:
+    """
+    データファイルの更新時刻とサイズを取得する。
+
+    変更検知に使用する。存在しないファイルは None として扱う。
+
+    Args:
+        data_dir: データディレクトリのパス。指定しない場合はデフォルトのパスを使用。
+
+    Returns:
+        tuple: DATA_FILES の順に (更新時刻ns, サイズ) または None を並べたタプル
+    """
+    if data_dir is None:
+        data_dir = get_data_directory()
+
+    stats = []
+    for file_name in DATA_FILES:
+        try:
+            stat = (data_dir / file_name).stat()
+            stats.append((stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            stats.append(None)
+    return tuple(stats)
+
+
 def load_sample_code(sample_code_path: str) -> str:
     """
     サンプルコードファイルを読み込む。
@@ -199,3 +234,187 @@ def load_reference_data(file_path: Path | None = None) -> dict:
         error_msg = f"Unexpected error loading reference data from {file_path}: {e}"
         logger.error(error_msg)
         raise DataLoadError(error_msg) from e
+
+
+def _read_data_files(data_dir: Path) -> tuple[dict[str, bytes], str]:
+    """データファイルを読み込み、内容とバージョン(内容のハッシュ)を返す。"""
+    digest = hashlib.sha256()
+    contents = {}
+    for file_name in DATA_FILES:
+        file_path = data_dir / file_name
+        try:
+            if not file_path.exists():
+                raise DataLoadError(f"Data file not found: {file_path}")
+
+            contents[file_name] = file_path.read_bytes()
+            digest.update(contents[file_name])
+
+        except Exception as e:
+            if isinstance(e, DataLoadError):
+                raise
+            error_msg = f"Unexpected error loading data from {file_path}: {e}"
+            logger.error(error_msg)
+            raise DataLoadError(error_msg) from e
+
+    return contents, digest.hexdigest()[:16]
+
+
+def _load_compiled_snapshot(file_path: Path, version: str) -> DataSnapshot | None:
+    """
+    コンパイル済みスナップショットを読み込む。
+
+    ファイルが存在しない、形式が古い、またはデータファイルと内容が一致しない場合は
+    Noneを返す。
+
+    Args:
+        file_path: コンパイル済みスナップショットのパス
+        version: 現在のデータファイルから計算したバージョン
+
+    Returns:
+        DataSnapshot | None: 読み込んだスナップショット
+    """
+    if not file_path.exists():
+        return None
+
+    try:
+        with open(file_path, "rb") as f:
+            payload = pickle.load(f)
+    except (
+        OSError,
+        pickle.UnpicklingError,
+        EOFError,
+        AttributeError,
+        ImportError,
+        ValueError,
+    ) as e:
+        # 壊れたファイルや、クラスの移動・削除で復元できないファイルはJSONから読み込む
+        logger.warning(f"Ignoring unreadable compiled snapshot {file_path}: {e!r}")
+        return None
+
+    if (
+        not isinstance(payload, dict)
+        or payload.get("format") != SNAPSHOT_FORMAT_VERSION
+        or not isinstance(payload.get("snapshot"), DataSnapshot)
+    ):
+        logger.info(f"Ignoring compiled snapshot with old format: {file_path}")
+        return None
+
+    snapshot = payload["snapshot"]
+    if snapshot.version != version:
+        logger.info(f"Ignoring stale compiled snapshot: {file_path}")
+        return None
+
+    return snapshot
+
+
+def load_snapshot(
+    data_dir: Path | None = None, use_compiled: bool = True
+) -> DataSnapshot:
+    """
+    データディレクトリの全JSONファイルを読み込み、DataSnapshotを構築する。
+
+    patterns.json は PatternCollection で検証した結果を保持する。
+    データファイルと内容が一致するコンパイル済みスナップショットがある場合は、
+    JSONの解析と検証を省略してそちらを使用する。
+
+    Args:
+        data_dir: データディレクトリのパス。指定しない場合はデフォルトのパスを使用。
+        use_compiled: コンパイル済みスナップショットを使用するかどうか
+
+    Returns:
+        DataSnapshot: 変更不可のデータスナップショット
+
+    Raises:
+        DataLoadError: ファイルの読み込みまたは検証に失敗した場合
+    """
+    if data_dir is None:
+        data_dir = get_data_directory()
+
+    logger.info(f"Loading data snapshot from: {data_dir}")
+
+    contents, version = _read_data_files(data_dir)
+
+    if use_compiled:
+        snapshot = _load_compiled_snapshot(data_dir / COMPILED_SNAPSHOT_FILE, version)
+        if snapshot is not None:
+            logger.info(f"Loaded compiled data snapshot {snapshot.version}")
+            return snapshot
+
+    documents = {}
+    for file_name, raw in contents.items():
+        try:
+            documents[file_name] = json.loads(raw)
+        except json.JSONDecodeError as e:
+            error_msg = f"Invalid JSON format in {data_dir / file_name}: {e}"
+            logger.error(error_msg)
+            raise DataLoadError(error_msg) from e
+
+    try:
+        pattern_collection = PatternCollection(**documents["patterns.json"])
+    except ValidationError as e:
+        error_msg = f"Data validation failed for {data_dir / 'patterns.json'}: {e}"
+        logger.error(error_msg)
+        raise DataLoadError(error_msg) from e
+
+    try:
+        snapshot = DataSnapshot.from_documents(
+            endpoints=documents["endpoints.json"],
+            faqs=documents["faq.json"],
+            reference_data=documents["reference_data.json"],
+            patterns={
+                "patterns": [
+                    p.model_dump(exclude_none=True) for p in pattern_collection.patterns
+                ]
+            },
+            version=version,
+        )
+    except (AttributeError, KeyError, TypeError) as e:
+        # JSONとしては正しいが、想定した構造(オブジェクトの配列など)でない場合
+        error_msg = f"Unexpected data structure in {data_dir}: {e!r}"
+        logger.error(error_msg)
+        raise DataLoadError(error_msg) from e
+
+    logger.info(
+        f"Successfully loaded data snapshot {snapshot.version} "
+        f"({len(snapshot.endpoints)} endpoints, {len(snapshot.faqs)} faqs, "
+        f"{len(snapshot.reference_data)} reference data entries, "
+        f"{len(snapshot.patterns)} patterns)"
+    )
+    return snapshot
+
+
+def compile_snapshot(
+    data_dir: Path | None = None, output_path: Path | None = None
+) -> Path:
+    """
+    データファイルを検証し、コンパイル済みスナップショットを書き出す。
+
+    endpoints.json は EndpointCollection、patterns.json は PatternCollection で
+    検証したうえで、インデックスを含むスナップショット全体をpickle形式で保存する。
+
+    Args:
+        data_dir: データディレクトリのパス。指定しない場合はデフォルトのパスを使用。
+        output_path: 出力先のパス。指定しない場合はデータディレクトリ直下に出力。
+
+    Returns:
+        Path: 書き出したファイルのパス
+
+    Raises:
+        DataLoadError: ファイルの読み込みまたは検証に失敗した場合
+    """
+    if data_dir is None:
+        data_dir = get_data_directory()
+    if output_path is None:
+        output_path = data_dir / COMPILED_SNAPSHOT_FILE
+
+    load_endpoints(data_dir / "endpoints.json")
+    snapshot = load_snapshot(data_dir, use_compiled=False)
+
+    payload = {"format": SNAPSHOT_FORMAT_VERSION, "snapshot": snapshot}
+    tmp_path = output_path.with_name(output_path.name + ".tmp")
+    with open(tmp_path, "wb") as f:
+        pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+    tmp_path.replace(output_path)
+
+    logger.info(f"Compiled data snapshot {snapshot.version} to: {output_path}")
+    return output_path
@@ -0,0 +1,179 @@
+"""Process-wide store holding the current documentation data snapshot."""
+
+import logging
+import math
+import pickle
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+
+from pydantic import ValidationError
+
+from j_quants_doc_mcp.resources.snapshot import DataSnapshot
+from j_quants_doc_mcp.resources.specifications import (
+    DataLoadError,
+    get_data_directory,
+    get_data_file_stats,
+    load_snapshot,
+)
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_snapshot: DataSnapshot | None = None
+
+# 再読み込みに失敗しても現在のスナップショットを使い続ける例外
+# (load_snapshot は通常 DataLoadError にまとめて送出する)
+_RELOAD_ERRORS = (
+    DataLoadError,
+    OSError,
+    ValueError,
+    ValidationError,
+    pickle.UnpicklingError,
+)
+
+# pin_snapshot() のブロック内で get_snapshot() が返すスナップショット
+_pinned: ContextVar[DataSnapshot | None] = ContextVar("pinned_snapshot", default=None)
+
+
+def get_snapshot() -> DataSnapshot:
+    """現在のデータスナップショットを取得する。
+
+    初回呼び出し時にのみデータファイルを読み込み、以降はプロセス内で共有する。
+    ツールは1回の呼び出しにつき1度だけ取得し、同じスナップショットを使い続けること。
+
+    Returns:
+        DataSnapshot: 現在のスナップショット
+
+    Raises:
+        DataLoadError: 初回読み込みに失敗した場合
+    """
+    global _snapshot
+
+    snapshot = _pinned.get()
+    if snapshot is not None:
+        return snapshot
+
+    snapshot = _snapshot
+    if snapshot is None:
+        with _lock:
+            if _snapshot is None:
+                _snapshot = load_snapshot()
+            snapshot = _snapshot
+    return snapshot
+
+
+@contextmanager
+def pin_snapshot() -> Iterator[DataSnapshot]:
+    """ブロック内の get_snapshot() が同じスナップショットを返すよう固定する。
+
+    複数のツール呼び出しをまとめて実行する場合に、途中でスナップショットが
+    差し替えられても全ての呼び出しで同じデータを参照させるために使う。
+    固定は現在のスレッド(コンテキスト)にのみ適用される。
+
+    Yields:
+        DataSnapshot: 固定したスナップショット
+    """
+    snapshot = get_snapshot()
+    token = _pinned.set(snapshot)
+    try:
+        yield snapshot
+    finally:
+        _pinned.reset(token)
+
+
+def set_snapshot(snapshot: DataSnapshot | None) -> None:
+    """現在のスナップショットを差し替える。
+
+    参照の差し替えのみを行うため、実行中のツール呼び出しは取得済みの
+    スナップショットを最後まで使い続ける。
+
+    Args:
+        snapshot: 新しいスナップショット(Noneの場合は次回アクセス時に再読み込み)
+    """
+    global _snapshot
+
+    with _lock:
+        _snapshot = snapshot
+
+
+class SnapshotWatcher:
+    """データファイルの変更を監視し、スナップショットを差し替えるスレッド。
+
+    更新時刻とサイズの変化を検知すると、バックグラウンドで新しいスナップショットを
+    完全に構築してから差し替える。内容のハッシュ(バージョン)が変わっていない場合や
+    読み込みに失敗した場合は、現在のスナップショットを維持する。
+    """
+
+    def __init__(self, data_dir: Path | None = None, interval: float = 5.0):
+        """監視スレッドを初期化。
+
+        Args:
+            data_dir: 監視するデータディレクトリ(省略時はデフォルトのパス)
+            interval: 変更をチェックする間隔(秒)。正の有限値
+
+        Raises:
+            ValueError: interval が正の有限値でない場合
+        """
+        if not (math.isfinite(interval) and interval > 0):
+            raise ValueError(f"interval must be a positive number: {interval}")
+        self.data_dir = data_dir or get_data_directory()
+        self.interval = interval
+        self._stats = get_data_file_stats(self.data_dir)
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def check(self) -> bool:
+        """データファイルの変更を確認し、必要ならスナップショットを差し替える。
+
+        Returns:
+            スナップショットを差し替えた場合はTrue
+        """
+        stats = get_data_file_stats(self.data_dir)
+        if stats == self._stats:
+            return False
+
+        try:
+            snapshot = load_snapshot(self.data_dir)
+        except _RELOAD_ERRORS as e:
+            # 書き込み途中のファイルなどは、次回のチェックで読み込み直す
+            logger.warning(f"Failed to reload data snapshot, keeping current: {e}")
+            return False
+        self._stats = stats
+
+        current = _snapshot
+        if current is not None and current.version == snapshot.version:
+            return False
+
+        set_snapshot(snapshot)
+        logger.info(f"Data snapshot reloaded: version {snapshot.version}")
+        return True
+
+    def start(self) -> None:
+        """監視スレッドを開始する。"""
+        if self._thread is not None:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="snapshot-watcher", daemon=True
+        )
+        self._thread.start()
+        logger.info(
+            f"Watching data files in {self.data_dir} every {self.interval} seconds"
+        )
+
+    def stop(self) -> None:
+        """監視スレッドを停止する。"""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            try:
+                self.check()
+            except OSError as e:
+                logger.error(f"Error while watching data files: {e}")
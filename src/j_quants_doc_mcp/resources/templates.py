@@ -0,0 +1,211 @@
+"""Process-wide registry of compiled Jinja2 code generation templates."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import shutil
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from j_quants_doc_mcp.resources.specifications import (
+    get_data_directory,
+    get_templates_directory,
+)
+
+if TYPE_CHECKING:
+    # Jinja2 は最初にテンプレートを使うときに読み込む(起動時間の短縮のため)
+    from jinja2 import Environment, Template
+
+logger = logging.getLogger(__name__)
+
+# コード生成に使うテンプレートの拡張子
+TEMPLATE_SUFFIX = ".jinja2"
+
+# ビルド時にプリコンパイルしたテンプレートの出力先ディレクトリ名(データディレクトリ直下)
+COMPILED_TEMPLATES_DIR = "compiled_templates"
+
+# プリコンパイル時のテンプレート内容とJinja2のバージョンを記録するファイル名
+MANIFEST_FILE = "manifest.json"
+
+_lock = threading.Lock()
+_environment: Environment | None = None
+_version: str | None = None
+_templates: dict[str, Template] = {}
+
+
+def _template_names(templates_dir: Path) -> list[str]:
+    """テンプレートディレクトリ配下のテンプレート名(相対パス)を返す。"""
+    return sorted(
+        path.relative_to(templates_dir).as_posix()
+        for path in templates_dir.rglob(f"*{TEMPLATE_SUFFIX}")
+    )
+
+
+def compute_templates_version(templates_dir: Path | None = None) -> str:
+    """テンプレートの内容からバージョン文字列を計算する。
+
+    Args:
+        templates_dir: テンプレートディレクトリのパス。指定しない場合はデフォルトのパスを使用。
+
+    Returns:
+        全テンプレートの名前と内容から計算したハッシュ値(16桁)
+    """
+    if templates_dir is None:
+        templates_dir = get_templates_directory()
+
+    digest = hashlib.sha256()
+    for name in _template_names(templates_dir):
+        digest.update(name.encode("utf-8") + b"\0")
+        digest.update((templates_dir / name).read_bytes() + b"\0")
+    return digest.hexdigest()[:16]
+
+
+def _read_manifest(compiled_dir: Path) -> dict | None:
+    """プリコンパイル済みテンプレートのマニフェストを読み込む(存在しない場合はNone)。"""
+    try:
+        with open(compiled_dir / MANIFEST_FILE, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _create_environment(
+    templates_dir: Path, compiled_dir: Path
+) -> tuple[Environment, str]:
+    """テンプレート環境を作成する。
+
+    テンプレートの内容とJinja2のバージョンがマニフェストと一致する場合のみ、
+    プリコンパイル済みのモジュールから読み込む。
+
+    Returns:
+        (Environment, テンプレートのバージョン文字列)
+    """
+    import jinja2
+    from jinja2 import ChoiceLoader, Environment, FileSystemLoader, ModuleLoader
+
+    version = compute_templates_version(templates_dir)
+    source_loader = FileSystemLoader(templates_dir)
+
+    manifest = _read_manifest(compiled_dir)
+    if (
+        manifest is not None
+        and manifest.get("templates_version") == version
+        and manifest.get("jinja2_version") == jinja2.__version__
+    ):
+        logger.info(f"Using precompiled templates from: {compiled_dir}")
+        loader = ChoiceLoader([ModuleLoader(str(compiled_dir)), source_loader])
+    else:
+        if manifest is not None:
+            logger.info("Precompiled templates are stale, compiling from source")
+        loader = source_loader
+
+    # テンプレートはプロセス内で一度だけコンパイルするため、更新チェックは行わない
+    return Environment(loader=loader, auto_reload=False), version
+
+
+def _get_environment() -> Environment:
+    """テンプレート環境を取得する(未作成の場合は作成する)。"""
+    global _environment, _version
+    if _environment is None:
+        with _lock:
+            if _environment is None:
+                _environment, _version = _create_environment(
+                    get_templates_directory(),
+                    get_data_directory() / COMPILED_TEMPLATES_DIR,
+                )
+                logger.info(f"Template environment created (version {_version})")
+    return _environment
+
+
+def get_templates_version() -> str:
+    """現在のテンプレート環境が読み込んだテンプレートのバージョン文字列を返す。"""
+    _get_environment()
+    return _version
+
+
+def get_template(name: str) -> Template:
+    """コンパイル済みのテンプレートを取得する。
+
+    初回呼び出し時にのみテンプレートを読み込んでコンパイルし、以降は
+    同じ Template オブジェクトを返す。
+
+    Args:
+        name: テンプレート名(例: python_httpx.jinja2)
+
+    Returns:
+        Template: コンパイル済みテンプレート
+
+    Raises:
+        jinja2.TemplateNotFound: テンプレートが存在しない場合
+    """
+    template = _templates.get(name)
+    if template is None:
+        environment = _get_environment()
+        with _lock:
+            template = _templates.get(name)
+            if template is None:
+                template = environment.get_template(name)
+                _templates[name] = template
+    return template
+
+
+def clear_template_cache() -> None:
+    """テンプレート環境とコンパイル済みテンプレートのキャッシュを破棄する。
+
+    次回の get_template 呼び出し時にテンプレートを読み込み直す。
+    """
+    global _environment, _version
+    with _lock:
+        _environment = None
+        _version = None
+        _templates.clear()
+
+
+def compile_templates(
+    templates_dir: Path | None = None, output_dir: Path | None = None
+) -> Path:
+    """テンプレートをPythonモジュールにプリコンパイルして書き出す。
+
+    書き出したディレクトリには、テンプレートの内容とJinja2のバージョンを記録した
+    マニフェストを置く。起動時にどちらかが一致しない場合は使用されない。
+
+    Args:
+        templates_dir: テンプレートディレクトリのパス。指定しない場合はデフォルトのパスを使用。
+        output_dir: 出力先ディレクトリ。指定しない場合はデータディレクトリ直下に出力。
+
+    Returns:
+        Path: 書き出したディレクトリのパス
+    """
+    import jinja2
+    from jinja2 import Environment, FileSystemLoader
+
+    if templates_dir is None:
+        templates_dir = get_templates_directory()
+    if output_dir is None:
+        output_dir = get_data_directory() / COMPILED_TEMPLATES_DIR
+
+    # 一時ディレクトリに書き出してから置き換える
+    tmp_dir = output_dir.with_name(output_dir.name + ".tmp")
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    environment = Environment(loader=FileSystemLoader(templates_dir))
+    environment.compile_templates(
+        str(tmp_dir),
+        filter_func=lambda name: name.endswith(TEMPLATE_SUFFIX),
+        zip=None,
+    )
+    manifest = {
+        "templates_version": compute_templates_version(templates_dir),
+        "jinja2_version": jinja2.__version__,
+    }
+    with open(tmp_dir / MANIFEST_FILE, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+
+    shutil.rmtree(output_dir, ignore_errors=True)
+    tmp_dir.replace(output_dir)
+
+    logger.info(f"Compiled templates {manifest['templates_version']} to: {output_dir}")
+    return output_dir
@@ -17,6 +17,11 @@ class SearchEndpointsInput(BaseModel):
         None,
         description="オプションのカテゴリフィルタ(auth, listed, prices, fins等)",
     )
+    limit: int | None = Field(
+        None,
+        ge=1,
+        description="返す最大件数(省略時は全件)",
+    )
 
     @field_validator("keyword")
     @classmethod
@@ -43,6 +48,13 @@ class DescribeEndpointInput(BaseModel):
         min_length=1,
         description="エンドポイント名(例: eq-master, eq-bars-daily等)",
     )
+    auto_resolve: bool = Field(
+        False,
+        description=(
+            "Trueの場合、エンドポイント名が見つからず類似する候補が1つに絞れるときは、"
+            "その候補を使う"
+        ),
+    )
 
     @field_validator("endpoint_name")
     @classmethod
@@ -53,6 +65,75 @@ class DescribeEndpointInput(BaseModel):
         return v.strip()
 
 
+# コード生成の追加パラメータ(plan)に指定できる契約プラン
+CODEGEN_PLANS = ["Free", "Light", "Standard", "Premium"]
+
+# コード生成の追加パラメータ(columnar)に指定できるライブラリ
+CODEGEN_COLUMNAR_LIBRARIES = ["numpy", "pyarrow"]
+
+
+def _validate_codegen_params(
+    v: dict[str, Any] | None, supported: dict[str, type]
+) -> dict[str, Any] | None:
+    """コード生成の追加パラメータの名前・型・値を検証する。
+
+    Args:
+        v: 追加パラメータ
+        supported: 指定できるパラメータ名から型への辞書
+
+    Returns:
+        検証済みの追加パラメータ
+
+    Raises:
+        ValueError: サポートされていないパラメータや値が指定された場合
+    """
+    if v is None:
+        return v
+    for key, value in v.items():
+        if key not in supported:
+            raise ValueError(
+                f"追加パラメータ '{key}' はサポートされていません。"
+                f"現在は {', '.join(supported)} のみ対応しています。"
+            )
+        if not isinstance(value, supported[key]):
+            # pydantic のバリデータでは ValueError を送出して検証エラーにする
+            raise ValueError(  # noqa: TRY004
+                f"追加パラメータ '{key}' には {supported[key].__name__} を指定してください。"
+            )
+    if "plan" in v and v["plan"] not in CODEGEN_PLANS:
+        raise ValueError(
+            f"プラン '{v['plan']}' はサポートされていません。"
+            f"{', '.join(CODEGEN_PLANS)} のいずれかを指定してください。"
+        )
+    if "columnar" in v and v["columnar"] not in CODEGEN_COLUMNAR_LIBRARIES:
+        raise ValueError(
+            f"columnar '{v['columnar']}' はサポートされていません。"
+            f"{', '.join(CODEGEN_COLUMNAR_LIBRARIES)} のいずれかを指定してください。"
+        )
+    return v
+
+
+# バッチ版のツールで1回に指定できるエンドポイント数の上限
+MAX_BATCH_SIZE = 50
+
+
+class EndpointNamesInput(BaseModel):
+    """複数のエンドポイントをまとめて処理するバッチ版ツールの入力スキーマ。"""
+
+    endpoint_names: list[str] = Field(
+        ...,
+        min_length=1,
+        max_length=MAX_BATCH_SIZE,
+        description="エンドポイント名のリスト(例: ['eq-master', 'eq-bars-daily'])",
+    )
+
+    @field_validator("endpoint_names")
+    @classmethod
+    def endpoint_names_must_be_unique(cls, v: list[str]) -> list[str]:
+        """重複するエンドポイント名を取り除く(順序は最初の出現順)。"""
+        return list(dict.fromkeys(v))
+
+
 class GenerateSampleCodeInput(BaseModel):
     """generate_sample_code ツールの入力スキーマ。"""
 
@@ -63,11 +144,23 @@ class GenerateSampleCodeInput(BaseModel):
     )
     language: str = Field(
         default="python",
-        description="生成する言語(現在は'python'のみ対応)",
+        description="生成する言語('python' または非同期版の 'python-async')",
     )
     params: dict[str, Any] | None = Field(
         None,
-        description="追加パラメータ(将来の拡張用、現在は未使用)",
+        description=(
+            "追加パラメータ(async: Trueで非同期版を生成、"
+            "plan: レート制限に使う契約プラン、"
+            "bulk_download: Trueでbulk-list/bulk-getの一括ダウンローダーを生成、"
+            "columnar: numpy/pyarrowでバルクCSVを列形式で読み込むコードを生成)"
+        ),
+    )
+    auto_resolve: bool = Field(
+        False,
+        description=(
+            "Trueの場合、エンドポイント名が見つからず類似する候補が1つに絞れるときは、"
+            "その候補を使う"
+        ),
     )
 
     @field_validator("endpoint_name")
@@ -82,7 +175,7 @@ class GenerateSampleCodeInput(BaseModel):
     @classmethod
     def language_must_be_supported(cls, v: str) -> str:
         """サポートされている言語であることを検証。"""
-        supported = ["python"]
+        supported = ["python", "python-async"]
         v_lower = v.lower().strip()
         if v_lower not in supported:
             raise ValueError(
@@ -91,6 +184,54 @@ class GenerateSampleCodeInput(BaseModel):
             )
         return v_lower
 
+    @field_validator("params")
+    @classmethod
+    def params_must_be_supported(
+        cls, v: dict[str, Any] | None
+    ) -> dict[str, Any] | None:
+        """サポートされている追加パラメータであることを検証。"""
+        return _validate_codegen_params(
+            v,
+            {"async": bool, "plan": str, "bulk_download": bool, "columnar": str},
+        )
+
+
+class GenerateClientCodeInput(BaseModel):
+    """generate_client_code ツールの入力スキーマ。"""
+
+    language: str = Field(
+        default="python",
+        description="生成する言語('python' または非同期版の 'python-async')",
+    )
+    params: dict[str, Any] | None = Field(
+        None,
+        description=(
+            "追加パラメータ(async: Trueで非同期版を生成、"
+            "plan: レート制限に使う契約プラン)"
+        ),
+    )
+
+    @field_validator("language")
+    @classmethod
+    def language_must_be_supported(cls, v: str) -> str:
+        """サポートされている言語であることを検証。"""
+        supported = ["python", "python-async"]
+        v_lower = v.lower().strip()
+        if v_lower not in supported:
+            raise ValueError(
+                f"言語 '{v}' はサポートされていません。"
+                f"現在は {', '.join(supported)} のみ対応しています。"
+            )
+        return v_lower
+
+    @field_validator("params")
+    @classmethod
+    def params_must_be_supported(
+        cls, v: dict[str, Any] | None
+    ) -> dict[str, Any] | None:
+        """サポートされている追加パラメータであることを検証。"""
+        return _validate_codegen_params(v, {"async": bool, "plan": str})
+
 
 class AnswerQuestionInput(BaseModel):
     """answer_question ツールの入力スキーマ。"""
@@ -100,6 +241,11 @@ class AnswerQuestionInput(BaseModel):
         min_length=1,
         description="ユーザーからの質問(例: '認証方法は?', 'レート制限について教えて')",
     )
+    limit: int = Field(
+        3,
+        ge=1,
+        description="返す回答の最大件数(デフォルト: 3)",
+    )
 
     @field_validator("question")
     @classmethod
@@ -1,60 +1,206 @@
 """MCP Server implementation for J-Quants documentation."""
 
+import functools
 import logging
+import time
+from collections.abc import Callable
 from typing import Any
 
 from mcp.server.fastmcp import FastMCP
 from pydantic import ValidationError as PydanticValidationError
+from starlette.requests import Request
+from starlette.responses import Response
 
 from .exceptions import (
     format_internal_error,
     format_not_found_error,
     format_validation_error,
 )
-from .resources.specifications import load_patterns, load_sample_code
+from .executors import CODEGEN_POOL, QUERY_POOL, configure_pools, run_in_pool
+from .metrics import (
+    PROMETHEUS_CONTENT_TYPE,
+    get_metrics,
+    payload_size,
+    record_call,
+    render_prometheus,
+)
+from .resources.specifications import load_sample_code
+from .resources.store import SnapshotWatcher, get_snapshot, pin_snapshot
 from .schemas import (
     AnswerQuestionInput,
     DescribeEndpointInput,
+    EndpointNamesInput,
+    GenerateClientCodeInput,
     GenerateSampleCodeInput,
     LookupPropertyInput,
     SearchEndpointsInput,
 )
+from .tools.codegen import (
+    CLIENT_LANGUAGE_TEMPLATES,
+    LANGUAGE_TEMPLATES,
+    CodegenOptionError,
+    get_sample_code_cache_info,
+)
+from .tools.codegen import generate_client_code as generate_client_code_impl
 from .tools.codegen import generate_sample_code as generate_sample_code_impl
 from .tools.describe import describe_endpoint as describe_endpoint_impl
 from .tools.lookup import lookup_property as lookup_property_impl
 from .tools.qa import answer_question as answer_question_impl
 from .tools.search import search_endpoints as search_endpoints_impl
 
-# ロギング設定
-logging.basicConfig(
-    level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-)
+# ログの出力形式(run_server で設定する)
+LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
 logger = logging.getLogger(__name__)
 
+# エンドポイント未検出エラーに含める候補の最大数
+ENDPOINT_CANDIDATE_LIMIT = 5
+
+
+def _create_server() -> FastMCP:
+    """FastMCP サーバインスタンスを作成する。
+
+    FastMCP はインスタンス作成時にルートロガーを設定するため、このモジュールを
+    インポートしたアプリケーションのログ設定を変えないよう、作成後に元へ戻す。
+    """
+    root = logging.getLogger()
+    handlers, level = root.handlers[:], root.level
+    server = FastMCP("j-quants-doc-mcp")
+    root.handlers[:] = handlers
+    root.setLevel(level)
+    return server
+
+
 # FastMCP サーバインスタンスの作成
-mcp = FastMCP("j-quants-doc-mcp")
+mcp = _create_server()
+
+
+def _call_pinned(
+    func: Callable[..., Any], *args: Any, **kwargs: Any
+) -> tuple[Any, int]:
+    """1回のツール呼び出しの間、同じスナップショットを参照させて func を実行する。
+
+    レスポンスサイズ(戻り値のJSON変換)も実行したスレッドで計算し、
+    プールで実行するツールではイベントループを塞がないようにする。
+
+    Returns:
+        func の戻り値と、そのレスポンスサイズ(バイト)
+    """
+    with pin_snapshot():
+        result = func(*args, **kwargs)
+    return result, payload_size(result)
 
 
-@mcp.tool()
+def _tool(
+    pool: str | None = None,
+) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """同期のツール関数を、処理時間などを記録する非同期ハンドラとしてMCPに登録する。
+
+    MCPからの呼び出しごとに、スナップショットを固定して実行し(途中で再読み込み
+    されても1つの応答に2つの世代のデータが混ざらないようにする)、処理時間、
+    レスポンスサイズ、エラー種別を metrics に記録する。pool を指定した場合、
+    描画や順位付けなどCPU負荷の高い処理がイベントループを塞がないよう、
+    そのプールのスレッドで実行する。
+    関数自体は同期関数のまま返すため、モジュール内やテストからはそのまま呼び出せる。
+
+    Args:
+        pool: 実行するプール名(QUERY_POOL または CODEGEN_POOL)。
+              省略時はイベントループ上でそのまま実行する。
+
+    Returns:
+        ツール関数を登録するデコレータ
+    """
+
+    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        name = func.__name__
+
+        @functools.wraps(func)
+        async def handler(*args: Any, **kwargs: Any) -> Any:
+            started = time.perf_counter()
+            try:
+                if pool is None:
+                    result, size = _call_pinned(func, *args, **kwargs)
+                else:
+                    result, size = await run_in_pool(
+                        pool, _call_pinned, func, *args, **kwargs
+                    )
+            except Exception as e:
+                record_call(
+                    name, time.perf_counter() - started, error_type=type(e).__name__
+                )
+                raise
+            record_call(name, time.perf_counter() - started, result=result, size=size)
+            return result
+
+        mcp.tool()(handler)
+        return func
+
+    return decorator
+
+
+@_tool()
 def health_check() -> dict[str, Any]:
     """ヘルスチェック用の簡易Tool。
 
     サーバが正常に動作しているかを確認するためのツールです。
 
     Returns:
-        サーバの状態を示す辞書
+        サーバの状態を示す辞書:
+        - status: サーバの状態
+        - service: サービス名
+        - version: サーバのバージョン
+        - data_version: 読み込み中のデータのバージョン
+        - caches: キャッシュの統計情報(ヒット数、ミス数、破棄回数、件数、上限)
     """
     logger.info("Health check called")
-    return {"status": "healthy", "service": "j-quants-doc-mcp", "version": "0.1.0"}
+    return {
+        "status": "healthy",
+        "service": "j-quants-doc-mcp",
+        "version": "0.1.0",
+        "data_version": get_snapshot().version,
+        "caches": {"sample_code": get_sample_code_cache_info()},
+    }
+
 
+@_tool()
+def metrics() -> dict[str, Any]:
+    """ツールごとの呼び出し回数、エラー数、処理時間、レスポンスサイズを取得する。
 
-@mcp.tool()
-def search_endpoints(keyword: str, category: str | None = None) -> dict[str, Any]:
+    サーバ起動後(複数ワーカーの場合は応答したワーカーの起動後)の
+    MCP経由の呼び出しを集計する。パーセンタイルはヒストグラムからの推定値。
+
+    Returns:
+        集計結果を含む辞書:
+        - pid: 集計したプロセスのID
+        - uptime_seconds: 集計開始からの経過秒数
+        - tools: ツール名から以下への辞書
+            - calls: 呼び出し回数
+            - errors: エラーを返した回数
+            - error_types: エラー種別(ValidationError, NotFoundError 等)ごとの回数
+            - latency_ms: 処理時間(ミリ秒)の p50, p95, p99, mean, max
+            - payload_bytes: レスポンスサイズ(バイト)の p50, p95, p99, mean, max, total
+    """
+    return get_metrics()
+
+
+@mcp.custom_route("/metrics", methods=["GET"])
+async def metrics_endpoint(request: Request) -> Response:
+    """HTTPで起動した場合に、metrics を Prometheus のテキスト形式で返す。"""
+    return Response(render_prometheus(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+
+@_tool(QUERY_POOL)
+def search_endpoints(
+    keyword: str, category: str | None = None, limit: int | None = None
+) -> dict[str, Any]:
     """エンドポイントをキーワードとカテゴリで検索する。
 
+    空白区切りで複数の語を指定でき、結果は関連度(score)の高い順に返す。
+
     Args:
         keyword: 検索キーワード(エンドポイント名、パス、説明から検索)
         category: オプションのカテゴリフィルタ(auth, listed, prices, fins等)
+        limit: 返す最大件数(省略時は全件)
 
     Returns:
         検索結果を含む辞書(該当件数と結果配列)
@@ -65,7 +211,9 @@ def search_endpoints(keyword: str, category: str | None = None) -> dict[str, Any
 
     try:
         # 入力バリデーション
-        validated_input = SearchEndpointsInput(keyword=keyword, category=category)
+        validated_input = SearchEndpointsInput(
+            keyword=keyword, category=category, limit=limit
+        )
     except PydanticValidationError as e:
         error_details = e.errors()[0]
         field = error_details.get("loc", ["unknown"])[0]
@@ -73,18 +221,25 @@ def search_endpoints(keyword: str, category: str | None = None) -> dict[str, Any
         return format_validation_error(str(field), msg)
 
     try:
-        return search_endpoints_impl(validated_input.keyword, validated_input.category)
+        return search_endpoints_impl(
+            validated_input.keyword, validated_input.category, validated_input.limit
+        )
     except Exception as e:
         logger.error(f"Error in search_endpoints: {e}")
         return format_internal_error("エンドポイント検索", e)
 
 
-@mcp.tool()
-def describe_endpoint(endpoint_name: str) -> dict[str, Any]:
+@_tool(QUERY_POOL)
+def describe_endpoint(endpoint_name: str, auto_resolve: bool = False) -> dict[str, Any]:
     """指定されたエンドポイントの詳細情報を取得する。
 
+    見つからない場合のエラーには、名前・パス・英語名の似たエンドポイントの候補
+    (details.candidates)が含まれる。
+
     Args:
         endpoint_name: エンドポイント名(例: eq-master, eq-bars-daily等)
+        auto_resolve: Trueの場合、見つからない名前に類似する候補が1つに絞れるときは
+            その候補の詳細を返す(補正内容は auto_resolved に含まれる)
 
     Returns:
         エンドポイントの詳細情報を含む辞書(名前、パス、メソッド、パラメータ、レスポンス、認証要否、利用可能プラン)
@@ -93,7 +248,9 @@ def describe_endpoint(endpoint_name: str) -> dict[str, Any]:
 
     try:
         # 入力バリデーション
-        validated_input = DescribeEndpointInput(endpoint_name=endpoint_name)
+        validated_input = DescribeEndpointInput(
+            endpoint_name=endpoint_name, auto_resolve=auto_resolve
+        )
     except PydanticValidationError as e:
         error_details = e.errors()[0]
         field = error_details.get("loc", ["unknown"])[0]
@@ -102,31 +259,161 @@ def describe_endpoint(endpoint_name: str) -> dict[str, Any]:
 
     try:
         result = describe_endpoint_impl(validated_input.endpoint_name)
+        if result is None and validated_input.auto_resolve:
+            resolved = _resolve_endpoint(validated_input.endpoint_name)
+            if resolved is not None:
+                result = {
+                    **describe_endpoint_impl(resolved["endpoint_name"]),
+                    "auto_resolved": resolved,
+                }
         if result is None:
-            return format_not_found_error(
-                resource_type="エンドポイント",
-                identifier=validated_input.endpoint_name,
-                suggestion="正しいエンドポイント名を指定してください。search_endpoints ツールで検索できます。",
-            )
+            return _endpoint_not_found(validated_input.endpoint_name)
         return result
     except Exception as e:
         logger.error(f"Error in describe_endpoint: {e}")
         return format_internal_error("エンドポイント詳細取得", e)
 
 
-@mcp.tool()
+def _endpoint_not_found(endpoint_name: str) -> dict[str, Any]:
+    """エンドポイント未検出エラーを、類似するエンドポイントの候補付きで返す。"""
+    snapshot = get_snapshot()
+    candidates = []
+    for name, score in snapshot.fuzzy_index.suggest(
+        endpoint_name, ENDPOINT_CANDIDATE_LIMIT
+    ):
+        endpoint = snapshot.find_endpoint(name)
+        candidates.append(
+            {
+                "name": name,
+                "name_ja": endpoint["name_ja"],
+                "path": endpoint["path"],
+                "similarity": score,
+            }
+        )
+
+    if candidates:
+        names = ", ".join(candidate["name"] for candidate in candidates)
+        suggestion = (
+            f"もしかして: {names}。"
+            "auto_resolve=True を指定すると、候補が1つに絞れる場合は自動で補正します。"
+        )
+    else:
+        suggestion = "正しいエンドポイント名を指定してください。search_endpoints ツールで検索できます。"
+    return format_not_found_error(
+        resource_type="エンドポイント",
+        identifier=endpoint_name,
+        suggestion=suggestion,
+        candidates=candidates,
+    )
+
+
+def _resolve_endpoint(endpoint_name: str) -> dict[str, Any] | None:
+    """見つからないエンドポイント名を、明確に最も類似する候補へ補正する。
+
+    Returns:
+        requested(指定された名前)、endpoint_name(補正後の名前)、similarity を
+        含む辞書、または None(候補が1つに絞れない場合)
+    """
+    resolved = get_snapshot().fuzzy_index.resolve(endpoint_name)
+    if resolved is None:
+        return None
+    logger.info(f"Resolved unknown endpoint '{endpoint_name}' to '{resolved[0]}'")
+    return {
+        "requested": endpoint_name,
+        "endpoint_name": resolved[0],
+        "similarity": resolved[1],
+    }
+
+
+def _run_batch(
+    endpoint_names: list[str], tool: Callable[[str], dict[str, Any] | str]
+) -> dict[str, Any]:
+    """エンドポイントごとにツールを実行し、結果をエンドポイント名をキーにまとめる。
+
+    全ての呼び出しで同じスナップショットを参照する。個々の失敗は
+    そのエンドポイントの結果(エラー辞書)として返し、他の結果には影響しない。
+
+    Args:
+        endpoint_names: エンドポイント名のリスト
+        tool: エンドポイント名を受け取り、結果またはエラー辞書を返す関数
+
+    Returns:
+        data_version、count、error_count、results(エンドポイント名から結果への辞書)を含む辞書
+    """
+    try:
+        validated_input = EndpointNamesInput(endpoint_names=endpoint_names)
+    except PydanticValidationError as e:
+        error_details = e.errors()[0]
+        field = error_details.get("loc", ["unknown"])[0]
+        msg = error_details.get("msg", "バリデーションエラー")
+        return format_validation_error(str(field), msg)
+
+    with pin_snapshot() as snapshot:
+        results = {name: tool(name) for name in validated_input.endpoint_names}
+
+    return {
+        "data_version": snapshot.version,
+        "count": len(results),
+        "error_count": sum(
+            1 for r in results.values() if isinstance(r, dict) and r.get("error")
+        ),
+        "results": results,
+    }
+
+
+@_tool(QUERY_POOL)
+def describe_endpoints(endpoint_names: list[str]) -> dict[str, Any]:
+    """複数のエンドポイントの詳細情報をまとめて取得する(describe_endpoint のバッチ版)。
+
+    全てのエンドポイントを同じバージョンのデータから取得する。見つからない
+    エンドポイントなどのエラーは、そのエンドポイントの結果としてエラー辞書を返す。
+
+    Args:
+        endpoint_names: エンドポイント名のリスト(最大50件、例: ["eq-master", "eq-bars-daily"])
+
+    Returns:
+        data_version(データのバージョン)、count(件数)、error_count(エラー件数)、
+        results(エンドポイント名から詳細情報またはエラー辞書への辞書)を含む辞書
+    """
+    logger.info(f"describe_endpoints called with endpoint_names={endpoint_names}")
+    return _run_batch(endpoint_names, describe_endpoint)
+
+
+@_tool(CODEGEN_POOL)
 def generate_sample_code(
-    endpoint_name: str, language: str = "python", params: dict[str, Any] | None = None
+    endpoint_name: str,
+    language: str = "python",
+    params: dict[str, Any] | None = None,
+    auto_resolve: bool = False,
 ) -> dict[str, Any] | str:
     """指定されたエンドポイントの実行可能なサンプルコードを生成する。
 
+    ページネーション対応のエンドポイントでは、レコードをページ単位で順次返す
+    <関数名>_iter と、全件をリストで返す <関数名>_all も生成する。
+
     Args:
         endpoint_name: エンドポイント名(例: eq-master, eq-bars-daily)
-        language: 生成する言語(現在は"python"のみ対応、デフォルト: "python")
-        params: 追加パラメータ(将来の拡張用、現在は未使用)
+        language: 生成する言語("python" または "python-async"、デフォルト: "python")
+            "python-async" は共有の httpx.AsyncClient と同時実行数を制限した
+            並行取得ヘルパー(fetch_many)を含む非同期版を生成する。
+        params: 追加パラメータ
+            - async: Trueの場合、非同期版を生成(language="python-async" と同じ)
+            - plan: 生成コードのレート制限(トークンバケット)に使う契約プラン
+              (Free, Light, Standard, Premium)。省略時はエンドポイントを利用できる
+              最も下位のプラン
+            - bulk_download: Trueの場合(bulk-list / bulk-get のみ)、全バルク対応
+              エンドポイントのファイルを並列にストリーミング保存し、中断後は
+              続きから再開できるダウンローダーを生成
+            - columnar: "numpy" または "pyarrow"(バルク対応のエンドポイントのみ)。
+              バルクファイル(.csv.gz)を少しずつ展開し、レスポンス項目の型
+              (Number, String, Boolean, Map)に従った列の配列に変換する
+              iter_bulk_csv_* / read_bulk_csv を生成
+        auto_resolve: Trueの場合、見つからない名前に類似する候補が1つに絞れるときは
+            その候補のコードを生成する(補正内容はコードの先頭にコメントで記載)
 
     Returns:
         生成されたサンプルコード(実行可能なPythonコード)、またはエラー辞書
+        (見つからない場合は類似するエンドポイントの候補を details.candidates に含む)
     """
     logger.info(
         f"generate_sample_code called with endpoint_name='{endpoint_name}', language='{language}'"
@@ -135,7 +422,10 @@ def generate_sample_code(
     try:
         # 入力バリデーション
         validated_input = GenerateSampleCodeInput(
-            endpoint_name=endpoint_name, language=language, params=params
+            endpoint_name=endpoint_name,
+            language=language,
+            params=params,
+            auto_resolve=auto_resolve,
         )
     except PydanticValidationError as e:
         error_details = e.errors()[0]
@@ -149,13 +439,25 @@ def generate_sample_code(
             validated_input.language,
             validated_input.params,
         )
+        if result is None and validated_input.auto_resolve:
+            resolved = _resolve_endpoint(validated_input.endpoint_name)
+            if resolved is not None:
+                result = generate_sample_code_impl(
+                    resolved["endpoint_name"],
+                    validated_input.language,
+                    validated_input.params,
+                )
+                result = (
+                    f"# auto_resolve: '{resolved['requested']}' が見つからないため "
+                    f"'{resolved['endpoint_name']}' のコードを生成しました"
+                    f"(類似度 {resolved['similarity']})\n{result}"
+                )
         if result is None:
-            return format_not_found_error(
-                resource_type="エンドポイント",
-                identifier=validated_input.endpoint_name,
-                suggestion="正しいエンドポイント名を指定してください。search_endpoints ツールで検索できます。",
-            )
+            return _endpoint_not_found(validated_input.endpoint_name)
         return result
+    except CodegenOptionError as e:
+        # 追加パラメータがエンドポイントに適用できないエラー
+        return format_validation_error("params", str(e))
     except ValueError as e:
         # 言語未サポートエラー
         return format_validation_error("language", str(e))
@@ -164,9 +466,81 @@ def generate_sample_code(
         return format_internal_error("サンプルコード生成", e)
 
 
+@_tool(CODEGEN_POOL)
+def generate_sample_codes(
+    endpoint_names: list[str],
+    language: str = "python",
+    params: dict[str, Any] | None = None,
+) -> dict[str, Any]:
+    """複数のエンドポイントのサンプルコードをまとめて生成する(generate_sample_code のバッチ版)。
+
+    全てのエンドポイントを同じバージョンのデータから生成する。エラーは
+    そのエンドポイントの結果としてエラー辞書を返す。
+
+    Args:
+        endpoint_names: エンドポイント名のリスト(最大50件)
+        language: 生成する言語("python" または "python-async"、デフォルト: "python")
+        params: 全てのエンドポイントに適用する追加パラメータ(generate_sample_code と同じ)
+
+    Returns:
+        data_version(データのバージョン)、count(件数)、error_count(エラー件数)、
+        results(エンドポイント名からサンプルコードまたはエラー辞書への辞書)を含む辞書
+    """
+    logger.info(
+        f"generate_sample_codes called with endpoint_names={endpoint_names}, language='{language}'"
+    )
+    return _run_batch(
+        endpoint_names,
+        lambda name: generate_sample_code(name, language=language, params=params),
+    )
+
+
+@_tool(CODEGEN_POOL)
+def generate_client_code(
+    language: str = "python", params: dict[str, Any] | None = None
+) -> dict[str, Any] | str:
+    """全エンドポイントをまとめたクライアントモジュールのコードを生成する。
+
+    全エンドポイントを1つのクライアントクラス(非同期版は AsyncJQuantsClient)の
+    メソッドとして1回で生成する。接続プール、レートリミッター、認証(x-api-key)、
+    ページネーション処理(<メソッド名>_iter / <メソッド名>_all)を全メソッドで共有する。
+
+    Args:
+        language: 生成する言語("python" または "python-async"、デフォルト: "python")
+        params: 追加パラメータ
+            - async: Trueの場合、非同期版を生成(language="python-async" と同じ)
+            - plan: 生成コードのレート制限に使う契約プラン
+              (Free, Light, Standard, Premium)。省略時は Free
+
+    Returns:
+        生成されたクライアントモジュールのコード、またはエラー辞書
+    """
+    logger.info(f"generate_client_code called with language='{language}'")
 
+    # jinja2 はサーバ起動時には読み込まない(テンプレートを初めて使う時に読み込む)
+    from jinja2 import TemplateError
 
-@mcp.tool()
+    try:
+        validated_input = GenerateClientCodeInput(language=language, params=params)
+    except PydanticValidationError as e:
+        error_details = e.errors()[0]
+        field = error_details.get("loc", ["unknown"])[0]
+        msg = error_details.get("msg", "バリデーションエラー")
+        return format_validation_error(str(field), msg)
+
+    try:
+        return generate_client_code_impl(
+            validated_input.language, validated_input.params
+        )
+    except ValueError as e:
+        return format_validation_error("language", str(e))
+    except (OSError, TemplateError) as e:
+        # テンプレートの読み込み・レンダリングの失敗
+        logger.error(f"Error in generate_client_code: {e}")
+        return format_internal_error("クライアントコード生成", e)
+
+
+@_tool()
 def get_pattern(pattern_name: str | None = None) -> dict[str, Any]:
     """実装パターン情報を取得する。
 
@@ -179,17 +553,17 @@ def get_pattern(pattern_name: str | None = None) -> dict[str, Any]:
     logger.info(f"get_pattern called with pattern_name='{pattern_name}'")
 
     try:
-        pattern_collection = load_patterns()
+        patterns = get_snapshot().patterns
 
         # パターン名が指定されていない場合は一覧のみ返す
         if pattern_name is None:
             pattern_list = [
                 {
-                    "pattern_name": p.pattern_name,
-                    "description": p.description,
-                    "related_endpoints": p.related_endpoints,
+                    "pattern_name": p["pattern_name"],
+                    "description": p["description"],
+                    "related_endpoints": p["related_endpoints"],
                 }
-                for p in pattern_collection.patterns
+                for p in patterns
             ]
             return {
                 "count": len(pattern_list),
@@ -198,18 +572,18 @@ def get_pattern(pattern_name: str | None = None) -> dict[str, Any]:
             }
 
         # 指定されたパターンを検索
-        for pattern in pattern_collection.patterns:
-            if pattern.pattern_name == pattern_name:
-                pattern_dict = pattern.model_dump(exclude_none=True)
+        for pattern in patterns:
+            if pattern["pattern_name"] == pattern_name:
+                pattern_dict = dict(pattern)
 
                 # サンプルコードを読み込む
-                if pattern.sample_code_path:
+                if pattern.get("sample_code_path"):
                     try:
-                        sample_code = load_sample_code(pattern.sample_code_path)
+                        sample_code = load_sample_code(pattern["sample_code_path"])
                         pattern_dict["sample_code"] = sample_code
                     except Exception as e:
                         logger.warning(
-                            f"Failed to load sample code for {pattern.pattern_name}: {e}"
+                            f"Failed to load sample code for {pattern['pattern_name']}: {e}"
                         )
 
                 return pattern_dict
@@ -226,21 +600,24 @@ def get_pattern(pattern_name: str | None = None) -> dict[str, Any]:
         return format_internal_error("パターン取得", e)
 
 
-@mcp.tool()
-def answer_question(question: str) -> dict[str, Any]:
+@_tool(QUERY_POOL)
+def answer_question(question: str, limit: int = 3) -> dict[str, Any]:
     """自然言語の質問に対してベストプラクティスや注意事項を回答する。
 
     J-Quants API の使用方法、認証、レート制限、ページネーション、圧縮、
     エラーハンドリングなどに関する質問に回答します。
+    FAQのキーワードに加え、質問文・回答の全文との関連度(BM25)で順位付けします。
 
     Args:
         question: ユーザーからの質問(例: '認証方法は?', 'レート制限について教えて')
+        limit: 返す回答の最大件数(デフォルト: 3)
 
     Returns:
         回答情報を含む辞書:
         - matched: マッチしたFAQがあるかどうか
         - count: マッチした回答数
-        - answers: マッチした回答のリスト(最大3件)
+        - answers: マッチした回答のリスト(スコアの高い順に最大limit件)
+            - score: 関連度スコア
             - category: カテゴリ(認証、レート制限、ページネーション等)
             - question: FAQ質問文
             - answer: 回答テキスト
@@ -253,7 +630,7 @@ def answer_question(question: str) -> dict[str, Any]:
 
     try:
         # 入力バリデーション
-        validated_input = AnswerQuestionInput(question=question)
+        validated_input = AnswerQuestionInput(question=question, limit=limit)
     except PydanticValidationError as e:
         error_details = e.errors()[0]
         field = error_details.get("loc", ["unknown"])[0]
@@ -261,13 +638,13 @@ def answer_question(question: str) -> dict[str, Any]:
         return format_validation_error(str(field), msg)
 
     try:
-        return answer_question_impl(validated_input.question)
+        return answer_question_impl(validated_input.question, validated_input.limit)
     except Exception as e:
         logger.error(f"Error in answer_question: {e}")
         return format_internal_error("質問への回答", e)
 
 
-@mcp.tool()
+@_tool()
 def lookup_property(
     property_name: str, endpoint_name: str | None = None
 ) -> dict[str, Any]:
@@ -294,6 +671,7 @@ def lookup_property(
             - direction: request または response
             - fields: フィールド定義
             - values: 有効な値の一覧
+        - endpoints: プロパティを含む全エンドポイントと方向(request/response)の一覧
         - message: 説明メッセージ
             - 参照データが見つかった場合: 参照データ情報
             - 参照データが見つからないがプロパティは存在: 自由に値を設定できる旨
@@ -324,10 +702,110 @@ def lookup_property(
         return format_internal_error("プロパティ参照データ検索", e)
 
 
-def run_server() -> None:
-    """MCPサーバを起動する。"""
+# stdio 以外で利用できるトランスポート
+HTTP_TRANSPORTS = ("streamable-http", "sse")
+
+
+def _warm_up(templates: bool) -> None:
+    """リクエスト処理前にデータ(と、指定した場合はコード生成テンプレート)を読み込んでおく。
+
+    Args:
+        templates: コード生成テンプレートも読み込む場合はTrue。stdio では起動を
+                   速くするため、Jinja2 の読み込みを最初のコード生成まで遅らせる。
+    """
+    get_snapshot()
+    if not templates:
+        return
+
+    from .resources.templates import get_template
+
+    names = [*LANGUAGE_TEMPLATES.values(), *CLIENT_LANGUAGE_TEMPLATES.values()]
+    for template_name in names:
+        get_template(template_name)
+
+
+def _start_watcher(reload_interval: float | None) -> SnapshotWatcher | None:
+    """reload_interval が指定されている場合、データファイルの監視を開始する。"""
+    if not reload_interval:
+        return None
+    watcher = SnapshotWatcher(interval=reload_interval)
+    watcher.start()
+    return watcher
+
+
+def run_server(
+    reload_interval: float | None = None,
+    transport: str = "stdio",
+    host: str = "127.0.0.1",
+    port: int = 8000,
+    workers: int = 1,
+    query_threads: int | None = None,
+    codegen_threads: int | None = None,
+) -> None:
+    """MCPサーバを起動する。
+
+    Args:
+        reload_interval: データファイルの変更を確認する間隔(秒)。
+                         指定した場合、変更を検知するとサーバを再起動せずにデータを再読み込みする。
+        transport: "stdio"、"streamable-http" または "sse"
+        host: HTTPで待ち受けるホスト(stdio 以外の場合)
+        port: HTTPで待ち受けるポート(stdio 以外の場合)
+        workers: ワーカープロセス数("streamable-http" の場合のみ2以上を指定可能)。
+                 データを読み込んでから fork するため、全ワーカーが読み込み済みの
+                 スナップショットをコピーオンライトで共有する。
+        query_threads: 検索・詳細取得・FAQ回答を同時に実行するスレッド数
+                       (省略時は既定値。ワーカーごとの値)
+        codegen_threads: コード生成を同時に実行するスレッド数
+                         (省略時は既定値。ワーカーごとの値)。コード生成が
+                         混み合っても、検索などは別のスレッドで処理を続ける。
+
+    Raises:
+        ValueError: トランスポートとワーカー数の組み合わせ、またはスレッド数が不正な場合
+    """
+    if transport != "stdio" and transport not in HTTP_TRANSPORTS:
+        raise ValueError(f"Unsupported transport: {transport}")
+    if workers > 1 and transport != "streamable-http":
+        # SSE はセッションをプロセス内に保持するため、複数ワーカーでは扱えない
+        raise ValueError("--workers requires --transport streamable-http")
+
+    pool_sizes = {QUERY_POOL: query_threads, CODEGEN_POOL: codegen_threads}
+    configure_pools(
+        **{name: size for name, size in pool_sizes.items() if size is not None}
+    )
+
+    # ルートロガーが未設定の場合のみ設定する(組み込み先の設定は上書きしない)
+    logging.basicConfig(level=logging.INFO, format=LOG_FORMAT)
     logger.info("Starting J-Quants Documentation MCP Server...")
-    mcp.run()
+
+    # リクエスト処理前にデータを読み込んでおく(HTTPでは fork 前にテンプレートも)
+    _warm_up(templates=transport in HTTP_TRANSPORTS)
+
+    mcp.settings.host = host
+    mcp.settings.port = port
+
+    if workers > 1:
+        from .workers import bind_socket, serve_workers
+
+        # リクエストごとに異なるワーカーが処理するため、セッションを持たない形で提供する
+        mcp.settings.stateless_http = True
+        sock = bind_socket(host, port)
+        logger.info(f"Serving on http://{host}:{port} with {workers} workers")
+        serve_workers(
+            mcp.streamable_http_app,
+            sock,
+            workers,
+            # 監視スレッドは fork で引き継がれないため、ワーカーごとに開始する
+            on_start=lambda: _start_watcher(reload_interval),
+            log_level=mcp.settings.log_level.lower(),
+        )
+        return
+
+    watcher = _start_watcher(reload_interval)
+    try:
+        mcp.run(transport=transport)
+    finally:
+        if watcher is not None:
+            watcher.stop()
 
 
 if __name__ == "__main__":
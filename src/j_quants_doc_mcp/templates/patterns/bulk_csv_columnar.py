@@ -0,0 +1,21 @@
+#!/usr/bin/env python
+
+# バルクファイル（.csv.gz）を列形式の配列として読み込む
+# 用途: 1か月分の株価四本値など、大きなバルクファイルを分析に使いたい場合
+# 特徴: 行ごとに dict を作らず、少しずつ展開しながら型付きの列に変換する
+
+# 例: bulk_download_historical.py で保存したファイル
+path = "./equities_bars_daily_202401.csv.gz"
+
+# 列の型は endpoints.json の response.fields から決める
+# （Number → float64、String → 文字列、Boolean → bool、Map → JSON文字列）
+column_types = {field["name"]: field["type"] for field in RESPONSE_FIELDS("eq-bars-daily")}
+
+# gzipを展開しながら、一定行数（またはバイト数）ごとに列の配列へ変換する
+for chunk in READ_CSV_GZ_IN_CHUNKS(path, column_types, chunk_rows=100_000):
+    # chunk は列名から配列への辞書（NumPy配列、または pyarrow の RecordBatch）
+    process(chunk["Code"], chunk["AdjC"])
+
+# 実行可能なコードは generate_sample_code で生成できる
+#   generate_sample_code("eq-bars-daily", params={"columnar": "numpy"})
+#   generate_sample_code("eq-bars-daily", params={"columnar": "pyarrow"})
@@ -34,6 +34,9 @@ for file_info in live_files:
     )
     
     download_url = url_response["url"]
+    # ファイル全体をメモリに載せるため、大容量・多数のファイルを取得する場合は
+    # generate_sample_code("bulk-list", params={"bulk_download": True}) で生成する
+    # 並列・再開可能なストリーミングダウンローダーを使用する
     csv_bytes = HTTP_GET_BINARY(download_url)
     
     output_path = f"./{key.split('/')[-1]}"
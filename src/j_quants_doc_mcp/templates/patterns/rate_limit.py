@@ -1,32 +1,38 @@
-# リトライ処理付きのリクエスト関数
-MAX_RETRIES = 3
+# プランごとのレート制限(1分あたりのリクエスト数)
+PLAN_RATE_LIMITS = {"Free": 5, "Light": 60, "Standard": 120, "Premium": 500}
+MIN_INTERVAL = 60 / PLAN_RATE_LIMITS["Light"]  # 契約中のプランに合わせる
+MAX_RETRIES = 5
 BASE_WAIT_TIME = 1  # 秒
 
-for attempt in range(MAX_RETRIES):
-    try:
-        response = GET(
-            "/equities/bars/daily", {"code": "7203"}, headers={"x-api-key": api_key}
-        )
+next_request_at = now()
+
+
+def request_with_retry(path, params):
+    """レート制限を守ってリクエストを送信し、429の場合は待機して再試行する"""
+    global next_request_at
+    for attempt in range(MAX_RETRIES + 1):
+        # 固定の待機ではなく、前回の送信からの経過時間に応じて必要な分だけ待つ
+        # (複数スレッド・タスクで共有する場合はロックで保護する)
+        sleep(max(0, next_request_at - now()))
+        next_request_at = max(now(), next_request_at) + MIN_INTERVAL
 
-        if response.status_code == 200:
+        response = GET(path, params, headers={"x-api-key": api_key})
+        if response.status_code != 429:
+            response.raise_for_status()
             return response.json()
-        elif response.status_code == 429:
-            # レート制限エラー
-            wait_time = response.headers.get(
-                "Retry-After", BASE_WAIT_TIME * (2**attempt)
-            )
-            print(f"レート制限。{wait_time}秒待機します")
-            sleep(float(wait_time))
-        else:
-            raise Exception(f"エラー: {response.status_code}")
-    except Exception as e:
-        if attempt == MAX_RETRIES - 1:
-            raise  # 最終試行で失敗した場合は例外を投げる
-        sleep(BASE_WAIT_TIME * (2**attempt))
+        if attempt == MAX_RETRIES:
+            raise Exception("レート制限により再試行回数の上限に達しました")
+
+        # Retry-Afterヘッダーがあればその秒数、なければ指数バックオフ(1秒、2秒、4秒...)
+        wait_time = float(
+            response.headers.get("Retry-After", BASE_WAIT_TIME * (2**attempt))
+        )
+        print(f"レート制限。{wait_time}秒待機します")
+        # 待機が終わるまで後続のリクエストも送信しない
+        next_request_at = now() + wait_time
+
 
-# 複数リクエストの場合は間隔を空ける
 codes = ["7203", "6758", "9984"]
 for code in codes:
     data = request_with_retry("/equities/bars/daily", {"code": code})
     process_data(data)
-    sleep(0.5)  # 次のリクエストまで待機
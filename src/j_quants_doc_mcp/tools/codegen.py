@@ -3,31 +3,59 @@
 import json
 import logging
 import re
-from pathlib import Path
 from typing import Any
 
-from jinja2 import Environment, FileSystemLoader
+from ..cache import LRUCache
+from ..resources.snapshot import DataSnapshot
+from ..resources.store import get_snapshot
+from ..resources.templates import get_template, get_templates_version
 
 logger = logging.getLogger(__name__)
 
-# テンプレートディレクトリのパス
-TEMPLATES_DIR = Path(__file__).parent.parent / "templates"
-ENDPOINTS_DATA_PATH = Path(__file__).parent.parent / "data" / "endpoints.json"
+# Python用のテンプレート名
+PYTHON_TEMPLATE = "python_httpx.jinja2"
+PYTHON_ASYNC_TEMPLATE = "python_httpx_async.jinja2"
 
+# 言語ごとのテンプレート名
+LANGUAGE_TEMPLATES = {
+    "python": PYTHON_TEMPLATE,
+    "python-async": PYTHON_ASYNC_TEMPLATE,
+}
 
-def _load_endpoints() -> dict[str, Any]:
-    """エンドポイントデータをロード"""
-    with open(ENDPOINTS_DATA_PATH, encoding="utf-8") as f:
-        return json.load(f)
+# 全エンドポイントをまとめたクライアントモジュールの言語ごとのテンプレート名
+CLIENT_LANGUAGE_TEMPLATES = {
+    "python": "python_client.jinja2",
+    "python-async": "python_client_async.jinja2",
+}
 
+# プランごとのレート制限(1分あたりのリクエスト数)
+PLAN_RATE_LIMITS = {"Free": 5, "Light": 60, "Standard": 120, "Premium": 500}
 
-def _find_endpoint(endpoint_name: str) -> dict[str, Any] | None:
-    """エンドポイント名から詳細情報を取得"""
-    data = _load_endpoints()
-    for endpoint in data.get("endpoints", []):
-        if endpoint.get("name") == endpoint_name:
-            return endpoint
-    return None
+# 株価 分足・ティック アドオンのエンドポイントと、アドオンのレート制限
+# (1分あたりのリクエスト数。プランの上限とは別枠で適用される)
+ADDON_ENDPOINTS = ("eq-bars-minute", "eq-trades")
+ADDON_RATE_LIMIT = 60
+
+# バルクダウンローダーを生成できるエンドポイント
+BULK_DOWNLOAD_ENDPOINTS = ("bulk-list", "bulk-get")
+
+# バルクCSVを列形式で読み込むコードで使えるライブラリ
+COLUMNAR_LIBRARIES = ("numpy", "pyarrow")
+
+# 非同期版で並行取得の例に使うパラメータと例示値(先に見つかったものを使用)
+FANOUT_EXAMPLES = {
+    "code": ['"72030"', '"67580"', '"99840"'],
+    "date": ['"20240104"', '"20240105"', '"20240108"'],
+}
+
+# 生成済みサンプルコードのキャッシュ(データとテンプレートの世代ごと)
+SAMPLE_CODE_CACHE_SIZE = 256
+_sample_code_cache = LRUCache(SAMPLE_CODE_CACHE_SIZE)
+
+
+def _find_endpoint(snapshot: DataSnapshot, endpoint_name: str) -> dict[str, Any] | None:
+    """エンドポイント名(またはパス・旧パス)から詳細情報を取得"""
+    return snapshot.find_endpoint(endpoint_name)
 
 
 def _convert_type_to_python(param_type: str) -> str:
@@ -131,37 +159,132 @@ def _escape_reserved_keyword(param_name: str) -> str:
     return param_name
 
 
-def generate_sample_code(
-    endpoint_name: str, language: str = "python", params: dict[str, Any] | None = None
-) -> str | None:
-    """指定されたエンドポイントのサンプルコードを生成する。
+class CodegenOptionError(ValueError):
+    """追加パラメータ(params)がエンドポイントに適用できない場合の例外"""
 
-    Args:
-        endpoint_name: エンドポイント名(例: eq-master, eq-bars-daily)
-        language: 生成する言語(現在は"python"のみ対応)
-        params: 追加パラメータ(将来の拡張用、現在は未使用)
 
-    Returns:
-        生成されたサンプルコード、またはNone(エンドポイントが見つからない場合)
+def get_sample_code_cache_info() -> dict[str, int]:
+    """サンプルコードのキャッシュの統計情報(ヒット数・ミス数など)を返す。"""
+    return _sample_code_cache.info()
+
+
+def clear_sample_code_cache() -> None:
+    """サンプルコードのキャッシュと統計情報を破棄する。"""
+    _sample_code_cache.clear()
+
+
+def _params_cache_key(params: dict[str, Any] | None) -> str | None:
+    """追加パラメータをキャッシュキー用の文字列に変換する(変換できない場合はNone)。"""
+    try:
+        return json.dumps(params, sort_keys=True, ensure_ascii=False)
+    except (TypeError, ValueError):
+        return None
+
+
+def _select_template(
+    language: str,
+    params: dict[str, Any] | None,
+    templates: dict[str, str] = LANGUAGE_TEMPLATES,
+) -> str:
+    """言語と追加パラメータから使用するテンプレート名を決定する。
+
+    Args:
+        language: 生成する言語
+        params: 追加パラメータ(async が True の場合は非同期版)
+        templates: 言語からテンプレート名への辞書
 
     Raises:
         ValueError: サポートされていない言語の場合
     """
-    logger.info(
-        f"generate_sample_code called: endpoint_name={endpoint_name}, language={language}"
-    )
-
-    # 言語チェック
-    if language != "python":
+    if language not in templates:
         raise ValueError(
-            f"言語 '{language}' はサポートされていません。現在は 'python' のみ対応しています。"
+            f"言語 '{language}' はサポートされていません。"
+            f"現在は {', '.join(templates)} のみ対応しています。"
         )
+    if params and params.get("async"):
+        return templates["python-async"]
+    return templates[language]
 
-    # エンドポイント情報を取得
-    endpoint = _find_endpoint(endpoint_name)
-    if not endpoint:
+
+def _select_plan(endpoint: dict[str, Any], params: dict[str, Any] | None) -> str:
+    """生成コードのレート制限に使うプランを決定する。
+
+    指定がない場合は、エンドポイントを利用できる最も下位のプランを使う。
+
+    Raises:
+        CodegenOptionError: 指定したプランでエンドポイントを利用できない場合
+    """
+    available = [plan for plan in endpoint.get("plan", []) if plan in PLAN_RATE_LIMITS]
+    plan = params.get("plan") if params else None
+    if plan is None:
+        return min(available, key=PLAN_RATE_LIMITS.get, default="Free")
+    if available and plan not in available:
+        raise CodegenOptionError(
+            f"プラン '{plan}' ではエンドポイント '{endpoint.get('name')}' を利用できません。"
+            f"利用可能なプラン: {', '.join(available)}"
+        )
+    return plan
+
+
+def _use_bulk_downloader(
+    endpoint: dict[str, Any], template_name: str, params: dict[str, Any] | None
+) -> bool:
+    """バルクダウンローダーを生成するかどうかを決定する。
+
+    Raises:
+        CodegenOptionError: バルク以外のエンドポイントや非同期版で指定された場合
+    """
+    if not (params and params.get("bulk_download")):
+        return False
+    if endpoint.get("name") not in BULK_DOWNLOAD_ENDPOINTS:
+        raise CodegenOptionError(
+            "bulk_download は "
+            f"{', '.join(BULK_DOWNLOAD_ENDPOINTS)} のエンドポイントでのみ指定できます。"
+        )
+    if template_name != PYTHON_TEMPLATE:
+        raise CodegenOptionError(
+            "bulk_download は同期版(language='python')でのみ指定できます。"
+        )
+    return True
+
+
+def _select_columnar(
+    endpoint: dict[str, Any], params: dict[str, Any] | None
+) -> str | None:
+    """バルクCSVを列形式で読み込むコードに使うライブラリを決定する。
+
+    Raises:
+        CodegenOptionError: バルクダウンロードに対応していないエンドポイントの場合
+    """
+    columnar = params.get("columnar") if params else None
+    if columnar is None:
         return None
+    if not endpoint.get("bulk_available"):
+        raise CodegenOptionError(
+            f"エンドポイント '{endpoint.get('name')}' はバルクダウンロードに"
+            "対応していないため、columnar は指定できません。"
+        )
+    return columnar
+
+
+def _find_fanout_param(params: list[dict[str, Any]]) -> dict[str, Any] | None:
+    """非同期版で並行取得の例に使うパラメータを選ぶ(該当なしの場合はNone)。"""
+    for name in FANOUT_EXAMPLES:
+        for param in params:
+            if param["original_name"] == name and not param["is_sensitive"]:
+                return param
+    return None
+
+
+def _build_endpoint_context(endpoint: dict[str, Any]) -> dict[str, Any]:
+    """エンドポイント定義からテンプレートに渡す値(パラメータの分類など)を組み立てる。
 
+    Args:
+        endpoint: エンドポイント定義
+
+    Returns:
+        テンプレート変数名から値への辞書
+    """
     # パラメータを整理
     required_params = []
     optional_params = []
@@ -211,8 +334,8 @@ def generate_sample_code(
         else:
             optional_params.append(param_info)
 
-    # 関数名を生成(エンドポイント名をスネークケースとして使用)
-    function_name = endpoint_name
+    # 関数名を生成(エンドポイント名をスネークケースに変換)
+    function_name = endpoint.get("name").replace("-", "_")
 
     # 機密情報パラメータと非機密情報パラメータを分離
     has_sensitive_params = any(p.get("is_sensitive") for p in required_params)
@@ -228,29 +351,183 @@ def generate_sample_code(
     # レスポンスデータキーの取得
     response_data_key = endpoint.get("response_data_key", "")
 
-    # Jinja2環境の設定
-    env = Environment(loader=FileSystemLoader(TEMPLATES_DIR))
-    template = env.get_template("python_httpx.jinja2")
+    return {
+        "endpoint_name": endpoint.get("name"),
+        "name_ja": endpoint.get("name_ja"),
+        "name_en": endpoint.get("name_en"),
+        "description": endpoint.get("description"),
+        "method": endpoint.get("method"),
+        "path": endpoint.get("path"),
+        "auth_required": endpoint.get("auth_required", False),
+        "function_name": function_name,
+        "required_params": required_params,
+        "optional_params": optional_params,
+        "query_params": query_params,
+        "header_params": header_params,
+        "body_params": body_params,
+        "has_sensitive_params": has_sensitive_params,
+        "non_sensitive_required_params": non_sensitive_required_params,
+        "has_pagination": has_pagination,
+        "response_data_key": response_data_key,
+        "available_plans": endpoint.get("plan", []),
+        "addon_rate_limit": (
+            ADDON_RATE_LIMIT if endpoint.get("name") in ADDON_ENDPOINTS else None
+        ),
+    }
+
+
+def generate_sample_code(
+    endpoint_name: str, language: str = "python", params: dict[str, Any] | None = None
+) -> str | None:
+    """指定されたエンドポイントのサンプルコードを生成する。
+
+    生成結果はデータとテンプレートのバージョンが同じ間キャッシュされ、
+    データの再読み込みやテンプレートの変更で自動的に破棄される。
+
+    Args:
+        endpoint_name: エンドポイント名(例: eq-master, eq-bars-daily)
+        language: 生成する言語("python" または "python-async")
+        params: 追加パラメータ
+            - async: Trueの場合、httpx.AsyncClient を使う非同期版を生成
+              (language="python-async" と同じ)
+            - plan: レート制限に使う契約プラン(Free, Light, Standard, Premium)。
+              省略時はエンドポイントを利用できる最も下位のプラン
+            - bulk_download: Trueの場合、bulk-list / bulk-get で、全バルク対応
+              エンドポイントのファイルを並列・再開可能にダウンロードするコードを生成
+            - columnar: "numpy" または "pyarrow"。バルク対応のエンドポイントで、
+              バルクファイル(.csv.gz)を少しずつ展開し、レスポンス項目の型に
+              従った列の配列に変換するコードを生成
+
+    Returns:
+        生成されたサンプルコード、またはNone(エンドポイントが見つからない場合)
+
+    Raises:
+        ValueError: サポートされていない言語の場合
+        CodegenOptionError: 指定したプランでエンドポイントを利用できない場合や、
+            bulk_download・columnar を対応していないエンドポイントで指定した場合
+    """
+    logger.info(
+        f"generate_sample_code called: endpoint_name={endpoint_name}, language={language}"
+    )
+
+    # 言語チェックとテンプレートの決定
+    template_name = _select_template(language, params)
+
+    # キャッシュの確認とレンダリングに同じスナップショットを使う
+    snapshot = get_snapshot()
+    generation = (snapshot.version, get_templates_version())
+    _sample_code_cache.validate(generation)
+    params_key = _params_cache_key(params)
+    cache_key = (endpoint_name, language, params_key)
+    if params_key is not None:
+        code = _sample_code_cache.get(cache_key)
+        if code is not None:
+            return code
+
+    # エンドポイント情報を取得
+    endpoint = _find_endpoint(snapshot, endpoint_name)
+    if not endpoint:
+        return None
+
+    # パラメータを整理
+    context = _build_endpoint_context(endpoint)
+
+    # レート制限に使うプラン
+    plan = _select_plan(endpoint, params)
+
+    # 非同期版で並行取得の例に使うパラメータ
+    fanout_param = _find_fanout_param(
+        context["required_params"] + context["optional_params"]
+    )
+
+    # バルクダウンローダーの対象(/bulk/list に指定できるエンドポイント)
+    bulk_download = _use_bulk_downloader(endpoint, template_name, params)
+    bulk_endpoints = (
+        [e["path"] for e in snapshot.endpoints if e.get("bulk_available")]
+        if bulk_download
+        else []
+    )
+
+    # バルクCSVを列形式で読み込むコードに使うライブラリ
+    columnar = _select_columnar(endpoint, params)
+
+    # コンパイル済みテンプレートの取得(初回のみコンパイル)
+    template = get_template(template_name)
 
     # テンプレートをレンダリング
     code = template.render(
-        endpoint_name=endpoint.get("name"),
-        name_ja=endpoint.get("name_ja"),
-        name_en=endpoint.get("name_en"),
-        description=endpoint.get("description"),
-        method=endpoint.get("method"),
-        path=endpoint.get("path"),
-        auth_required=endpoint.get("auth_required", False),
-        function_name=function_name,
-        required_params=required_params,
-        optional_params=optional_params,
-        query_params=query_params,
-        header_params=header_params,
-        body_params=body_params,
-        has_sensitive_params=has_sensitive_params,
-        non_sensitive_required_params=non_sensitive_required_params,
-        has_pagination=has_pagination,
-        response_data_key=response_data_key,
+        **context,
+        plan=plan,
+        plan_rate_limits=PLAN_RATE_LIMITS,
+        fanout_param=fanout_param,
+        fanout_values=FANOUT_EXAMPLES[fanout_param["original_name"]]
+        if fanout_param
+        else [],
+        bulk_download=bulk_download,
+        bulk_endpoints=bulk_endpoints,
+        columnar=columnar,
+        response_fields=endpoint.get("response", {}).get("fields", []),
+    )
+
+    if params_key is not None:
+        _sample_code_cache.put(cache_key, code, generation)
+    return code
+
+
+def generate_client_code(
+    language: str = "python", params: dict[str, Any] | None = None
+) -> str:
+    """全エンドポイントをまとめたクライアントモジュールのコードを生成する。
+
+    1つのスナップショットの全エンドポイントを1回のレンダリングで1つのクラスの
+    メソッドとして出力する。生成したクライアントは接続プール、レートリミッター、
+    認証、ページネーション処理を全メソッドで共有する。
+    生成結果は generate_sample_code と同じキャッシュに保存される。
+
+    Args:
+        language: 生成する言語("python" または "python-async")
+        params: 追加パラメータ
+            - async: Trueの場合、httpx.AsyncClient を使う非同期版を生成
+              (language="python-async" と同じ)
+            - plan: レート制限に使う契約プラン(Free, Light, Standard, Premium)。
+              省略時は最も下位のプラン
+
+    Returns:
+        生成されたクライアントモジュールのコード
+
+    Raises:
+        ValueError: サポートされていない言語の場合
+    """
+    logger.info(f"generate_client_code called: language={language}")
+
+    template_name = _select_template(language, params, CLIENT_LANGUAGE_TEMPLATES)
+
+    # 全エンドポイントを同じスナップショットから取得する
+    snapshot = get_snapshot()
+    generation = (snapshot.version, get_templates_version())
+    _sample_code_cache.validate(generation)
+    params_key = _params_cache_key(params)
+    # エンドポイント名の代わりに None をキーに使い、個別のサンプルコードと区別する
+    cache_key = (None, language, params_key)
+    if params_key is not None:
+        code = _sample_code_cache.get(cache_key)
+        if code is not None:
+            return code
+
+    plan = params.get("plan") if params else None
+    if plan is None:
+        plan = min(PLAN_RATE_LIMITS, key=PLAN_RATE_LIMITS.get)
+
+    template = get_template(template_name)
+    endpoints = [_build_endpoint_context(e) for e in snapshot.endpoints]
+    code = template.render(
+        endpoints=endpoints,
+        plan=plan,
+        plan_rate_limits=PLAN_RATE_LIMITS,
+        addon_rate_limit=ADDON_RATE_LIMIT,
+        addon_paths=[e["path"] for e in endpoints if e["addon_rate_limit"]],
     )
 
+    if params_key is not None:
+        _sample_code_cache.put(cache_key, code, generation)
     return code
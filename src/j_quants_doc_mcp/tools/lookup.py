@@ -1,59 +1,11 @@
 """Lookup tool for J-Quants API reference data."""
 
-import json
 import logging
-from pathlib import Path
 from typing import Any
 
-logger = logging.getLogger(__name__)
-
-REFERENCE_DATA_PATH = Path(__file__).parent.parent / "data" / "reference_data.json"
-ENDPOINTS_DATA_PATH = Path(__file__).parent.parent / "data" / "endpoints.json"
-
-
-def _load_reference_data() -> dict[str, Any]:
-    """参照データをロード"""
-    with open(REFERENCE_DATA_PATH, encoding="utf-8") as f:
-        return json.load(f)
-
-
-def _load_endpoints() -> dict[str, Any]:
-    """エンドポイントデータをロード"""
-    with open(ENDPOINTS_DATA_PATH, encoding="utf-8") as f:
-        return json.load(f)
-
-
-def _check_property_exists_in_endpoint(
-    property_name: str, endpoint_name: str | None
-) -> tuple[bool, str | None]:
-    """エンドポイント内にプロパティが存在するか確認する。
-
-    Args:
-        property_name: プロパティ名
-        endpoint_name: エンドポイント名（Noneの場合は全エンドポイントを検索）
-
-    Returns:
-        (存在するかどうか, 見つかったエンドポイント名またはNone)
-    """
-    endpoints_data = _load_endpoints()
+from ..resources.store import get_snapshot
 
-    for endpoint in endpoints_data.get("endpoints", []):
-        # endpoint_nameが指定されている場合は、そのエンドポイントのみチェック
-        if endpoint_name and endpoint.get("name") != endpoint_name:
-            continue
-
-        # パラメータをチェック
-        for param in endpoint.get("parameters", []):
-            if param.get("name", "").lower() == property_name.lower():
-                return True, endpoint.get("name")
-
-        # レスポンスフィールドをチェック
-        response = endpoint.get("response", {})
-        for field in response.get("fields", []):
-            if field.get("name", "").lower() == property_name.lower():
-                return True, endpoint.get("name")
-
-    return False, None
+logger = logging.getLogger(__name__)
 
 
 def lookup_property(
@@ -73,6 +25,7 @@ def lookup_property(
         - endpoint_name: 指定されたエンドポイント名（指定された場合のみ）
         - property_exists: プロパティがエンドポイントに存在するかどうか
         - reference_data: 見つかった場合の参照データ情報
+        - endpoints: プロパティを含む全エンドポイントと方向(存在する場合のみ)
         - message: 説明メッセージ
     """
     logger.info(
@@ -80,10 +33,22 @@ def lookup_property(
         f"endpoint_name='{endpoint_name}'"
     )
 
+    snapshot = get_snapshot()
+    entry = snapshot.property_index.get(property_name)
+
     # エンドポイント内にプロパティが存在するか確認
-    property_exists, found_in_endpoint = _check_property_exists_in_endpoint(
-        property_name, endpoint_name
-    )
+    if endpoint_name:
+        # endpoint_nameが指定されている場合は、そのエンドポイントのみチェック
+        endpoint = snapshot.find_endpoint(endpoint_name)
+        found_in_endpoint = endpoint.get("name") if endpoint is not None else None
+        property_exists = (
+            entry is not None
+            and found_in_endpoint is not None
+            and found_in_endpoint in entry.endpoints
+        )
+    else:
+        found_in_endpoint = None
+        property_exists = entry is not None and bool(entry.endpoints)
 
     # プロパティがエンドポイントに存在しない場合
     if not property_exists:
@@ -103,36 +68,21 @@ def lookup_property(
         return result
 
     # 参照データを検索
-    data = _load_reference_data()
-    matched_entry = None
-
-    # 各参照データのrelated_propertiesを検索
-    for ref_entry in data.get("reference_data", []):
-        for related_prop in ref_entry.get("related_properties", []):
-            # プロパティ名が一致するか確認（大文字小文字を区別しない）
-            if related_prop.get("property", "").lower() == property_name.lower():
-                # endpoint_nameが指定されている場合は、エンドポイントも一致するかチェック
-                if endpoint_name and related_prop.get("endpoint") != endpoint_name:
-                    continue
-
-                matched_entry = {
-                    "name": ref_entry.get("name"),
-                    "description": ref_entry.get("description"),
-                    "endpoint": related_prop.get("endpoint"),
-                    "direction": related_prop.get("direction"),
-                    "fields": ref_entry.get("fields", []),
-                    "values": ref_entry.get("reference_data", []),
-                }
-                break
-        if matched_entry:
-            break
+    # endpoint_nameが指定されている場合は、エンドポイントも一致するものに限定
+    if endpoint_name:
+        matched_entry = entry.references_by_endpoint.get(found_in_endpoint)
+    else:
+        matched_entry = entry.references[0] if entry.references else None
 
     if matched_entry:
         result = {
             "found": True,
             "property_name": property_name,
             "property_exists": True,
-            "reference_data": matched_entry,
+            # インデックスの辞書は呼び出し間で共有されるため、複製して返す
+            # (fields・values はスナップショットの変更不可のリストのまま)
+            "reference_data": dict(matched_entry),
+            "endpoints": entry.occurrences(),
             "message": f"プロパティ '{property_name}' に関連する参照データが見つかりました。",
         }
         if endpoint_name:
@@ -144,6 +94,7 @@ def lookup_property(
             "property_name": property_name,
             "property_exists": True,
             "reference_data": None,
+            "endpoints": entry.occurrences(),
             "message": (
                 f"プロパティ '{property_name}' に関連する参照データは登録されていません。"
                 "このプロパティは特定の値セットに紐づかないため、自由に値を格納できます。"
@@ -1,23 +1,19 @@
 """Q&A tool for J-Quants API documentation."""
 
-import json
-from pathlib import Path
 from typing import Any
 
-FAQ_DATA_PATH = Path(__file__).parent.parent / "data" / "faq.json"
+from ..resources.store import get_snapshot
 
+# 返す回答数のデフォルト
+DEFAULT_ANSWER_LIMIT = 3
 
-def load_faqs() -> dict[str, Any]:
-    """FAQデータをロード"""
-    with open(FAQ_DATA_PATH, encoding="utf-8") as f:
-        return json.load(f)
 
-
-def answer_question(question: str) -> dict[str, Any]:
+def answer_question(question: str, limit: int = DEFAULT_ANSWER_LIMIT) -> dict[str, Any]:
     """自然言語の質問に対してベストプラクティスや注意事項を回答する。
 
     Args:
         question: ユーザーからの質問(自然言語)
+        limit: 返す回答の最大件数
 
     Returns:
         回答情報を含む辞書:
@@ -25,41 +21,18 @@ def answer_question(question: str) -> dict[str, Any]:
         - answers: マッチした回答のリスト(複数マッチする場合がある)
         - suggestion: マッチしない場合の提案メッセージ
     """
-    data = load_faqs()
-    question_lower = question.lower()
-
-    # キーワードベースのマッチング
-    matched_faqs = []
-
-    for faq in data.get("faqs", []):
-        # 質問文でのマッチング
-        if question_lower in faq.get("question", "").lower():
-            matched_faqs.append({"score": 100, "faq": faq})  # 完全一致
-            continue
+    snapshot = get_snapshot()
 
-        # キーワードでのマッチング
-        keywords = faq.get("keywords", [])
-        matched_keywords = [kw for kw in keywords if kw.lower() in question_lower]
-
-        if matched_keywords:
-            # マッチしたキーワード数に基づいてスコア計算
-            score = len(matched_keywords) * 10
-            matched_faqs.append(
-                {"score": score, "matched_keywords": matched_keywords, "faq": faq}
-            )
-
-    # スコアでソート(高い順)
-    matched_faqs.sort(key=lambda x: x["score"], reverse=True)
+    # 質問文・キーワード・BM25によるマッチング(スコアの高い順に上位limit件)
+    matched_faqs = snapshot.faq_index.match(question, limit=limit)
 
     # 結果の構築
     if matched_faqs:
-        # 上位3件を返す(スコアが高いもの)
-        top_matches = matched_faqs[:3]
-
         answers = []
-        for match in top_matches:
+        for match in matched_faqs:
             faq = match["faq"]
             answer_item = {
+                "score": match["score"],
                 "category": faq.get("category", ""),
                 "question": faq.get("question", ""),
                 "answer": faq.get("answer", ""),
@@ -76,7 +49,7 @@ def answer_question(question: str) -> dict[str, Any]:
     else:
         # マッチしなかった場合
         # すべてのカテゴリを提示
-        categories = list({faq.get("category", "") for faq in data.get("faqs", [])})
+        categories = list({faq.get("category", "") for faq in snapshot.faqs})
 
         return {
             "matched": False,
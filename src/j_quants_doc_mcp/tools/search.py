@@ -1,27 +1,26 @@
 """Search tool for J-Quants API documentation."""
 
-import json
 import logging
-from pathlib import Path
 from typing import Any
 
-logger = logging.getLogger(__name__)
-
-ENDPOINTS_DATA_PATH = Path(__file__).parent.parent / "data" / "endpoints.json"
+from ..resources.store import get_snapshot
 
-
-def _load_endpoints() -> dict[str, Any]:
-    """エンドポイントデータをロード"""
-    with open(ENDPOINTS_DATA_PATH, encoding="utf-8") as f:
-        return json.load(f)
+logger = logging.getLogger(__name__)
 
 
-def search_endpoints(keyword: str, category: str | None = None) -> dict[str, Any]:
+def search_endpoints(
+    keyword: str, category: str | None = None, limit: int | None = None
+) -> dict[str, Any]:
     """エンドポイントをキーワードとカテゴリで検索する。
 
+    空白区切りの全ての語を含むエンドポイントを優先し、該当がない場合は
+    いずれかの語に一致するエンドポイントを、一致した語の数が多い順に返す。
+    同じ数の中では関連度の高い順に並ぶ。
+
     Args:
         keyword: 検索キーワード(エンドポイント名、パス、説明から検索)
         category: オプションのカテゴリフィルタ(auth, listed, prices, fins等)
+        limit: 返す最大件数(Noneの場合は全件)
 
     Returns:
         検索結果を含む辞書(該当件数と結果配列)
@@ -30,40 +29,6 @@ def search_endpoints(keyword: str, category: str | None = None) -> dict[str, Any
         f"search_endpoints called with keyword='{keyword}', category='{category}'"
     )
 
-    data = _load_endpoints()
-    keyword_lower = keyword.lower()
-
-    # 検索処理
-    results = []
-    for endpoint in data.get("endpoints", []):
-        # キーワード検索(名前、日本語名、英語名、パス、旧パス、説明)
-        if not (
-            keyword_lower in endpoint.get("name", "").lower()
-            or keyword_lower in endpoint.get("name_ja", "").lower()
-            or keyword_lower in endpoint.get("name_en", "").lower()
-            or keyword_lower in endpoint.get("path", "").lower()
-            or keyword_lower in endpoint.get("path_old", "").lower()
-            or keyword_lower in endpoint.get("description", "").lower()
-        ):
-            continue
-
-        # カテゴリフィルタリング(パスベース)
-        if category:
-            # パスからカテゴリを抽出 (例: /listed/*, /prices/*, /fins/*)
-            path = endpoint.get("path", "")
-            path_category = path.split("/")[1] if "/" in path else ""
-            if category.lower() != path_category.lower():
-                continue
-
-        # 結果に追加
-        results.append(
-            {
-                "name": endpoint.get("name", ""),
-                "name_ja": endpoint.get("name_ja", ""),
-                "name_en": endpoint.get("name_en", ""),
-                "path": endpoint.get("path", ""),
-                "description": endpoint.get("description", ""),
-            }
-        )
+    results = get_snapshot().search_index.search(keyword, category, limit)
 
     return {"count": len(results), "results": results}
@@ -0,0 +1,149 @@
+"""Pre-fork process supervisor for serving the MCP HTTP app from several workers."""
+
+import gc
+import logging
+import os
+import signal
+import socket
+import time
+from collections.abc import Callable
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# これより短い時間で終了したワーカーは起動に失敗したとみなし、再起動しない(秒)
+MIN_WORKER_UPTIME = 1.0
+
+
+def bind_socket(host: str, port: int) -> socket.socket:
+    """全ワーカーで共有する待ち受けソケットを作成する。
+
+    Args:
+        host: 待ち受けるホスト
+        port: 待ち受けるポート(0の場合は空いているポートを割り当てる)
+
+    Returns:
+        listen 済みのソケット
+    """
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+def _run_worker(
+    app_factory: Callable[[], Any],
+    sock: socket.socket,
+    on_start: Callable[[], None] | None,
+    log_level: str,
+) -> None:
+    """子プロセスで共有ソケットを使ってASGIアプリを起動する。"""
+    import uvicorn
+
+    # 親プロセスのシグナルハンドラを引き継がない(uvicorn が改めて設定する)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+
+    if on_start is not None:
+        on_start()
+    config = uvicorn.Config(app_factory(), log_level=log_level)
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+def serve_workers(
+    app_factory: Callable[[], Any],
+    sock: socket.socket,
+    workers: int,
+    on_start: Callable[[], None] | None = None,
+    log_level: str = "info",
+) -> None:
+    """読み込み済みの状態を fork で共有する複数のワーカープロセスでアプリを提供する。
+
+    呼び出し前に読み込んだデータ(スナップショットやテンプレート)は、fork 後の
+    ワーカーからコピーオンライトで参照されるため、ワーカーごとに読み込み直さない。
+    全ワーカーが同じソケットで待ち受け、接続はOSによって振り分けられる。
+    ワーカーが異常終了した場合は再起動し、SIGINT/SIGTERM を受け取ると全ワーカーを停止する。
+
+    Args:
+        app_factory: ワーカー内でASGIアプリを作成する関数(fork 後に呼び出す)
+        sock: 待ち受けソケット(bind_socket で作成)
+        workers: ワーカープロセス数
+        on_start: fork 後、アプリを起動する前にワーカー内で呼び出す関数
+        log_level: uvicorn のログレベル
+
+    Raises:
+        RuntimeError: fork をサポートしないプラットフォームの場合や、
+            ワーカーが起動直後に終了した場合
+    """
+    if not hasattr(os, "fork"):
+        raise RuntimeError(
+            "複数ワーカーでの起動は fork をサポートする環境でのみ利用できます"
+        )
+
+    # 読み込み済みのオブジェクトをGCの対象から外し、GCによるページのコピーを防ぐ
+    gc.collect()
+    gc.freeze()
+
+    children: dict[int, float] = {}
+    stopping = False
+    failed = False
+
+    def spawn() -> None:
+        pid = os.fork()
+        if pid == 0:
+            exit_code = 0
+            try:
+                _run_worker(app_factory, sock, on_start, log_level)
+            except BaseException:
+                logger.exception("Worker failed")
+                exit_code = 1
+            finally:
+                os._exit(exit_code)
+        children[pid] = time.monotonic()
+        logger.info(f"Started worker process {pid}")
+
+    def stop(signum: int, frame: Any) -> None:
+        nonlocal stopping
+        stopping = True
+        for pid in list(children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    previous_handlers = {
+        sig: signal.signal(sig, stop) for sig in (signal.SIGINT, signal.SIGTERM)
+    }
+    try:
+        for _ in range(workers):
+            spawn()
+
+        while children:
+            try:
+                pid, status = os.wait()
+            except ChildProcessError:
+                break
+            started = children.pop(pid, None)
+            if started is None or stopping:
+                continue
+            uptime = time.monotonic() - started
+            if uptime < MIN_WORKER_UPTIME:
+                failed = True
+                logger.error(
+                    f"Worker {pid} exited during startup (status {status}), shutting down"
+                )
+                stop(signal.SIGTERM, None)
+                continue
+            logger.warning(f"Worker {pid} exited (status {status}), restarting")
+            spawn()
+    finally:
+        for sig, handler in previous_handlers.items():
+            signal.signal(sig, handler)
+        sock.close()
+        gc.unfreeze()
+
+    if failed:
+        raise RuntimeError("ワーカープロセスの起動に失敗しました")
@@ -0,0 +1,48 @@
+"""テスト共通のフィクスチャとコマンドラインオプション。"""
+
+import pytest
+import pytest_asyncio
+
+from tests.mcp_harness import CONNECTORS, SharedSession
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("mcp-e2e")
+    group.addoption(
+        "--e2e-server",
+        choices=sorted(CONNECTORS),
+        default="memory",
+        help="E2Eテストのサーバ接続方法(memory: プロセス内, stdio: サブプロセス)",
+    )
+    group.addoption(
+        "--stress-clients",
+        type=int,
+        default=4,
+        help="ストレステストで同時に接続するクライアント数",
+    )
+    group.addoption(
+        "--stress-calls",
+        type=int,
+        default=20,
+        help="ストレステストのクライアントごとの呼び出し回数",
+    )
+    group.addoption(
+        "--stress-report",
+        default=None,
+        help="ストレステストの結果(JSON)の書き出し先",
+    )
+
+
+@pytest.fixture(scope="session")
+def mcp_connector(request):
+    """--e2e-server で選択したセッション作成関数"""
+    return CONNECTORS[request.config.getoption("--e2e-server")]
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def mcp_session(mcp_connector):
+    """テストセッション全体で共有する初期化済みのMCPクライアントセッション"""
+    shared = SharedSession(mcp_connector)
+    session = await shared.start()
+    yield session
+    await shared.stop()
@@ -0,0 +1,114 @@
+"""E2Eテスト用のMCPサーバ接続ハーネス。
+
+サーバをテストセッション全体で1回だけ起動し、同じクライアントセッションを
+全テストで使い回す。接続方法は次の2つ:
+
+- memory: 同じプロセス内のサーバにメモリストリームで接続する(既定、最速)
+- stdio: サーバをサブプロセスとして1回だけ起動し、stdio で接続する
+
+複数クライアントから同時に呼び出し、ツールごとの処理時間を集計する
+ストレスモード(run_stress)も提供する。
+"""
+
+import asyncio
+import sys
+from collections.abc import AsyncIterator, Sequence
+from contextlib import asynccontextmanager
+from typing import Any
+
+from mcp.client.session import ClientSession
+from mcp.client.stdio import StdioServerParameters, stdio_client
+from mcp.shared.memory import create_connected_server_and_client_session
+
+from j_quants_doc_mcp.loadtest import Connector, run_load
+
+
+@asynccontextmanager
+async def memory_session() -> AsyncIterator[ClientSession]:
+    """同じプロセス内のサーバにメモリストリームで接続した初期化済みセッション"""
+    from j_quants_doc_mcp.server import mcp
+
+    async with create_connected_server_and_client_session(mcp._mcp_server) as session:
+        yield session
+
+
+@asynccontextmanager
+async def stdio_session() -> AsyncIterator[ClientSession]:
+    """サブプロセスで起動したサーバに stdio で接続した初期化済みセッション"""
+    params = StdioServerParameters(
+        command=sys.executable, args=["-m", "j_quants_doc_mcp.cli"]
+    )
+    async with (
+        stdio_client(params) as (read, write),
+        ClientSession(read, write) as session,
+    ):
+        await session.initialize()
+        yield session
+
+
+CONNECTORS: dict[str, Connector] = {"memory": memory_session, "stdio": stdio_session}
+
+
+class SharedSession:
+    """テストをまたいで使い回すクライアントセッション
+
+    接続(anyio のタスクグループ)の開始と終了を同じタスクで行う必要があるため、
+    接続は専用のタスクで保持し、テストからはセッションだけを参照する。
+    """
+
+    def __init__(self, connect: Connector):
+        self._connect = connect
+        self._task: asyncio.Task | None = None
+        self._stop = asyncio.Event()
+
+    async def start(self) -> ClientSession:
+        """接続を開始し、初期化済みのセッションを返す"""
+        ready: asyncio.Future[ClientSession] = (
+            asyncio.get_running_loop().create_future()
+        )
+        self._task = asyncio.create_task(self._run(ready))
+        return await ready
+
+    async def _run(self, ready: asyncio.Future) -> None:
+        try:
+            async with self._connect() as session:
+                ready.set_result(session)
+                await self._stop.wait()
+        except BaseException as e:
+            if not ready.done():
+                ready.set_exception(e)
+                return
+            raise
+
+    async def stop(self) -> None:
+        """接続を終了する"""
+        self._stop.set()
+        if self._task is not None:
+            await self._task
+
+
+async def run_stress(
+    connect: Connector,
+    clients: int,
+    calls_per_client: int,
+    calls: Sequence[tuple[str, dict[str, Any]]],
+) -> dict[str, Any]:
+    """複数のクライアントから同時にツールを呼び出し、ツールごとの処理時間を集計する
+
+    各クライアントは独立したセッションで接続し、calls を順に(クライアントごとに
+    開始位置をずらして)繰り返し呼び出す。集計は j_quants_doc_mcp.loadtest.run_load で行う。
+
+    Args:
+        connect: セッションを作成する関数(CONNECTORS の値)
+        clients: 同時に接続するクライアント数
+        calls_per_client: クライアントごとの呼び出し回数
+        calls: (ツール名, 引数) のリスト
+
+    Returns:
+        run_load の集計結果
+    """
+    workloads = [
+        [calls[(index + i) % len(calls)] for i in range(calls_per_client)]
+        for index in range(clients)
+    ]
+    return await run_load(connect, workloads)
@@ -0,0 +1,100 @@
+"""合成カタログとベンチマークのテスト"""
+
+import json
+
+from benchmarks.runner import (
+    BENCHMARKED_TOOLS,
+    benchmark_scale,
+    compare_reports,
+    main,
+)
+from benchmarks.synthetic import (
+    generate_documents,
+    load_shipped_documents,
+    write_documents,
+)
+from j_quants_doc_mcp.resources.specifications import load_endpoints, load_snapshot
+
+
+class TestSyntheticCatalogue:
+    """generate_documents のテストクラス"""
+
+    def test_scaled_counts(self):
+        """全てのデータが指定した倍率の件数になることを確認"""
+        base = load_shipped_documents()
+        documents = generate_documents(3, base)
+
+        assert len(documents["endpoints.json"]["endpoints"]) == 3 * len(
+            base["endpoints.json"]["endpoints"]
+        )
+        assert len(documents["faq.json"]["faqs"]) == 3 * len(base["faq.json"]["faqs"])
+        assert len(documents["reference_data.json"]["reference_data"]) == 3 * len(
+            base["reference_data.json"]["reference_data"]
+        )
+        assert len(documents["patterns.json"]["patterns"]) == 3 * len(
+            base["patterns.json"]["patterns"]
+        )
+
+    def test_unique_names_and_paths(self):
+        """複製したエンドポイントの名前とパスが重複しないことを確認"""
+        endpoints = generate_documents(4)["endpoints.json"]["endpoints"]
+
+        names = [endpoint["name"] for endpoint in endpoints]
+        paths = [endpoint["path"] for endpoint in endpoints]
+        assert len(set(names)) == len(names)
+        assert len(set(paths)) == len(paths)
+        assert "eq-master" in names
+        assert "eq-master-s3" in names
+
+    def test_loadable_as_data_directory(self, tmp_path):
+        """書き出したカタログをデータファイルとして検証・読み込みできることを確認"""
+        write_documents(generate_documents(2), tmp_path)
+
+        collection = load_endpoints(tmp_path / "endpoints.json")
+        snapshot = load_snapshot(tmp_path, use_compiled=False)
+
+        assert len(collection.endpoints) == len(snapshot.endpoints)
+        assert snapshot.find_endpoint("eq-bars-daily-s1")["path"].endswith("/s1")
+        assert snapshot.property_index.get("Code") is not None
+
+
+class TestBenchmarkRunner:
+    """benchmark_scale / compare_reports のテストクラス"""
+
+    def test_benchmark_scale(self):
+        """全てのツールの計測結果がレポートに含まれることを確認"""
+        result = benchmark_scale(2, iterations=5)
+
+        assert result["catalogue"]["endpoints"] > 0
+        assert set(result["tools"]) == set(BENCHMARKED_TOOLS)
+        for measured in result["tools"].values():
+            assert measured["calls"] == 5
+            assert measured["throughput_per_second"] > 0
+            latency = measured["latency_ms"]
+            assert 0 < latency["p50"] <= latency["p95"] <= latency["p99"]
+            assert latency["p99"] <= latency["max"]
+            assert measured["peak_memory_bytes"] >= 0
+
+    def test_report_file_and_comparison(self, tmp_path, capsys):
+        """レポートを書き出し、前回のレポートと比較できることを確認"""
+        output = tmp_path / "report.json"
+        argv = ["--scales", "1", "--iterations", "5", "--tools", "describe_endpoint"]
+
+        assert main([*argv, "--output", str(output)]) == 0
+        report = json.loads(output.read_text(encoding="utf-8"))
+        assert report["scales"]["1"]["tools"]["describe_endpoint"]["calls"] == 5
+
+        rows = compare_reports(report, report)
+        assert rows == [
+            {
+                "scale": 1,
+                "tool": "describe_endpoint",
+                "p50": 0.0,
+                "p95": 0.0,
+                "p99": 0.0,
+                "throughput": 0.0,
+            }
+        ]
+
+        assert main([*argv, "--baseline", str(output)]) == 0
+        assert "describe_endpoint" in capsys.readouterr().out
@@ -0,0 +1,65 @@
+"""LRUキャッシュのユニットテスト"""
+
+import pytest
+
+from j_quants_doc_mcp.cache import LRUCache
+
+
+class TestLRUCache:
+    """LRUCache のテストクラス"""
+
+    def test_get_and_put(self):
+        """保存した値を取得でき、ヒット・ミスが数えられることを確認"""
+        cache = LRUCache(maxsize=2)
+
+        assert cache.get("a") is None
+        cache.put("a", 1)
+        assert cache.get("a") == 1
+
+        info = cache.info()
+        assert info["hits"] == 1
+        assert info["misses"] == 1
+        assert info["size"] == 1
+
+    def test_evicts_least_recently_used(self):
+        """上限を超えると最も古く使われたエントリが破棄されることを確認"""
+        cache = LRUCache(maxsize=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+        assert len(cache) == 2
+
+    def test_generation_change_invalidates(self):
+        """世代が変わると全エントリが破棄されることを確認"""
+        cache = LRUCache()
+        cache.validate("v1")
+        cache.put("a", 1)
+
+        cache.validate("v1")
+        assert cache.get("a") == 1
+
+        cache.validate("v2")
+        assert cache.get("a") is None
+        assert cache.info()["invalidations"] == 1
+
+    def test_put_skips_stale_generation(self):
+        """検証後に世代が変わった場合、古い世代の値は保存されないことを確認"""
+        cache = LRUCache()
+        cache.validate("v1")
+        cache.validate("v2")
+
+        cache.put("a", "v1 の値", generation="v1")
+        cache.put("b", "v2 の値", generation="v2")
+
+        assert cache.get("a") is None
+        assert cache.get("b") == "v2 の値"
+
+    def test_invalid_maxsize(self):
+        """maxsize が1未満の場合にエラーになることを確認"""
+        with pytest.raises(ValueError):
+            LRUCache(maxsize=0)
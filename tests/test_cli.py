@@ -0,0 +1,177 @@
+"""CLIの起動オプションと複数ワーカーでのHTTP提供のテスト"""
+
+import asyncio
+import json
+import signal
+import socket
+import subprocess
+import sys
+import time
+from unittest.mock import patch
+
+import pytest
+from mcp.client.session import ClientSession
+from mcp.client.streamable_http import streamablehttp_client
+
+from j_quants_doc_mcp.cli import main
+
+
+def _free_port() -> int:
+    """空いているTCPポートを返す"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_for_port(port: int, timeout: float = 10.0) -> None:
+    """サーバが接続を受け付けるまで待つ"""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=1.0):
+                return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.1)
+
+
+class TestServeOptions:
+    """--transport / --host / --port / --workers のテストクラス"""
+
+    @pytest.mark.parametrize(
+        "argv",
+        [
+            ["--transport", "websocket"],
+            ["--port", "http"],
+            ["--workers", "0"],
+            ["--workers", "many"],
+            ["--transport", "sse", "--workers", "2"],
+            ["--workers", "2"],
+            ["--query-threads", "0"],
+            ["--codegen-threads", "two"],
+            ["--reload-interval", "soon"],
+            ["--reload-interval", "0"],
+            ["--reload-interval", "-1"],
+            ["--reload-interval", "nan"],
+            ["--reload-interval", "inf"],
+        ],
+    )
+    def test_invalid_options(self, argv, capsys):
+        """不正なオプションの場合はサーバを起動せずに終了コード1を返すことを確認"""
+        with patch("j_quants_doc_mcp.server.run_server") as run_server:
+            assert main(argv) == 1
+
+        run_server.assert_not_called()
+        assert capsys.readouterr().err
+
+    def test_options_passed_to_run_server(self):
+        """オプションが run_server に渡されることを確認"""
+        argv = [
+            "--transport",
+            "streamable-http",
+            "--host",
+            "0.0.0.0",
+            "--port",
+            "9000",
+            "--workers",
+            "3",
+            "--query-threads",
+            "8",
+            "--codegen-threads=1",
+        ]
+        with patch("j_quants_doc_mcp.server.run_server") as run_server:
+            assert main(argv) == 0
+
+        run_server.assert_called_once_with(
+            reload_interval=None,
+            transport="streamable-http",
+            host="0.0.0.0",
+            port=9000,
+            workers=3,
+            query_threads=8,
+            codegen_threads=1,
+        )
+
+    def test_defaults_to_stdio(self):
+        """オプションを省略した場合は stdio の1プロセスで起動することを確認"""
+        with patch("j_quants_doc_mcp.server.run_server") as run_server:
+            assert main([]) == 0
+
+        run_server.assert_called_once_with(
+            reload_interval=None,
+            transport="stdio",
+            host="127.0.0.1",
+            port=8000,
+            workers=1,
+            query_threads=None,
+            codegen_threads=None,
+        )
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="複数ワーカーは fork が必要")
+class TestMultiWorkerServer:
+    """複数ワーカーの streamable-http サーバの統合テスト"""
+
+    @pytest.fixture
+    def server_url(self):
+        """2ワーカーのサーバを起動し、MCPエンドポイントのURLを返す"""
+        port = _free_port()
+        process = subprocess.Popen(
+            [
+                sys.executable,
+                "-m",
+                "j_quants_doc_mcp.cli",
+                "--transport",
+                "streamable-http",
+                "--port",
+                str(port),
+                "--workers",
+                "2",
+            ],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        try:
+            _wait_for_port(port)
+            yield f"http://127.0.0.1:{port}/mcp"
+        finally:
+            process.send_signal(signal.SIGTERM)
+            try:
+                assert process.wait(timeout=10) == 0
+            finally:
+                if process.poll() is None:
+                    process.kill()
+
+    @staticmethod
+    async def _call_tool(url: str, name: str, arguments: dict) -> dict:
+        """ツールを呼び出し、結果のJSONを返す"""
+        async with (
+            streamablehttp_client(url) as (read, write, _),
+            ClientSession(read, write) as session,
+        ):
+            await session.initialize()
+            result = await session.call_tool(name, arguments=arguments)
+            return json.loads(result.content[0].text)
+
+    def test_concurrent_requests_across_workers(self, server_url):
+        """複数の同時リクエストに全ワーカーが同じデータで応答することを確認"""
+
+        async def run():
+            first = await self._call_tool(
+                server_url, "describe_endpoint", {"endpoint_name": "eq-master"}
+            )
+            rest = await asyncio.gather(
+                *(
+                    self._call_tool(
+                        server_url, "describe_endpoint", {"endpoint_name": "eq-master"}
+                    )
+                    for _ in range(8)
+                )
+            )
+            return [first, *rest]
+
+        results = asyncio.run(run())
+
+        assert all(result == results[0] for result in results)
+        assert results[0]["name"] == "eq-master"
@@ -1,11 +1,31 @@
 """Tests for generate_sample_code tool."""
 
+import asyncio
+import gzip
 import json
+import threading
+import time
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
+import httpx
 import pytest
-from j_quants_doc_mcp.server import generate_sample_code
+from j_quants_doc_mcp.resources.snapshot import DataSnapshot
+from j_quants_doc_mcp.resources.store import get_snapshot
+from j_quants_doc_mcp.server import generate_client_code, generate_sample_code
+from j_quants_doc_mcp.tools import codegen
+from j_quants_doc_mcp.tools.codegen import (
+    clear_sample_code_cache,
+    get_sample_code_cache_info,
+)
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """モックしたテンプレートの出力がキャッシュに残らないよう前後で破棄する"""
+    clear_sample_code_cache()
+    yield
+    clear_sample_code_cache()
 
 
 # フィクスチャ: テスト用エンドポイントデータ
@@ -21,9 +41,9 @@ class TestGenerateSampleCodeSuccess:
     """generate_sample_code の正常系テスト"""
 
     @patch("j_quants_doc_mcp.tools.codegen._find_endpoint")
-    @patch("j_quants_doc_mcp.tools.codegen.Environment")
+    @patch("j_quants_doc_mcp.tools.codegen.get_template")
     def test_generate_eq_master_code(
-        self, mock_env_class, mock_find, mock_endpoints_data
+        self, mock_get_template, mock_find, mock_endpoints_data
     ):
         """eq-masterのサンプルコードが生成できることを確認"""
         endpoint = mock_endpoints_data["endpoints"][0]
@@ -31,9 +51,7 @@ class TestGenerateSampleCodeSuccess:
 
         mock_template = MagicMock()
         mock_template.render.return_value = "# Generated code for eq-master"
-        mock_env = MagicMock()
-        mock_env.get_template.return_value = mock_template
-        mock_env_class.return_value = mock_env
+        mock_get_template.return_value = mock_template
 
         result = generate_sample_code("eq-master")
 
@@ -41,9 +59,9 @@ class TestGenerateSampleCodeSuccess:
         assert "eq-master" in result
 
     @patch("j_quants_doc_mcp.tools.codegen._find_endpoint")
-    @patch("j_quants_doc_mcp.tools.codegen.Environment")
+    @patch("j_quants_doc_mcp.tools.codegen.get_template")
     def test_default_language_is_python(
-        self, mock_env_class, mock_find, mock_endpoints_data
+        self, mock_get_template, mock_find, mock_endpoints_data
     ):
         """デフォルト言語がPythonであることを確認"""
         endpoint = mock_endpoints_data["endpoints"][0]
@@ -51,21 +69,19 @@ class TestGenerateSampleCodeSuccess:
 
         mock_template = MagicMock()
         mock_template.render.return_value = "# Python code"
-        mock_env = MagicMock()
-        mock_env.get_template.return_value = mock_template
-        mock_env_class.return_value = mock_env
+        mock_get_template.return_value = mock_template
 
         # 言語を指定しない場合
         result = generate_sample_code("eq-master")
 
         assert isinstance(result, str)
         # Pythonテンプレートが使われていることを確認
-        mock_env.get_template.assert_called_with("python_httpx.jinja2")
+        mock_get_template.assert_called_with("python_httpx.jinja2")
 
     @patch("j_quants_doc_mcp.tools.codegen._find_endpoint")
-    @patch("j_quants_doc_mcp.tools.codegen.Environment")
+    @patch("j_quants_doc_mcp.tools.codegen.get_template")
     def test_template_receives_correct_params(
-        self, mock_env_class, mock_find, mock_endpoints_data
+        self, mock_get_template, mock_find, mock_endpoints_data
     ):
         """テンプレートに正しいパラメータが渡されることを確認"""
         endpoint = mock_endpoints_data["endpoints"][0]
@@ -73,9 +89,7 @@ class TestGenerateSampleCodeSuccess:
 
         mock_template = MagicMock()
         mock_template.render.return_value = "# Code"
-        mock_env = MagicMock()
-        mock_env.get_template.return_value = mock_template
-        mock_env_class.return_value = mock_env
+        mock_get_template.return_value = mock_template
 
         generate_sample_code("eq-master")
 
@@ -123,19 +137,953 @@ class TestGenerateSampleCodeError:
         assert "error" in result
 
     @patch("j_quants_doc_mcp.tools.codegen._find_endpoint")
-    @patch("j_quants_doc_mcp.tools.codegen.Environment")
-    def test_template_error(self, mock_env_class, mock_find, mock_endpoints_data):
+    @patch("j_quants_doc_mcp.tools.codegen.get_template")
+    def test_template_error(self, mock_get_template, mock_find, mock_endpoints_data):
         """テンプレートエラーが適切にハンドリングされることを確認"""
         endpoint = mock_endpoints_data["endpoints"][0]
         mock_find.return_value = endpoint
 
         # テンプレートエラーを発生させる
-        mock_env = MagicMock()
-        mock_env.get_template.side_effect = Exception("Template error")
-        mock_env_class.return_value = mock_env
+        mock_get_template.side_effect = Exception("Template error")
 
         result = generate_sample_code("eq-master")
 
         assert isinstance(result, dict)
         assert "error" in result
         assert result["error_type"] == "InternalError"
+
+
+class TestGenerateSampleCodeCache:
+    """生成結果のキャッシュのテスト"""
+
+    def test_repeated_call_hits_cache(self):
+        """同じ引数での2回目の呼び出しがキャッシュから返ることを確認"""
+        first = generate_sample_code("eq-bars-daily")
+
+        with patch("j_quants_doc_mcp.tools.codegen._find_endpoint") as mock_find:
+            second = generate_sample_code("eq-bars-daily")
+
+        assert second == first
+        mock_find.assert_not_called()
+        info = get_sample_code_cache_info()
+        assert info["hits"] == 1
+        assert info["misses"] == 1
+        assert info["size"] == 1
+
+    def test_params_are_part_of_key(self):
+        """追加パラメータが異なる場合は別のエントリになることを確認"""
+        generate_sample_code("eq-master")
+        generate_sample_code("eq-master", params={"async": False})
+
+        info = get_sample_code_cache_info()
+        assert info["hits"] == 0
+        assert info["size"] == 2
+
+    def test_not_found_is_not_cached(self):
+        """見つからなかった結果はキャッシュされないことを確認"""
+        generate_sample_code("nonexistent_endpoint")
+
+        assert get_sample_code_cache_info()["size"] == 0
+
+    @patch("j_quants_doc_mcp.tools.codegen.get_snapshot")
+    def test_data_reload_invalidates_cache(self, mock_snapshot, mock_endpoints_data):
+        """データのバージョンが変わるとキャッシュが破棄されることを確認"""
+        mock_snapshot.return_value = DataSnapshot.from_documents(
+            endpoints=mock_endpoints_data
+        )
+        generate_sample_code("eq-master")
+
+        changed = json.loads(json.dumps(mock_endpoints_data))
+        changed["endpoints"][0]["description"] = "更新された説明"
+        mock_snapshot.return_value = DataSnapshot.from_documents(endpoints=changed)
+        result = generate_sample_code("eq-master")
+
+        assert "更新された説明" in result
+        info = get_sample_code_cache_info()
+        assert info["hits"] == 0
+        assert info["invalidations"] == 1
+
+    def test_reload_between_validate_and_put(self, mock_endpoints_data):
+        """検証からキャッシュへの保存までの間に再読み込みされても、古いコードが残らないことを確認"""
+        old = DataSnapshot.from_documents(endpoints=mock_endpoints_data)
+        changed = json.loads(json.dumps(mock_endpoints_data))
+        changed["endpoints"][0]["description"] = "更新された説明"
+        new = DataSnapshot.from_documents(endpoints=changed)
+        real_get_template = codegen.get_template
+        reloaded = []
+
+        def get_template_after_reload(name):
+            # 1回目のレンダリングの直前に、別の呼び出しが新しいデータで世代を進める
+            if not reloaded:
+                reloaded.append(True)
+                with patch.object(codegen, "get_snapshot", return_value=new):
+                    generate_sample_code("eq-master", language="python-async")
+            return real_get_template(name)
+
+        with (
+            patch.object(codegen, "get_snapshot", return_value=old),
+            patch.object(codegen, "get_template", get_template_after_reload),
+        ):
+            stale = generate_sample_code("eq-master")
+        assert "更新された説明" not in stale
+
+        with patch.object(codegen, "get_snapshot", return_value=new):
+            result = generate_sample_code("eq-master")
+
+        assert "更新された説明" in result
+
+
+class TestGenerateSampleCodeAsync:
+    """非同期版サンプルコード生成のテスト"""
+
+    def test_async_language(self):
+        """python-async で AsyncClient を使うコードが生成されることを確認"""
+        result = generate_sample_code("eq-bars-daily", language="python-async")
+
+        assert "httpx.AsyncClient(" in result
+        assert "async def eq_bars_daily(" in result
+        assert "async def eq_bars_daily_all(" in result
+        assert "async def fetch_many(" in result
+        assert "asyncio.Semaphore(max_concurrency)" in result
+
+    def test_async_param(self):
+        """params の async で非同期版を選択できることを確認"""
+        by_param = generate_sample_code("eq-bars-daily", params={"async": True})
+        by_language = generate_sample_code("eq-bars-daily", language="python-async")
+
+        assert by_param == by_language
+
+    def test_invalid_param(self):
+        """サポートされていない追加パラメータでバリデーションエラーになることを確認"""
+        result = generate_sample_code("eq-bars-daily", params={"unknown": True})
+
+        assert result["error_type"] == "ValidationError"
+        assert result["details"]["field"] == "params"
+
+    @pytest.mark.parametrize("language", ["python", "python-async"])
+    def test_all_endpoints_compile(self, language):
+        """全エンドポイントで構文的に正しいPythonコードが生成されることを確認"""
+        for endpoint in get_snapshot().endpoints:
+            code = generate_sample_code(endpoint["name"], language=language)
+            compile(code, endpoint["name"], "exec")
+
+    def test_fetch_many_runs_concurrently(self):
+        """生成したコードが共有クライアントで並行にページを取得することを確認"""
+        namespace = _load_generated("eq-bars-daily", "python-async")
+
+        active = 0
+        peak = 0
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            item = {"Code": request.url.params["code"]}
+            if "pagination_key" in request.url.params:
+                return httpx.Response(200, json={"data": [item]})
+            return httpx.Response(200, json={"data": [item], "pagination_key": "next"})
+
+        async def run():
+            namespace["_client"] = httpx.AsyncClient(
+                base_url=namespace["BASE_URL"], transport=httpx.MockTransport(handler)
+            )
+            try:
+                return await namespace["fetch_many"](
+                    namespace["eq_bars_daily_all"],
+                    [{"api_key": "key", "code": str(code)} for code in range(10)],
+                    max_concurrency=3,
+                )
+            finally:
+                await namespace["close_client"]()
+
+        results = asyncio.run(run())
+
+        assert [len(result) for result in results] == [2] * 10
+        assert results[4][0] == {"Code": "4"}
+        assert 1 < peak <= 3
+
+
+def _load_generated(
+    endpoint_name: str, language: str, params: dict | None = None
+) -> dict:
+    """生成したコードを実行し、モジュールの名前空間を返す
+
+    テストが待たされないよう、レートリミッターは十分に速いものに差し替える。
+    """
+    code = generate_sample_code(endpoint_name, language=language, params=params)
+    namespace: dict = {"__name__": "generated"}
+    # 生成したコードの動作を確認するため、テスト内で実行する
+    exec(compile(code, "generated", "exec"), namespace)  # noqa: S102
+    namespace["rate_limiter"] = namespace["TokenBucket"](60_000_000)
+    return namespace
+
+
+def _paged_handler(pages: int, requests: list):
+    """pages ページ分のレスポンスを返すモックハンドラを作成"""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        page = int(request.url.params.get("pagination_key", "0"))
+        body = {"data": [{"page": page, "row": row} for row in range(2)]}
+        if page + 1 < pages:
+            body["pagination_key"] = str(page + 1)
+        return httpx.Response(200, json=body)
+
+    return handler
+
+
+class TestGenerateSampleCodeIterators:
+    """ページ単位で取得するジェネレータのテスト"""
+
+    def test_iter_is_generated(self):
+        """ページネーション対応エンドポイントで _iter が生成されることを確認"""
+        sync_code = generate_sample_code("eq-bars-daily")
+        async_code = generate_sample_code("eq-bars-daily", language="python-async")
+
+        assert "def eq_bars_daily_iter(" in sync_code
+        assert "-> Iterator[dict]:" in sync_code
+        assert "async def eq_bars_daily_iter(" in async_code
+        assert "-> AsyncIterator[dict]:" in async_code
+
+    def test_iter_not_generated_without_pagination(self):
+        """ページネーション非対応エンドポイントでは _iter が生成されないことを確認"""
+        code = generate_sample_code("bulk-get")
+        async_code = generate_sample_code("bulk-get", language="python-async")
+
+        assert "_iter(" not in code
+        assert "Iterator" not in code
+        assert "_iter(" not in async_code
+        assert "Iterator" not in async_code
+
+    def test_sync_iter_fetches_lazily(self):
+        """同期版の _iter が必要になった時点で次のページを取得することを確認"""
+        namespace = _load_generated("eq-bars-daily", "python")
+        requests: list = []
+        transport = httpx.MockTransport(_paged_handler(3, requests))
+        client_class = httpx.Client
+
+        with patch("httpx.Client", lambda: client_class(transport=transport)):
+            records = namespace["eq_bars_daily_iter"](api_key="key", code="72030")
+            first = next(records)
+            assert first == {"page": 0, "row": 0}
+            assert len(requests) == 1
+
+            rest = list(records)
+            assert len(rest) == 5
+            assert len(requests) == 3
+
+            assert namespace["eq_bars_daily_all"](api_key="key") == [first, *rest]
+
+    def test_sync_iter_reuses_client(self):
+        """同期版の _iter が全ページで同じ httpx.Client を使うことを確認"""
+        namespace = _load_generated("eq-bars-daily", "python")
+        requests: list = []
+        transport = httpx.MockTransport(_paged_handler(3, requests))
+        client_class = httpx.Client
+        clients: list = []
+
+        def make_client():
+            client = client_class(transport=transport)
+            clients.append(client)
+            return client
+
+        with patch("httpx.Client", make_client):
+            records = list(namespace["eq_bars_daily_iter"](api_key="key"))
+
+        assert len(records) == 6
+        assert len(requests) == 3
+        assert len(clients) == 1
+        assert clients[0].is_closed
+
+    def test_async_iter_prefetches_next_page(self):
+        """非同期版の _iter が次のページを先読みし、打ち切り時に取り消すことを確認"""
+        namespace = _load_generated("eq-bars-daily", "python-async")
+        requests: list = []
+
+        async def run():
+            namespace["_client"] = httpx.AsyncClient(
+                base_url=namespace["BASE_URL"],
+                transport=httpx.MockTransport(_paged_handler(5, requests)),
+            )
+            try:
+                records = namespace["eq_bars_daily_iter"](api_key="key")
+                first = await anext(records)
+                # 先読みしたリクエストを実行させる
+                await asyncio.sleep(0.01)
+                prefetched = len(requests)
+                await records.aclose()
+
+                all_records = await namespace["eq_bars_daily_all"](api_key="key")
+                return first, prefetched, all_records
+            finally:
+                await namespace["close_client"]()
+
+        first, prefetched, all_records = asyncio.run(run())
+
+        assert first == {"page": 0, "row": 0}
+        assert prefetched == 2
+        assert len(all_records) == 10
+        assert [record["page"] for record in all_records[::2]] == [0, 1, 2, 3, 4]
+
+
+class TestGenerateSampleCodeRateLimit:
+    """生成コードのレートリミッターのテスト"""
+
+    def test_default_plan_is_lowest_available(self):
+        """プラン未指定の場合はエンドポイントを利用できる最も下位のプランになることを確認"""
+        assert 'PLAN = "Free"' in generate_sample_code("eq-master")
+        assert 'PLAN = "Light"' in generate_sample_code("bulk-list")
+        assert 'PLAN = "Premium"' in generate_sample_code("mkt-breakdown")
+
+    def test_plan_param(self):
+        """params の plan でプランを指定できることを確認"""
+        code = generate_sample_code("eq-master", params={"plan": "Standard"})
+
+        assert 'PLAN = "Standard"' in code
+        assert '"Standard": 120,' in code
+
+    def test_unavailable_plan(self):
+        """エンドポイントを利用できないプランを指定した場合にエラーになることを確認"""
+        result = generate_sample_code("mkt-breakdown", params={"plan": "Free"})
+
+        assert result["error_type"] == "ValidationError"
+        assert result["details"]["field"] == "params"
+        assert "Premium" in result["message"]
+
+    def test_unknown_plan(self):
+        """存在しないプランを指定した場合にエラーになることを確認"""
+        result = generate_sample_code("eq-master", params={"plan": "Gold"})
+
+        assert result["error_type"] == "ValidationError"
+
+    @pytest.mark.parametrize("endpoint_name", ["eq-bars-minute", "eq-trades"])
+    def test_addon_endpoint_rate_limit(self, endpoint_name):
+        """アドオンのエンドポイントはプランに関わらず60件/分に制限されることを確認"""
+        code = generate_sample_code(endpoint_name, params={"plan": "Premium"})
+        namespace: dict = {"__name__": "generated"}
+        # 生成したコードの動作を確認するため、テスト内で実行する
+        exec(compile(code, "generated", "exec"), namespace)  # noqa: S102
+
+        assert namespace["rate_limiter"].rate * 60 == pytest.approx(60)
+
+    def test_base_endpoint_uses_plan_rate_limit(self):
+        """アドオン以外のエンドポイントはプランの上限を使うことを確認"""
+        code = generate_sample_code("eq-bars-daily", params={"plan": "Premium"})
+
+        assert "ADDON_RATE_LIMIT" not in code
+        assert "rate_limiter = TokenBucket(PLAN_RATE_LIMITS[PLAN])" in code
+
+    def test_token_bucket_paces_threads(self):
+        """複数スレッドから呼び出しても指定した速度を超えないことを確認"""
+        namespace = _load_generated("eq-master", "python")
+        bucket = namespace["TokenBucket"](6000)  # 100件/秒
+
+        start = time.monotonic()
+        threads = [threading.Thread(target=bucket.acquire) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert time.monotonic() - start >= 0.045
+
+    def test_token_bucket_pause(self):
+        """pause で全ての呼び出し元が停止することを確認"""
+        namespace = _load_generated("eq-master", "python-async")
+        bucket = namespace["TokenBucket"](6_000_000)
+
+        async def run():
+            bucket.pause(0.05)
+            start = time.monotonic()
+            await asyncio.gather(*(bucket.acquire_async() for _ in range(3)))
+            return time.monotonic() - start
+
+        assert asyncio.run(run()) >= 0.045
+
+    def test_retry_after_on_429(self):
+        """429の場合に Retry-After に従って再試行することを確認"""
+        namespace = _load_generated("eq-trades", "python")
+        responses = [
+            httpx.Response(429, headers={"Retry-After": "0.05"}),
+            httpx.Response(200, json={"ok": True}),
+        ]
+        transport = httpx.MockTransport(lambda request: responses.pop(0))
+        client_class = httpx.Client
+
+        start = time.monotonic()
+        with patch("httpx.Client", lambda: client_class(transport=transport)):
+            result = namespace["eq_trades"](api_key="key")
+
+        assert result == {"ok": True}
+        assert responses == []
+        assert time.monotonic() - start >= 0.045
+
+    def test_async_gives_up_after_max_retries(self):
+        """再試行回数を超えた場合は HTTPStatusError になることを確認"""
+        namespace = _load_generated("eq-trades", "python-async")
+        namespace["MAX_RETRIES"] = 2
+        requests: list = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            return httpx.Response(429, headers={"Retry-After": "0"})
+
+        async def run():
+            namespace["_client"] = httpx.AsyncClient(
+                base_url=namespace["BASE_URL"], transport=httpx.MockTransport(handler)
+            )
+            try:
+                await namespace["eq_trades"](api_key="key")
+            finally:
+                await namespace["close_client"]()
+
+        with pytest.raises(httpx.HTTPStatusError):
+            asyncio.run(run())
+        assert len(requests) == 3
+
+    def test_retry_after_http_date(self):
+        """Retry-After が日時形式の場合も待機時間を求められることを確認"""
+        namespace = _load_generated("eq-master", "python")
+        response = httpx.Response(
+            429, headers={"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"}
+        )
+
+        assert namespace["retry_after_seconds"](response, 0) == 0.0
+
+
+class _BulkServer:
+    """/bulk/list・/bulk/get と署名付きURLの配信を模したモックサーバー"""
+
+    def __init__(self, files: dict[str, bytes], last_modified: str):
+        self.files = files
+        self.last_modified = last_modified
+        self.lock = threading.Lock()
+        self.downloads: list[httpx.Request] = []
+        self.fail_after: dict[str, int] = {}
+        self.active = 0
+        self.peak = 0
+        self.delay = 0.0
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/v2/bulk/list":
+            prefix = request.url.params["endpoint"].strip("/").replace("/", "_")
+            data = [
+                {"Key": key, "LastModified": self.last_modified, "Size": len(body)}
+                for key, body in self.files.items()
+                if key.startswith(prefix)
+            ]
+            return httpx.Response(200, json={"data": data})
+        if request.url.path == "/v2/bulk/get":
+            key = request.url.params["key"]
+            return httpx.Response(200, json={"url": f"https://files.example.com/{key}"})
+
+        key = request.url.path.lstrip("/")
+        with self.lock:
+            self.downloads.append(request)
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(self.delay)
+        with self.lock:
+            self.active -= 1
+
+        body = self.files[key]
+        range_header = request.headers.get("Range")
+        status = 200
+        if range_header:
+            body = body[int(range_header.removeprefix("bytes=").rstrip("-")) :]
+            status = 206
+
+        # 指定されたバイト数を送ったところで通信を切断する
+        fail_after = self.fail_after.pop(key, None)
+        if fail_after is not None:
+
+            def broken():
+                yield body[:fail_after]
+                raise httpx.ReadError("connection reset")
+
+            return httpx.Response(status, content=broken())
+        return httpx.Response(status, content=body)
+
+
+class TestGenerateSampleCodeBulkDownload:
+    """bulk_download で生成するバルクダウンローダーのテスト"""
+
+    LAST_MODIFIED = "2024-01-15T09:00:00Z"
+
+    @pytest.fixture
+    def server(self):
+        return _BulkServer(
+            {
+                "equities_bars_daily_202401.csv.gz": b"a" * 100,
+                "equities_bars_daily_202402.csv.gz": b"b" * 50,
+                "fins_summary_202401.csv.gz": b"c" * 30,
+            },
+            self.LAST_MODIFIED,
+        )
+
+    def _mirror(self, namespace: dict, server: _BulkServer, output_dir: Path, **kwargs):
+        transport = httpx.MockTransport(server.handler)
+        client_class = httpx.Client
+        with patch("httpx.Client", lambda: client_class(transport=transport)):
+            kwargs.setdefault("endpoints", ["/equities/bars/daily", "/fins/summary"])
+            return namespace["mirror_bulk_endpoints"]("key", output_dir, **kwargs)
+
+    def test_lists_all_bulk_endpoints(self):
+        """/bulk/list に指定できる全てのエンドポイントが生成コードに含まれることを確認"""
+        namespace = _load_generated("bulk-list", "python", {"bulk_download": True})
+        bulk_endpoints = [
+            e["path"] for e in get_snapshot().endpoints if e.get("bulk_available")
+        ]
+
+        assert namespace["BULK_ENDPOINTS"] == bulk_endpoints
+        assert "/equities/bars/daily" in bulk_endpoints
+
+    def test_bulk_get_also_supported(self):
+        """bulk-get でもダウンローダーを生成できることを確認"""
+        code = generate_sample_code("bulk-get", params={"bulk_download": True})
+
+        assert "def mirror_bulk_endpoints(" in code
+        assert "def bulk_get(" in code
+
+    def test_not_generated_by_default(self):
+        """指定しない場合はダウンローダーを生成しないことを確認"""
+        assert "mirror_bulk_endpoints" not in generate_sample_code("bulk-list")
+
+    @pytest.mark.parametrize(
+        ("endpoint_name", "params"),
+        [
+            ("eq-master", {"bulk_download": True}),
+            ("bulk-list", {"bulk_download": True, "async": True}),
+        ],
+    )
+    def test_invalid_option(self, endpoint_name, params):
+        """バルク以外のエンドポイントや非同期版で指定した場合にエラーになることを確認"""
+        result = generate_sample_code(endpoint_name, params=params)
+
+        assert result["error_type"] == "ValidationError"
+        assert result["details"]["field"] == "params"
+
+    def test_downloads_and_skips_up_to_date(self, server, tmp_path):
+        """ダウンロードしたファイルは、再実行時に Size・LastModified の一致で省略されることを確認"""
+        namespace = _load_generated("bulk-list", "python", {"bulk_download": True})
+        namespace["DOWNLOAD_CHUNK_SIZE"] = 16
+
+        results = self._mirror(namespace, server, tmp_path)
+
+        assert set(results.values()) == {"downloaded"}
+        for key, body in server.files.items():
+            assert (tmp_path / key).read_bytes() == body
+        assert not list(tmp_path.glob("*.part"))
+
+        server.downloads.clear()
+        results = self._mirror(namespace, server, tmp_path)
+
+        assert set(results.values()) == {"skipped"}
+        assert server.downloads == []
+
+    def test_redownloads_modified_file(self, server, tmp_path):
+        """LastModified が変わったファイルは再度ダウンロードすることを確認"""
+        namespace = _load_generated("bulk-list", "python", {"bulk_download": True})
+        self._mirror(namespace, server, tmp_path)
+
+        server.last_modified = "2024-02-01T09:00:00Z"
+        server.files["fins_summary_202401.csv.gz"] = b"d" * 30
+        results = self._mirror(namespace, server, tmp_path)
+
+        assert set(results.values()) == {"downloaded"}
+        assert (tmp_path / "fins_summary_202401.csv.gz").read_bytes() == b"d" * 30
+
+    def test_resumes_after_connection_error(self, server, tmp_path):
+        """通信が切れた場合は署名付きURLを取り直し、続きから再開することを確認"""
+        namespace = _load_generated("bulk-list", "python", {"bulk_download": True})
+        namespace["DOWNLOAD_CHUNK_SIZE"] = 8
+        key = "equities_bars_daily_202401.csv.gz"
+        server.fail_after[key] = 40
+
+        results = self._mirror(namespace, server, tmp_path)
+
+        assert results[key] == "downloaded"
+        assert (tmp_path / key).read_bytes() == server.files[key]
+        ranges = [r.headers.get("Range") for r in server.downloads if key in r.url.path]
+        assert ranges == [None, "bytes=40-"]
+
+    def test_resumes_partial_file_from_previous_run(self, server, tmp_path):
+        """前回の実行で残った途中ファイルから再開し、古い途中ファイルは削除することを確認"""
+        namespace = _load_generated("bulk-list", "python", {"bulk_download": True})
+        key = "equities_bars_daily_202401.csv.gz"
+        file_info = {"Key": key, "LastModified": self.LAST_MODIFIED, "Size": 100}
+        part_path = namespace["_partial_path"](tmp_path / key, file_info)
+        part_path.write_bytes(b"a" * 60)
+        stale_path = tmp_path / f"{key}.1000.part"
+        stale_path.write_bytes(b"x")
+
+        results = self._mirror(namespace, server, tmp_path)
+
+        assert results[key] == "resumed"
+        assert (tmp_path / key).read_bytes() == server.files[key]
+        assert not part_path.exists()
+        assert not stale_path.exists()
+
+    def test_size_mismatch_is_not_saved(self, server, tmp_path):
+        """サイズが一致しない場合は保存先に置かず、結果に例外を記録することを確認"""
+        namespace = _load_generated("bulk-list", "python", {"bulk_download": True})
+        key = "fins_summary_202401.csv.gz"
+        original = server.handler
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            response = original(request)
+            if request.url.path == "/v2/bulk/list":
+                data = response.json()["data"]
+                for file_info in data:
+                    file_info["Size"] += 1
+                return httpx.Response(200, json={"data": data})
+            return response
+
+        server.handler = handler
+        results = self._mirror(namespace, server, tmp_path)
+
+        assert isinstance(results[key], ValueError)
+        assert not (tmp_path / key).exists()
+        assert not list(tmp_path.glob("*.part"))
+
+    def test_bounded_concurrency(self, server, tmp_path):
+        """同時にダウンロードするファイル数が max_workers 以下に制限されることを確認"""
+        namespace = _load_generated("bulk-list", "python", {"bulk_download": True})
+        for month in range(3, 9):
+            server.files[f"equities_bars_daily_20240{month}.csv.gz"] = b"e" * 10
+        server.delay = 0.02
+
+        results = self._mirror(namespace, server, tmp_path, max_workers=2)
+
+        assert len(results) == 9
+        assert server.peak == 2
+
+    def test_rejects_key_outside_output_dir(self, tmp_path):
+        """保存先ディレクトリの外を指す Key は拒否することを確認"""
+        namespace = _load_generated("bulk-list", "python", {"bulk_download": True})
+
+        with pytest.raises(ValueError):
+            namespace["local_path"](tmp_path, "../outside.csv.gz")
+
+
+class TestGenerateSampleCodeColumnar:
+    """columnar で生成するバルクCSVの列形式読み込みのテスト"""
+
+    CSV = (
+        "Date,Code,O,C,Vo\n"
+        "2024-01-04,72030,2600.5,2610.0,1000\n"
+        "2024-01-04,67580,,,\n"
+        "2024-01-05,72030,2620.0,2630.5,2000\n"
+    )
+
+    @pytest.fixture
+    def bulk_file(self, tmp_path):
+        path = tmp_path / "equities_bars_daily_202401.csv.gz"
+        with gzip.open(path, "wt", encoding="utf-8") as f:
+            f.write(self.CSV)
+        return str(path)
+
+    def test_column_types_from_response_fields(self):
+        """列の型がエンドポイントのレスポンス項目の型から生成されることを確認"""
+        code = generate_sample_code("eq-bars-daily", params={"columnar": "numpy"})
+
+        assert '    "Date": "String",' in code
+        assert '    "AdjC": "Number",' in code
+        assert "import numpy as np" in code
+        assert "pip install httpx python-dotenv numpy" in code
+
+    @pytest.mark.parametrize("language", ["python", "python-async"])
+    @pytest.mark.parametrize("library", ["numpy", "pyarrow"])
+    def test_compiles(self, language, library):
+        """両方の言語・ライブラリで構文的に正しいコードが生成されることを確認"""
+        code = generate_sample_code(
+            "fin-summary", language=language, params={"columnar": library}
+        )
+
+        compile(code, "generated", "exec")
+        assert "def read_bulk_csv(" in code
+
+    @pytest.mark.parametrize(
+        "params",
+        [{"columnar": "pandas"}, {"columnar": True}],
+    )
+    def test_unsupported_library(self, params):
+        """サポートされていないライブラリを指定した場合にエラーになることを確認"""
+        result = generate_sample_code("eq-bars-daily", params=params)
+
+        assert result["error_type"] == "ValidationError"
+
+    def test_not_bulk_available(self):
+        """バルクダウンロードに対応していないエンドポイントではエラーになることを確認"""
+        result = generate_sample_code("bulk-list", params={"columnar": "numpy"})
+
+        assert result["error_type"] == "ValidationError"
+        assert result["details"]["field"] == "params"
+
+    def test_numpy_chunks(self, bulk_file):
+        """NumPy版が指定した行数ごとに型付きの配列を返すことを確認"""
+        np = pytest.importorskip("numpy")
+        namespace = _load_generated("eq-bars-daily", "python", {"columnar": "numpy"})
+
+        chunks = list(namespace["iter_bulk_csv_chunks"](bulk_file, chunk_rows=2))
+
+        assert [len(chunk["Code"]) for chunk in chunks] == [2, 1]
+        first = chunks[0]
+        assert first["O"].dtype == np.float64
+        assert first["Code"].dtype.kind == "U"
+        assert first["Code"].tolist() == ["72030", "67580"]
+        assert np.isnan(first["C"][1])
+
+        columns = namespace["read_bulk_csv"](bulk_file, chunk_rows=2)
+        assert columns["Vo"].tolist()[::2] == [1000.0, 2000.0]
+        assert columns["Date"].tolist()[-1] == "2024-01-05"
+
+    def test_numpy_boolean(self, tmp_path):
+        """NumPy版で Boolean の項目が bool 型の配列になることを確認"""
+        np = pytest.importorskip("numpy")
+        namespace = _load_generated("fin-summary", "python", {"columnar": "numpy"})
+        path = tmp_path / "fins_summary_202401.csv.gz"
+        with gzip.open(path, "wt", encoding="utf-8") as f:
+            f.write("Code,RetroRst\n72030,true\n67580,false\n")
+
+        columns = namespace["read_bulk_csv"](str(path))
+
+        assert columns["RetroRst"].dtype == np.bool_
+        assert columns["RetroRst"].tolist() == [True, False]
+
+    @pytest.mark.parametrize(
+        "csv_text",
+        [
+            "Code,O,C\n72030,2600.5,2610.0\n67580,2600.5\n",
+            "Code,O,C\n72030,2600.5,2610.0\n67580,2600.5,2610.0,1\n",
+            "Code,O,C\n72030,2600.5\n67580,2600.5\n",
+        ],
+    )
+    def test_numpy_ragged_rows(self, tmp_path, csv_text):
+        """NumPy版で列数がヘッダーと異なる行がある場合に ValueError になることを確認"""
+        pytest.importorskip("numpy")
+        namespace = _load_generated("eq-bars-daily", "python", {"columnar": "numpy"})
+        path = tmp_path / "ragged.csv.gz"
+        with gzip.open(path, "wt", encoding="utf-8") as f:
+            f.write(csv_text)
+
+        with pytest.raises(ValueError):
+            namespace["read_bulk_csv"](str(path))
+
+    def test_numpy_empty_file(self, tmp_path):
+        """NumPy版で空のファイルを読み込んだ場合に空の辞書を返すことを確認"""
+        pytest.importorskip("numpy")
+        namespace = _load_generated("eq-bars-daily", "python", {"columnar": "numpy"})
+        path = tmp_path / "empty.csv.gz"
+        with gzip.open(path, "wt", encoding="utf-8") as f:
+            f.write("")
+
+        assert namespace["read_bulk_csv"](str(path)) == {}
+
+    def test_pyarrow_batches(self, bulk_file):
+        """pyarrow版がレスポンス項目の型で列を変換することを確認"""
+        pa = pytest.importorskip("pyarrow")
+        namespace = _load_generated(
+            "eq-bars-daily", "python-async", {"columnar": "pyarrow"}
+        )
+
+        batches = list(namespace["iter_bulk_csv_batches"](bulk_file))
+        table = namespace["read_bulk_csv"](bulk_file)
+
+        assert sum(batch.num_rows for batch in batches) == 3
+        assert table.schema.field("Code").type == pa.string()
+        assert table.schema.field("O").type == pa.float64()
+        assert table.column("Code").to_pylist() == ["72030", "67580", "72030"]
+        assert table.column("C").to_pylist() == [2610.0, None, 2630.5]
+
+    def test_pyarrow_unknown_type_as_string(self, bulk_file):
+        """pyarrow版で未知の型の項目が文字列として読み込まれることを確認"""
+        pa = pytest.importorskip("pyarrow")
+        namespace = _load_generated("eq-bars-daily", "python", {"columnar": "pyarrow"})
+        namespace["COLUMN_TYPES"]["Code"] = "Integer"
+
+        table = namespace["read_bulk_csv"](bulk_file)
+
+        assert table.schema.field("Code").type == pa.string()
+        assert table.column("Code").to_pylist() == ["72030", "67580", "72030"]
+
+
+def _load_client(
+    language: str = "python", params: dict | None = None, fast: bool = True
+) -> dict:
+    """生成したクライアントモジュールを実行し、モジュールの名前空間を返す
+
+    fast が True の場合、テストが待たされないよう、レートリミッターは
+    十分に速いものに差し替える。
+    """
+    code = generate_client_code(language=language, params=params)
+    namespace: dict = {"__name__": "generated"}
+    # 生成したコードの動作を確認するため、テスト内で実行する
+    exec(compile(code, "generated", "exec"), namespace)  # noqa: S102
+    if fast:
+        namespace["rate_limiter"] = namespace["TokenBucket"](60_000_000)
+        namespace["addon_rate_limiter"] = namespace["TokenBucket"](60_000_000)
+    return namespace
+
+
+class TestGenerateClientCode:
+    """generate_client_code のテスト"""
+
+    @pytest.mark.parametrize("language", ["python", "python-async"])
+    def test_addon_endpoint_rate_limit(self, language):
+        """アドオンのエンドポイントには60件/分の別枠のレートリミッターを使うことを確認"""
+        namespace = _load_client(language, params={"plan": "Premium"}, fast=False)
+        limiter_for = namespace["rate_limiter_for"]
+
+        assert limiter_for("/equities/bars/minute").rate * 60 == pytest.approx(60)
+        assert limiter_for("/equities/trades").rate * 60 == pytest.approx(60)
+        assert limiter_for("/equities/bars/daily").rate * 60 == pytest.approx(500)
+        assert limiter_for("/equities/bars/minute") is not limiter_for(
+            "/equities/bars/daily"
+        )
+
+    @pytest.mark.parametrize(
+        ("language", "class_name"),
+        [("python", "JQuantsClient"), ("python-async", "AsyncJQuantsClient")],
+    )
+    def test_covers_all_endpoints(self, language, class_name):
+        """全エンドポイントのメソッドを1つのクラスに生成することを確認"""
+        namespace = _load_client(language)
+        client_class = namespace[class_name]
+
+        for endpoint in get_snapshot().endpoints:
+            function_name = endpoint["name"].replace("-", "_")
+            assert callable(getattr(client_class, function_name))
+        assert hasattr(client_class, "eq_bars_daily_iter")
+        assert hasattr(client_class, "eq_bars_daily_all")
+        assert not hasattr(client_class, "eq_trades_iter")
+
+    def test_async_param(self):
+        """params の async で非同期版を生成できることを確認"""
+        code = generate_client_code(params={"async": True})
+
+        assert "class AsyncJQuantsClient" in code
+
+    def test_plan_param(self):
+        """レート制限のプランの既定値と指定を確認"""
+        assert 'PLAN = "Free"' in generate_client_code()
+        assert 'PLAN = "Premium"' in generate_client_code(params={"plan": "Premium"})
+
+    @pytest.mark.parametrize(
+        ("language", "params"),
+        [
+            ("javascript", None),
+            ("python", {"bulk_download": True}),
+            ("python", {"plan": "Gold"}),
+        ],
+    )
+    def test_invalid_input(self, language, params):
+        """サポートされていない言語や追加パラメータでエラーになることを確認"""
+        result = generate_client_code(language=language, params=params)
+
+        assert result["error_type"] == "ValidationError"
+
+    def test_cached(self):
+        """同じ引数の2回目の呼び出しはキャッシュから返すことを確認"""
+        first = generate_client_code()
+        second = generate_client_code()
+
+        assert first is second
+        assert get_sample_code_cache_info()["hits"] == 1
+
+    def test_missing_api_key(self, monkeypatch):
+        """APIキーが指定されていない場合はエラーになることを確認"""
+        namespace = _load_client()
+        monkeypatch.delenv("JQUANTS_API_KEY", raising=False)
+
+        with pytest.raises(ValueError):
+            namespace["JQuantsClient"]()
+
+    def test_shares_one_session(self):
+        """全メソッドが1つの接続プールと認証ヘッダーを共有することを確認"""
+        namespace = _load_client()
+        requests: list = []
+        created: list = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            if request.url.path == "/v2/equities/bars/daily":
+                return _paged_handler(3, [])(request)
+            return httpx.Response(200, json={"data": []})
+
+        client_class = httpx.Client
+
+        def create_client(**kwargs):
+            created.append(kwargs)
+            return client_class(transport=httpx.MockTransport(handler), **kwargs)
+
+        with (
+            patch("httpx.Client", create_client),
+            namespace["JQuantsClient"](api_key="key") as client,
+        ):
+            client.eq_master(code="72030")
+            records = client.eq_bars_daily_all(code="72030")
+            client.mkt_cal()
+
+        assert len(created) == 1
+        assert len(records) == 6
+        assert [r.url.path for r in requests] == [
+            "/v2/equities/master",
+            "/v2/equities/bars/daily",
+            "/v2/equities/bars/daily",
+            "/v2/equities/bars/daily",
+            "/v2/markets/calendar",
+        ]
+        assert all(r.headers["x-api-key"] == "key" for r in requests)
+        # 値が None のパラメータは送信しない
+        assert dict(requests[0].url.params) == {"code": "72030"}
+        assert requests[2].url.params["pagination_key"] == "1"
+
+    def test_async_pagination_and_fan_out(self):
+        """非同期版でページネーションと並行取得ができることを確認"""
+        namespace = _load_client("python-async")
+        requests: list = []
+        client_class = httpx.AsyncClient
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            return _paged_handler(2, [])(request)
+
+        def create_client(**kwargs):
+            return client_class(transport=httpx.MockTransport(handler), **kwargs)
+
+        async def run():
+            async with namespace["AsyncJQuantsClient"](api_key="key") as client:
+                return await namespace["fetch_many"](
+                    client.eq_bars_daily_all,
+                    [{"code": "72030"}, {"code": "67580"}],
+                )
+
+        with patch("httpx.AsyncClient", create_client):
+            results = asyncio.run(run())
+
+        assert [len(records) for records in results] == [4, 4]
+        assert len(requests) == 4
+
+
+class TestGenerateSampleCodeSuggestions:
+    """generate_sample_code の候補提示と自動補正のテストクラス"""
+
+    def test_not_found_includes_candidates(self):
+        """見つからない場合に類似するエンドポイントの候補が含まれることを確認"""
+        result = generate_sample_code("fins-sumary")
+
+        assert result["error_type"] == "NotFoundError"
+        assert result["details"]["candidates"][0]["name"] == "fin-summary"
+
+    def test_auto_resolve(self):
+        """auto_resolve=True で補正したエンドポイントのコードが生成されることを確認"""
+        code = generate_sample_code("eq-bar-daily", auto_resolve=True)
+
+        first_line, rest = code.split("\n", 1)
+        assert first_line.startswith("# auto_resolve:")
+        assert "'eq-bars-daily'" in first_line
+        assert rest == generate_sample_code("eq-bars-daily")
+        compile(code, "<generated>", "exec")
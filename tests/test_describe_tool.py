@@ -5,6 +5,7 @@ from pathlib import Path
 from unittest.mock import patch
 
 import pytest
+from j_quants_doc_mcp.resources.snapshot import DataSnapshot
 from j_quants_doc_mcp.server import describe_endpoint
 
 
@@ -20,10 +21,12 @@ def mock_endpoints_data():
 class TestDescribeEndpointSuccess:
     """describe_endpoint の正常系テスト"""
 
-    @patch("j_quants_doc_mcp.tools.describe._load_endpoints")
+    @patch("j_quants_doc_mcp.tools.describe.get_snapshot")
     def test_describe_eq_master(self, mock_load, mock_endpoints_data):
         """eq-masterエンドポイントの詳細情報を取得できることを確認"""
-        mock_load.return_value = mock_endpoints_data
+        mock_load.return_value = DataSnapshot.from_documents(
+            endpoints=mock_endpoints_data
+        )
 
         result = describe_endpoint("eq-master")
 
@@ -42,10 +45,12 @@ class TestDescribeEndpointSuccess:
         assert "code" in optional_param_names
         assert "date" in optional_param_names
 
-    @patch("j_quants_doc_mcp.tools.describe._load_endpoints")
+    @patch("j_quants_doc_mcp.tools.describe.get_snapshot")
     def test_parameters_structure(self, mock_load, mock_endpoints_data):
         """パラメータの構造が正しいことを確認"""
-        mock_load.return_value = mock_endpoints_data
+        mock_load.return_value = DataSnapshot.from_documents(
+            endpoints=mock_endpoints_data
+        )
 
         result = describe_endpoint("eq-master")
 
@@ -56,10 +61,12 @@ class TestDescribeEndpointSuccess:
             assert "description" in param
             assert "location" in param
 
-    @patch("j_quants_doc_mcp.tools.describe._load_endpoints")
+    @patch("j_quants_doc_mcp.tools.describe.get_snapshot")
     def test_response_structure(self, mock_load, mock_endpoints_data):
         """レスポンスの構造が正しいことを確認"""
-        mock_load.return_value = mock_endpoints_data
+        mock_load.return_value = DataSnapshot.from_documents(
+            endpoints=mock_endpoints_data
+        )
 
         result = describe_endpoint("eq-master")
 
@@ -68,10 +75,12 @@ class TestDescribeEndpointSuccess:
         assert "fields" in result["response"]
         assert len(result["response"]["fields"]) > 0
 
-    @patch("j_quants_doc_mcp.tools.describe._load_endpoints")
+    @patch("j_quants_doc_mcp.tools.describe.get_snapshot")
     def test_data_update_with_notes(self, mock_load, mock_endpoints_data):
         """data_updateフィールド（留意事項あり）が正しく返却されることを確認"""
-        mock_load.return_value = mock_endpoints_data
+        mock_load.return_value = DataSnapshot.from_documents(
+            endpoints=mock_endpoints_data
+        )
 
         result = describe_endpoint("eq-master")
 
@@ -81,10 +90,12 @@ class TestDescribeEndpointSuccess:
         assert "notes" in result["data_update"]
         assert "翌営業日時点" in result["data_update"]["notes"]
 
-    @patch("j_quants_doc_mcp.tools.describe._load_endpoints")
+    @patch("j_quants_doc_mcp.tools.describe.get_snapshot")
     def test_data_update_without_notes(self, mock_load, mock_endpoints_data):
         """data_updateフィールド（留意事項なし）が正しく返却されることを確認"""
-        mock_load.return_value = mock_endpoints_data
+        mock_load.return_value = DataSnapshot.from_documents(
+            endpoints=mock_endpoints_data
+        )
 
         result = describe_endpoint("eq-bars-daily")
 
@@ -93,14 +104,29 @@ class TestDescribeEndpointSuccess:
         assert result["data_update"]["time"] == "16:30頃"
         assert "notes" not in result["data_update"]
 
+    @patch("j_quants_doc_mcp.tools.describe.get_snapshot")
+    def test_describe_by_path(self, mock_load, mock_endpoints_data):
+        """パスおよび旧パスでもエンドポイントを取得できることを確認"""
+        mock_load.return_value = DataSnapshot.from_documents(
+            endpoints=mock_endpoints_data
+        )
+
+        by_path = describe_endpoint("/equities/bars/daily")
+        by_old_path = describe_endpoint("/prices/daily_quotes")
+
+        assert by_path["name"] == "eq-bars-daily"
+        assert by_old_path["name"] == "eq-bars-daily"
+
 
 class TestDescribeEndpointError:
     """describe_endpoint の異常系テスト"""
 
-    @patch("j_quants_doc_mcp.tools.describe._load_endpoints")
+    @patch("j_quants_doc_mcp.tools.describe.get_snapshot")
     def test_endpoint_not_found(self, mock_load, mock_endpoints_data):
         """存在しないエンドポイント名でエラーが返ることを確認"""
-        mock_load.return_value = mock_endpoints_data
+        mock_load.return_value = DataSnapshot.from_documents(
+            endpoints=mock_endpoints_data
+        )
 
         result = describe_endpoint("nonexistent_endpoint")
 
@@ -108,10 +134,12 @@ class TestDescribeEndpointError:
         assert result["error_type"] == "NotFoundError"
         assert "nonexistent_endpoint" in result["message"]
 
-    @patch("j_quants_doc_mcp.tools.describe._load_endpoints")
+    @patch("j_quants_doc_mcp.tools.describe.get_snapshot")
     def test_empty_endpoint_name(self, mock_load, mock_endpoints_data):
         """空文字列のエンドポイント名でバリデーションエラーになることを確認"""
-        mock_load.return_value = mock_endpoints_data
+        mock_load.return_value = DataSnapshot.from_documents(
+            endpoints=mock_endpoints_data
+        )
 
         result = describe_endpoint("")
 
@@ -119,7 +147,7 @@ class TestDescribeEndpointError:
         # 空文字列はバリデーションエラーになる
         assert result["error_type"] == "ValidationError"
 
-    @patch("j_quants_doc_mcp.tools.describe._load_endpoints")
+    @patch("j_quants_doc_mcp.tools.describe.get_snapshot")
     def test_internal_error(self, mock_load):
         """内部エラーが適切にハンドリングされることを確認"""
         mock_load.side_effect = Exception("Test error")
@@ -128,3 +156,51 @@ class TestDescribeEndpointError:
 
         assert "error" in result
         assert result["error_type"] == "InternalError"
+
+
+class TestDescribeEndpointSuggestions:
+    """describe_endpoint の候補提示と自動補正のテストクラス"""
+
+    def test_not_found_includes_candidates(self):
+        """見つからない場合に類似するエンドポイントの候補が含まれることを確認"""
+        result = describe_endpoint("eq-bar-daily")
+
+        assert result["error_type"] == "NotFoundError"
+        candidates = result["details"]["candidates"]
+        assert candidates[0]["name"] == "eq-bars-daily"
+        assert candidates[0]["path"] == "/equities/bars/daily"
+        assert "eq-bars-daily" in result["message"]
+        scores = [candidate["similarity"] for candidate in candidates]
+        assert scores == sorted(scores, reverse=True)
+
+    def test_not_found_without_candidates(self):
+        """似たエンドポイントがない場合は search_endpoints を案内することを確認"""
+        result = describe_endpoint("zzzzzz")
+
+        assert result["details"]["candidates"] == []
+        assert "search_endpoints" in result["message"]
+
+    def test_auto_resolve(self):
+        """auto_resolve=True で明確な候補の詳細が返ることを確認"""
+        result = describe_endpoint("fins-summary", auto_resolve=True)
+
+        assert result["name"] == "fin-summary"
+        assert result["auto_resolved"] == {
+            "requested": "fins-summary",
+            "endpoint_name": "fin-summary",
+            "similarity": 1.0,
+        }
+
+    def test_auto_resolve_is_opt_in(self):
+        """auto_resolve を指定しない場合は補正しないことを確認"""
+        result = describe_endpoint("fins-summary")
+
+        assert result["error_type"] == "NotFoundError"
+
+    def test_auto_resolve_ambiguous(self):
+        """候補が1つに絞れない場合は補正せず候補を返すことを確認"""
+        result = describe_endpoint("mkt-short", auto_resolve=True)
+
+        assert result["error_type"] == "NotFoundError"
+        names = [candidate["name"] for candidate in result["details"]["candidates"]]
+        assert {"mkt-short-sale", "mkt-short-ratio"} <= set(names)
@@ -1,532 +1,413 @@
 """E2Eテスト: MCPクライアント経由でのツール連携動作確認。
 
 MCPクライアント経由でJ-Quants MCPサーバとやり取りできることを確認する。
+サーバはテストセッション全体で1回だけ起動し、セッションを使い回す
+(接続方法は --e2e-server で選択する。tests/conftest.py を参照)。
 """
 
 import json
+from pathlib import Path
 
 import pytest
-from mcp.client.session import ClientSession
-from mcp.client.stdio import StdioServerParameters, stdio_client
+
+from tests.mcp_harness import run_stress
+
+# ストレステストで呼び出すツールと引数
+STRESS_CALLS = [
+    ("search_endpoints", {"keyword": "株価"}),
+    ("describe_endpoint", {"endpoint_name": "eq-bars-daily"}),
+    ("generate_sample_code", {"endpoint_name": "eq-master", "language": "python"}),
+    ("answer_question", {"question": "認証方法を教えてください"}),
+    ("lookup_property", {"property_name": "Code"}),
+]
 
 
 class TestMCPClientE2E:
     """MCPクライアント経由でのE2Eテスト。"""
 
-    @pytest.mark.asyncio
-    async def test_server_startup_and_initialization(self):
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_server_startup_and_initialization(self, mcp_session):
         """サーバが起動し、初期化できることを確認。"""
-        server_params = StdioServerParameters(
-            command="uv",
-            args=["run", "j-quants-doc-mcp"],
-        )
-
-        async with stdio_client(server_params) as (read, write):
-            async with ClientSession(read, write) as session:
-                # サーバを初期化
-                await session.initialize()
+        # 初期化が成功したことを確認
+        assert mcp_session is not None
 
-                # 初期化が成功したことを確認
-                assert session is not None
-
-    @pytest.mark.asyncio
-    async def test_list_tools(self):
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_list_tools(self, mcp_session):
         """tools/list リクエストでツール一覧が取得できることを確認。"""
-        server_params = StdioServerParameters(
-            command="uv",
-            args=["run", "j-quants-doc-mcp"],
-        )
-
-        async with stdio_client(server_params) as (read, write):
-            async with ClientSession(read, write) as session:
-                await session.initialize()
-
-                # ツール一覧を取得
-                result = await session.list_tools()
-
-                # 期待されるツールが含まれることを確認
-                tool_names = [tool.name for tool in result.tools]
-                assert "search_endpoints" in tool_names
-                assert "describe_endpoint" in tool_names
-                assert "generate_sample_code" in tool_names
-                assert "answer_question" in tool_names
-
-    @pytest.mark.asyncio
-    async def test_search_endpoints_tool(self):
+        # ツール一覧を取得
+        result = await mcp_session.list_tools()
+
+        # 期待されるツールが含まれることを確認
+        tool_names = [tool.name for tool in result.tools]
+        assert "search_endpoints" in tool_names
+        assert "describe_endpoint" in tool_names
+        assert "generate_sample_code" in tool_names
+        assert "answer_question" in tool_names
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_search_endpoints_tool(self, mcp_session):
         """search_endpoints ツールが正常に動作することを確認。"""
-        server_params = StdioServerParameters(
-            command="uv",
-            args=["run", "j-quants-doc-mcp"],
+        # tools/call で search_endpoints を実行
+        result = await mcp_session.call_tool(
+            "search_endpoints",
+            arguments={"keyword": "equities"},
         )
 
-        async with stdio_client(server_params) as (read, write):
-            async with ClientSession(read, write) as session:
-                await session.initialize()
+        # レスポンスの検証
+        assert len(result.content) > 0
+        assert result.content[0].type == "text"
 
-                # tools/call で search_endpoints を実行
-                result = await session.call_tool(
-                    "search_endpoints",
-                    arguments={"keyword": "equities"},
-                )
+        # text をJSONとしてパース
+        text_data = json.loads(result.content[0].text)
 
-                # レスポンスの検証
-                assert len(result.content) > 0
-                assert result.content[0].type == "text"
+        # 結果の検証
+        assert "count" in text_data
+        assert "results" in text_data
+        assert text_data["count"] > 0
+        assert len(text_data["results"]) > 0
 
-                # text をJSONとしてパース
-                text_data = json.loads(result.content[0].text)
-
-                # 結果の検証
-                assert "count" in text_data
-                assert "results" in text_data
-                assert text_data["count"] > 0
-                assert len(text_data["results"]) > 0
-
-    @pytest.mark.asyncio
-    async def test_describe_endpoint_tool(self):
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_describe_endpoint_tool(self, mcp_session):
         """describe_endpoint ツールが正常に動作することを確認。"""
-        server_params = StdioServerParameters(
-            command="uv",
-            args=["run", "j-quants-doc-mcp"],
+        # tools/call で describe_endpoint を実行
+        result = await mcp_session.call_tool(
+            "describe_endpoint",
+            arguments={"endpoint_name": "eq-master"},
         )
 
-        async with stdio_client(server_params) as (read, write):
-            async with ClientSession(read, write) as session:
-                await session.initialize()
-
-                # tools/call で describe_endpoint を実行
-                result = await session.call_tool(
-                    "describe_endpoint",
-                    arguments={"endpoint_name": "eq-master"},
-                )
+        # レスポンスの検証
+        assert len(result.content) > 0
+        assert result.content[0].type == "text"
 
-                # レスポンスの検証
-                assert len(result.content) > 0
-                assert result.content[0].type == "text"
+        text_data = json.loads(result.content[0].text)
 
-                text_data = json.loads(result.content[0].text)
+        # エンドポイント情報の検証
+        assert "name" in text_data
+        assert "path" in text_data
+        assert "method" in text_data
+        assert text_data["name"] == "eq-master"
 
-                # エンドポイント情報の検証
-                assert "name" in text_data
-                assert "path" in text_data
-                assert "method" in text_data
-                assert text_data["name"] == "eq-master"
-
-    @pytest.mark.asyncio
-    async def test_generate_sample_code_tool(self):
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_generate_sample_code_tool(self, mcp_session):
         """generate_sample_code ツールが正常に動作することを確認。"""
-        server_params = StdioServerParameters(
-            command="uv",
-            args=["run", "j-quants-doc-mcp"],
+        # tools/call で generate_sample_code を実行
+        result = await mcp_session.call_tool(
+            "generate_sample_code",
+            arguments={
+                "endpoint_name": "eq-master",
+                "language": "python",
+            },
         )
 
-        async with stdio_client(server_params) as (read, write):
-            async with ClientSession(read, write) as session:
-                await session.initialize()
-
-                # tools/call で generate_sample_code を実行
-                result = await session.call_tool(
-                    "generate_sample_code",
-                    arguments={
-                        "endpoint_name": "eq-master",
-                        "language": "python",
-                    },
-                )
+        # レスポンスの検証
+        assert len(result.content) > 0
+        assert result.content[0].type == "text"
 
-                # レスポンスの検証
-                assert len(result.content) > 0
-                assert result.content[0].type == "text"
+        code = result.content[0].text
 
-                code = result.content[0].text
+        # コードの検証
+        assert isinstance(code, str)
+        assert len(code) > 0
+        assert "import httpx" in code or "def " in code
 
-                # コードの検証
-                assert isinstance(code, str)
-                assert len(code) > 0
-                assert "import httpx" in code or "def " in code
-
-    @pytest.mark.asyncio
-    async def test_full_workflow_search_describe_codegen(self):
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_full_workflow_search_describe_codegen(self, mcp_session):
         """完全なワークフロー: search → describe → codegen を確認。"""
-        server_params = StdioServerParameters(
-            command="uv",
-            args=["run", "j-quants-doc-mcp"],
+        # 1. search_endpoints でエンドポイントを検索
+        search_result = await mcp_session.call_tool(
+            "search_endpoints",
+            arguments={"keyword": "equities"},
         )
 
-        async with stdio_client(server_params) as (read, write):
-            async with ClientSession(read, write) as session:
-                await session.initialize()
-
-                # 1. search_endpoints でエンドポイントを検索
-                search_result = await session.call_tool(
-                    "search_endpoints",
-                    arguments={"keyword": "equities"},
-                )
+        search_data = json.loads(search_result.content[0].text)
+        assert search_data["count"] > 0
 
-                search_data = json.loads(search_result.content[0].text)
-                assert search_data["count"] > 0
+        # 最初の結果のエンドポイント名を取得
+        endpoint_name = search_data["results"][0]["name"]
 
-                # 最初の結果のエンドポイント名を取得
-                endpoint_name = search_data["results"][0]["name"]
-
-                # 2. describe_endpoint で詳細を取得
-                describe_result = await session.call_tool(
-                    "describe_endpoint",
-                    arguments={"endpoint_name": endpoint_name},
-                )
+        # 2. describe_endpoint で詳細を取得
+        describe_result = await mcp_session.call_tool(
+            "describe_endpoint",
+            arguments={"endpoint_name": endpoint_name},
+        )
 
-                describe_data = json.loads(describe_result.content[0].text)
-                assert describe_data["name"] == endpoint_name
+        describe_data = json.loads(describe_result.content[0].text)
+        assert describe_data["name"] == endpoint_name
 
-                # 3. generate_sample_code でコード生成
-                codegen_result = await session.call_tool(
-                    "generate_sample_code",
-                    arguments={
-                        "endpoint_name": endpoint_name,
-                        "language": "python",
-                    },
-                )
+        # 3. generate_sample_code でコード生成
+        codegen_result = await mcp_session.call_tool(
+            "generate_sample_code",
+            arguments={
+                "endpoint_name": endpoint_name,
+                "language": "python",
+            },
+        )
 
-                code = codegen_result.content[0].text
-                assert isinstance(code, str)
-                assert len(code) > 0
+        code = codegen_result.content[0].text
+        assert isinstance(code, str)
+        assert len(code) > 0
 
 
 class TestMCPClientErrorHandling:
     """MCPクライアント経由でのエラーハンドリングE2Eテスト。"""
 
-    @pytest.mark.asyncio
-    async def test_validation_error_response_format(self):
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_validation_error_response_format(self, mcp_session):
         """バリデーションエラー時のレスポンス形式を確認。"""
-        server_params = StdioServerParameters(
-            command="uv",
-            args=["run", "j-quants-doc-mcp"],
+        # 空のキーワードで search_endpoints を実行
+        result = await mcp_session.call_tool(
+            "search_endpoints",
+            arguments={"keyword": ""},
         )
 
-        async with stdio_client(server_params) as (read, write):
-            async with ClientSession(read, write) as session:
-                await session.initialize()
+        # レスポンスの検証
+        assert len(result.content) > 0
+        text_data = json.loads(result.content[0].text)
 
-                # 空のキーワードで search_endpoints を実行
-                result = await session.call_tool(
-                    "search_endpoints",
-                    arguments={"keyword": ""},
-                )
+        # エラー情報の検証
+        assert text_data["error"] is True
+        assert text_data["error_type"] == "ValidationError"
+        assert "message" in text_data
+        assert "details" in text_data
 
-                # レスポンスの検証
-                assert len(result.content) > 0
-                text_data = json.loads(result.content[0].text)
-
-                # エラー情報の検証
-                assert text_data["error"] is True
-                assert text_data["error_type"] == "ValidationError"
-                assert "message" in text_data
-                assert "details" in text_data
-
-    @pytest.mark.asyncio
-    async def test_not_found_error_response_format(self):
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_not_found_error_response_format(self, mcp_session):
         """未検出エラー時のレスポンス形式を確認。"""
-        server_params = StdioServerParameters(
-            command="uv",
-            args=["run", "j-quants-doc-mcp"],
+        # 存在しないエンドポイント名で describe_endpoint を実行
+        result = await mcp_session.call_tool(
+            "describe_endpoint",
+            arguments={"endpoint_name": "nonexistent_endpoint"},
         )
 
-        async with stdio_client(server_params) as (read, write):
-            async with ClientSession(read, write) as session:
-                await session.initialize()
-
-                # 存在しないエンドポイント名で describe_endpoint を実行
-                result = await session.call_tool(
-                    "describe_endpoint",
-                    arguments={"endpoint_name": "nonexistent_endpoint"},
-                )
+        # レスポンスの検証
+        assert len(result.content) > 0
+        text_data = json.loads(result.content[0].text)
 
-                # レスポンスの検証
-                assert len(result.content) > 0
-                text_data = json.loads(result.content[0].text)
+        # エラー情報の検証
+        assert text_data["error"] is True
+        assert text_data["error_type"] == "NotFoundError"
+        assert "message" in text_data
+        assert "nonexistent_endpoint" in text_data["message"]
 
-                # エラー情報の検証
-                assert text_data["error"] is True
-                assert text_data["error_type"] == "NotFoundError"
-                assert "message" in text_data
-                assert "nonexistent_endpoint" in text_data["message"]
-
-    @pytest.mark.asyncio
-    async def test_unsupported_language_error(self):
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_unsupported_language_error(self, mcp_session):
         """サポートされていない言語指定時のエラーを確認。"""
-        server_params = StdioServerParameters(
-            command="uv",
-            args=["run", "j-quants-doc-mcp"],
+        # サポートされていない言語で generate_sample_code を実行
+        result = await mcp_session.call_tool(
+            "generate_sample_code",
+            arguments={
+                "endpoint_name": "eq-master",
+                "language": "javascript",
+            },
         )
 
-        async with stdio_client(server_params) as (read, write):
-            async with ClientSession(read, write) as session:
-                await session.initialize()
-
-                # サポートされていない言語で generate_sample_code を実行
-                result = await session.call_tool(
-                    "generate_sample_code",
-                    arguments={
-                        "endpoint_name": "eq-master",
-                        "language": "javascript",
-                    },
-                )
-
-                # レスポンスの検証
-                assert len(result.content) > 0
-                text_data = json.loads(result.content[0].text)
+        # レスポンスの検証
+        assert len(result.content) > 0
+        text_data = json.loads(result.content[0].text)
 
-                # エラー情報の検証
-                assert text_data["error"] is True
-                assert text_data["error_type"] == "ValidationError"
-                assert "サポートされていません" in text_data["message"]
+        # エラー情報の検証
+        assert text_data["error"] is True
+        assert text_data["error_type"] == "ValidationError"
+        assert "サポートされていません" in text_data["message"]
 
 
 class TestNewEndpointsE2E:
     """新規エンドポイント用の統合E2Eテスト。"""
 
-    @pytest.mark.asyncio
-    async def test_search_eq_bars_daily_am_endpoint(self):
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_search_eq_bars_daily_am_endpoint(self, mcp_session):
         """前場四本値エンドポイントの検索動作を確認。"""
-        server_params = StdioServerParameters(
-            command="uv",
-            args=["run", "j-quants-doc-mcp"],
+        # 前場四本値エンドポイントを検索
+        result = await mcp_session.call_tool(
+            "search_endpoints",
+            arguments={"keyword": "前場"},
         )
 
-        async with stdio_client(server_params) as (read, write):
-            async with ClientSession(read, write) as session:
-                await session.initialize()
+        assert len(result.content) > 0
+        text_data = json.loads(result.content[0].text)
 
-                # 前場四本値エンドポイントを検索
-                result = await session.call_tool(
-                    "search_endpoints",
-                    arguments={"keyword": "前場"},
-                )
+        # 検索結果に前場四本値が含まれることを確認
+        assert text_data["count"] > 0
+        endpoint_names = [r["name"] for r in text_data["results"]]
+        assert "eq-bars-daily-am" in endpoint_names
 
-                assert len(result.content) > 0
-                text_data = json.loads(result.content[0].text)
-
-                # 検索結果に前場四本値が含まれることを確認
-                assert text_data["count"] > 0
-                endpoint_names = [r["name"] for r in text_data["results"]]
-                assert "eq-bars-daily-am" in endpoint_names
-
-    @pytest.mark.asyncio
-    async def test_describe_eq_investor_types_endpoint(self):
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_describe_eq_investor_types_endpoint(self, mcp_session):
         """投資部門別情報エンドポイントの詳細取得を確認。"""
-        server_params = StdioServerParameters(
-            command="uv",
-            args=["run", "j-quants-doc-mcp"],
+        # 投資部門別情報エンドポイントの詳細を取得
+        result = await mcp_session.call_tool(
+            "describe_endpoint",
+            arguments={"endpoint_name": "eq-investor-types"},
         )
 
-        async with stdio_client(server_params) as (read, write):
-            async with ClientSession(read, write) as session:
-                await session.initialize()
-
-                # 投資部門別情報エンドポイントの詳細を取得
-                result = await session.call_tool(
-                    "describe_endpoint",
-                    arguments={"endpoint_name": "eq-investor-types"},
-                )
-
-                assert len(result.content) > 0
-                text_data = json.loads(result.content[0].text)
+        assert len(result.content) > 0
+        text_data = json.loads(result.content[0].text)
 
-                # エンドポイント情報の検証
-                assert text_data["name"] == "eq-investor-types"
-                assert text_data["path"] == "/equities/investor-types"
-                assert text_data["method"] == "GET"
-                assert "description" in text_data
+        # エンドポイント情報の検証
+        assert text_data["name"] == "eq-investor-types"
+        assert text_data["path"] == "/equities/investor-types"
+        assert text_data["method"] == "GET"
+        assert "description" in text_data
 
-    @pytest.mark.asyncio
-    async def test_describe_drv_bars_daily_opt_225_endpoint(self):
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_describe_drv_bars_daily_opt_225_endpoint(self, mcp_session):
         """日経225オプション四本値エンドポイントの詳細取得を確認。"""
-        server_params = StdioServerParameters(
-            command="uv",
-            args=["run", "j-quants-doc-mcp"],
+        # 日経225オプション四本値エンドポイントの詳細を取得
+        result = await mcp_session.call_tool(
+            "describe_endpoint",
+            arguments={"endpoint_name": "drv-bars-daily-opt-225"},
         )
 
-        async with stdio_client(server_params) as (read, write):
-            async with ClientSession(read, write) as session:
-                await session.initialize()
+        assert len(result.content) > 0
+        text_data = json.loads(result.content[0].text)
 
-                # 日経225オプション四本値エンドポイントの詳細を取得
-                result = await session.call_tool(
-                    "describe_endpoint",
-                    arguments={"endpoint_name": "drv-bars-daily-opt-225"},
-                )
+        # エンドポイント情報の検証
+        assert text_data["name"] == "drv-bars-daily-opt-225"
+        assert text_data["path"] == "/derivatives/bars/daily/options/225"
+        assert text_data["method"] == "GET"
+        assert "description" in text_data
 
-                assert len(result.content) > 0
-                text_data = json.loads(result.content[0].text)
-
-                # エンドポイント情報の検証
-                assert text_data["name"] == "drv-bars-daily-opt-225"
-                assert text_data["path"] == "/derivatives/bars/daily/options/225"
-                assert text_data["method"] == "GET"
-                assert "description" in text_data
-
-    @pytest.mark.asyncio
-    async def test_describe_drv_bars_daily_fut_endpoint(self):
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_describe_drv_bars_daily_fut_endpoint(self, mcp_session):
         """先物四本値エンドポイントの詳細取得を確認。"""
-        server_params = StdioServerParameters(
-            command="uv",
-            args=["run", "j-quants-doc-mcp"],
+        # 先物四本値エンドポイントの詳細を取得
+        result = await mcp_session.call_tool(
+            "describe_endpoint",
+            arguments={"endpoint_name": "drv-bars-daily-fut"},
         )
 
-        async with stdio_client(server_params) as (read, write):
-            async with ClientSession(read, write) as session:
-                await session.initialize()
-
-                # 先物四本値エンドポイントの詳細を取得
-                result = await session.call_tool(
-                    "describe_endpoint",
-                    arguments={"endpoint_name": "drv-bars-daily-fut"},
-                )
+        assert len(result.content) > 0
+        text_data = json.loads(result.content[0].text)
 
-                assert len(result.content) > 0
-                text_data = json.loads(result.content[0].text)
+        # エンドポイント情報の検証
+        assert text_data["name"] == "drv-bars-daily-fut"
+        assert text_data["path"] == "/derivatives/bars/daily/futures"
+        assert text_data["method"] == "GET"
+        assert "description" in text_data
 
-                # エンドポイント情報の検証
-                assert text_data["name"] == "drv-bars-daily-fut"
-                assert text_data["path"] == "/derivatives/bars/daily/futures"
-                assert text_data["method"] == "GET"
-                assert "description" in text_data
-
-    @pytest.mark.asyncio
-    async def test_generate_code_for_eq_bars_daily_am(self):
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_generate_code_for_eq_bars_daily_am(self, mcp_session):
         """前場四本値エンドポイントのコード生成を確認。"""
-        server_params = StdioServerParameters(
-            command="uv",
-            args=["run", "j-quants-doc-mcp"],
+        # 前場四本値エンドポイントのサンプルコードを生成
+        result = await mcp_session.call_tool(
+            "generate_sample_code",
+            arguments={
+                "endpoint_name": "eq-bars-daily-am",
+                "language": "python",
+            },
         )
 
-        async with stdio_client(server_params) as (read, write):
-            async with ClientSession(read, write) as session:
-                await session.initialize()
-
-                # 前場四本値エンドポイントのサンプルコードを生成
-                result = await session.call_tool(
-                    "generate_sample_code",
-                    arguments={
-                        "endpoint_name": "eq-bars-daily-am",
-                        "language": "python",
-                    },
-                )
-
-                assert len(result.content) > 0
-                code = result.content[0].text
-
-                # コードの基本的な検証
-                assert isinstance(code, str)
-                assert len(code) > 0
-                assert "eq-bars-daily-am" in code or "/equities/bars/daily/am" in code
-
-    @pytest.mark.asyncio
-    async def test_generate_code_for_drv_bars_daily_opt_225(self):
+        assert len(result.content) > 0
+        code = result.content[0].text
+
+        # コードの基本的な検証
+        assert isinstance(code, str)
+        assert len(code) > 0
+        assert "eq-bars-daily-am" in code or "/equities/bars/daily/am" in code
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_generate_code_for_drv_bars_daily_opt_225(self, mcp_session):
         """日経225オプション四本値エンドポイントのコード生成を確認。"""
-        server_params = StdioServerParameters(
-            command="uv",
-            args=["run", "j-quants-doc-mcp"],
+        # 日経225オプション四本値エンドポイントのサンプルコードを生成
+        result = await mcp_session.call_tool(
+            "generate_sample_code",
+            arguments={
+                "endpoint_name": "drv-bars-daily-opt-225",
+                "language": "python",
+            },
+        )
+
+        assert len(result.content) > 0
+        code = result.content[0].text
+
+        # コードの基本的な検証
+        assert isinstance(code, str)
+        assert len(code) > 0
+        assert (
+            "drv-bars-daily-opt-225" in code
+            or "/derivatives/bars/daily/options/225" in code
         )
 
-        async with stdio_client(server_params) as (read, write):
-            async with ClientSession(read, write) as session:
-                await session.initialize()
-
-                # 日経225オプション四本値エンドポイントのサンプルコードを生成
-                result = await session.call_tool(
-                    "generate_sample_code",
-                    arguments={
-                        "endpoint_name": "drv-bars-daily-opt-225",
-                        "language": "python",
-                    },
-                )
-
-                assert len(result.content) > 0
-                code = result.content[0].text
-
-                # コードの基本的な検証
-                assert isinstance(code, str)
-                assert len(code) > 0
-                assert (
-                    "drv-bars-daily-opt-225" in code
-                    or "/derivatives/bars/daily/options/225" in code
-                )
-
-    @pytest.mark.asyncio
-    async def test_search_market_endpoints(self):
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_search_market_endpoints(self, mcp_session):
         """市場関連エンドポイントの検索を確認。"""
-        server_params = StdioServerParameters(
-            command="uv",
-            args=["run", "j-quants-doc-mcp"],
+        # 市場関連エンドポイントを検索
+        result = await mcp_session.call_tool(
+            "search_endpoints",
+            arguments={"keyword": "markets"},
         )
 
-        async with stdio_client(server_params) as (read, write):
-            async with ClientSession(read, write) as session:
-                await session.initialize()
-
-                # 市場関連エンドポイントを検索
-                result = await session.call_tool(
-                    "search_endpoints",
-                    arguments={"keyword": "markets"},
-                )
-
-                assert len(result.content) > 0
-                text_data = json.loads(result.content[0].text)
-
-                # 検索結果に複数の市場関連エンドポイントが含まれることを確認
-                assert text_data["count"] >= 6
-                endpoint_names = [r["name"] for r in text_data["results"]]
-
-                # 期待される市場関連エンドポイント
-                expected_market_endpoints = [
-                    "mkt-margin-int",
-                    "mkt-short-ratio",
-                    "mkt-short-sale",
-                    "mkt-margin-alert",
-                    "mkt-breakdown",
-                    "mkt-cal",
-                ]
-
-                # 少なくとも一部の市場関連エンドポイントが検索結果に含まれることを確認
-                found_count = sum(
-                    1 for ep in expected_market_endpoints if ep in endpoint_names
-                )
-                assert (
-                    found_count >= 3
-                ), f"Expected at least 3 market endpoints, found {found_count}"
-
-    @pytest.mark.asyncio
-    async def test_search_derivatives_endpoints(self):
+        assert len(result.content) > 0
+        text_data = json.loads(result.content[0].text)
+
+        # 検索結果に複数の市場関連エンドポイントが含まれることを確認
+        assert text_data["count"] >= 6
+        endpoint_names = [r["name"] for r in text_data["results"]]
+
+        # 期待される市場関連エンドポイント
+        expected_market_endpoints = [
+            "mkt-margin-int",
+            "mkt-short-ratio",
+            "mkt-short-sale",
+            "mkt-margin-alert",
+            "mkt-breakdown",
+            "mkt-cal",
+        ]
+
+        # 少なくとも一部の市場関連エンドポイントが検索結果に含まれることを確認
+        found_count = sum(1 for ep in expected_market_endpoints if ep in endpoint_names)
+        assert found_count >= 3, (
+            f"Expected at least 3 market endpoints, found {found_count}"
+        )
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_search_derivatives_endpoints(self, mcp_session):
         """デリバティブ関連エンドポイントの検索を確認。"""
-        server_params = StdioServerParameters(
-            command="uv",
-            args=["run", "j-quants-doc-mcp"],
+        # デリバティブ関連エンドポイントを検索
+        result = await mcp_session.call_tool(
+            "search_endpoints",
+            arguments={"keyword": "先物"},
+        )
+
+        assert len(result.content) > 0
+        text_data = json.loads(result.content[0].text)
+
+        # 検索結果にデリバティブ関連エンドポイントが含まれることを確認
+        assert text_data["count"] > 0
+        endpoint_names = [r["name"] for r in text_data["results"]]
+
+        # 期待されるデリバティブ関連エンドポイント
+        expected_derivatives = ["drv-bars-daily-fut", "drv-bars-daily-opt-225"]
+
+        # 少なくとも1つのデリバティブエンドポイントが検索結果に含まれることを確認
+        found_count = sum(1 for ep in expected_derivatives if ep in endpoint_names)
+        assert found_count >= 1, (
+            f"Expected at least 1 derivatives endpoint, found {found_count}"
+        )
+
+
+class TestConcurrentClientsStress:
+    """複数クライアントからの同時呼び出しのテストクラス"""
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_concurrent_clients(self, request, mcp_connector):
+        """複数クライアントから同時に呼び出してもエラーにならず、ツールごとの処理時間を集計できることを確認"""
+        clients = request.config.getoption("--stress-clients")
+        calls_per_client = request.config.getoption("--stress-calls")
+
+        report = await run_stress(
+            mcp_connector, clients, calls_per_client, STRESS_CALLS
         )
 
-        async with stdio_client(server_params) as (read, write):
-            async with ClientSession(read, write) as session:
-                await session.initialize()
-
-                # デリバティブ関連エンドポイントを検索
-                result = await session.call_tool(
-                    "search_endpoints",
-                    arguments={"keyword": "先物"},
-                )
-
-                assert len(result.content) > 0
-                text_data = json.loads(result.content[0].text)
-
-                # 検索結果にデリバティブ関連エンドポイントが含まれることを確認
-                assert text_data["count"] > 0
-                endpoint_names = [r["name"] for r in text_data["results"]]
-
-                # 期待されるデリバティブ関連エンドポイント
-                expected_derivatives = ["drv-bars-daily-fut", "drv-bars-daily-opt-225"]
-
-                # 少なくとも1つのデリバティブエンドポイントが検索結果に含まれることを確認
-                found_count = sum(
-                    1 for ep in expected_derivatives if ep in endpoint_names
-                )
-                assert (
-                    found_count >= 1
-                ), f"Expected at least 1 derivatives endpoint, found {found_count}"
+        assert report["calls"] == clients * calls_per_client
+        assert set(report["tools"]) == {name for name, _ in STRESS_CALLS}
+        for name, measured in report["tools"].items():
+            assert measured["errors"] == 0, name
+            latency = measured["latency_ms"]
+            assert latency["p50"] <= latency["p95"] <= latency["p99"] <= latency["max"]
+
+        output = request.config.getoption("--stress-report")
+        text = json.dumps(report, ensure_ascii=False, indent=2)
+        if output:
+            Path(output).write_text(text, encoding="utf-8")
+        print(text)
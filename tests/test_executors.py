@@ -0,0 +1,210 @@
+"""ツールハンドラのスレッドプール実行のテスト"""
+
+import asyncio
+import json
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from j_quants_doc_mcp import executors
+from j_quants_doc_mcp.executors import (
+    CODEGEN_POOL,
+    DEFAULT_POOL_SIZES,
+    QUERY_POOL,
+    configure_pools,
+    get_pool_sizes,
+    run_in_pool,
+)
+from j_quants_doc_mcp.resources import store
+from j_quants_doc_mcp.resources.snapshot import DataSnapshot
+from j_quants_doc_mcp.resources.store import get_snapshot, pin_snapshot
+from j_quants_doc_mcp.server import mcp
+
+
+@pytest.fixture(autouse=True)
+def reset_pools():
+    """テストごとにプールを既定のスレッド数に戻す"""
+    yield
+    configure_pools(**DEFAULT_POOL_SIZES)
+    executors.shutdown_pools()
+
+
+def _tool(name: str):
+    """MCPに登録されたツールを取得する"""
+    return mcp._tool_manager.get_tool(name)
+
+
+class TestConfigurePools:
+    """configure_pools のテストクラス"""
+
+    def test_default_sizes(self):
+        """既定のスレッド数が設定されていることを確認"""
+        assert get_pool_sizes() == DEFAULT_POOL_SIZES
+
+    def test_resize(self):
+        """スレッド数を変更するとプールが作り直されることを確認"""
+
+        async def thread_names():
+            return await asyncio.gather(
+                *(
+                    run_in_pool(QUERY_POOL, lambda: threading.current_thread().name)
+                    for _ in range(4)
+                )
+            )
+
+        asyncio.run(thread_names())
+        configure_pools(query=1)
+
+        assert get_pool_sizes()[QUERY_POOL] == 1
+        assert len(set(asyncio.run(thread_names()))) == 1
+
+    @pytest.mark.parametrize("sizes", [{"query": 0}, {"render": 2}])
+    def test_invalid_sizes(self, sizes):
+        """不正なプール名やスレッド数の場合は ValueError になることを確認"""
+        with pytest.raises(ValueError):
+            configure_pools(**sizes)
+
+        assert get_pool_sizes() == DEFAULT_POOL_SIZES
+
+
+class TestRunInPool:
+    """run_in_pool のテストクラス"""
+
+    def test_runs_outside_event_loop_thread(self):
+        """関数がイベントループとは別のスレッドで実行されることを確認"""
+
+        async def run():
+            return threading.current_thread(), await run_in_pool(
+                CODEGEN_POOL, threading.current_thread
+            )
+
+        loop_thread, pool_thread = asyncio.run(run())
+
+        assert pool_thread is not loop_thread
+        assert pool_thread.name.startswith("codegen-pool")
+
+    def test_propagates_context(self):
+        """呼び出し元で固定したスナップショットがスレッドでも参照されることを確認"""
+
+        async def run():
+            with pin_snapshot() as snapshot:
+                return snapshot, await run_in_pool(QUERY_POOL, get_snapshot)
+
+        pinned, seen = asyncio.run(run())
+
+        assert seen is pinned
+
+    def test_bounded_concurrency(self):
+        """同時に実行される呼び出しがスレッド数以下に制限されることを確認"""
+        configure_pools(codegen=2)
+        lock = threading.Lock()
+        running = 0
+        peak = 0
+
+        def work():
+            nonlocal running, peak
+            with lock:
+                running += 1
+                peak = max(peak, running)
+            threading.Event().wait(0.02)
+            with lock:
+                running -= 1
+
+        async def run():
+            await asyncio.gather(*(run_in_pool(CODEGEN_POOL, work) for _ in range(8)))
+
+        asyncio.run(run())
+
+        assert peak == 2
+
+
+class TestOffloadedTools:
+    """スレッドプールで実行するツールのテストクラス"""
+
+    @pytest.mark.parametrize(
+        "name",
+        [
+            "search_endpoints",
+            "describe_endpoint",
+            "describe_endpoints",
+            "generate_sample_code",
+            "generate_sample_codes",
+            "generate_client_code",
+            "answer_question",
+        ],
+    )
+    def test_registered_as_async(self, name):
+        """CPU負荷の高いツールが非同期ハンドラとして登録されていることを確認"""
+        tool = _tool(name)
+
+        assert tool.is_async
+        assert tool.description == tool.fn.__wrapped__.__doc__
+
+    def test_schema_matches_sync_function(self):
+        """非同期ハンドラの入力スキーマが元の関数の引数と一致することを確認"""
+        schema = _tool("generate_sample_code").parameters
+
+        assert schema["required"] == ["endpoint_name"]
+        assert set(schema["properties"]) == {
+            "endpoint_name",
+            "language",
+            "params",
+            "auto_resolve",
+        }
+
+    def test_slow_codegen_does_not_block_search(self):
+        """コード生成の実行中も、検索が待たされずに完了することを確認"""
+        release = threading.Event()
+
+        def slow_render(*args, **kwargs):
+            release.wait(timeout=5)
+            return "# code"
+
+        async def run():
+            with patch(
+                "j_quants_doc_mcp.server.generate_sample_code_impl", slow_render
+            ):
+                codegen = asyncio.create_task(
+                    mcp.call_tool(
+                        "generate_sample_code", {"endpoint_name": "eq-master"}
+                    )
+                )
+                await asyncio.sleep(0.05)
+                search = await asyncio.wait_for(
+                    mcp.call_tool("search_endpoints", {"keyword": "equities"}),
+                    timeout=2,
+                )
+                codegen_done = codegen.done()
+                release.set()
+                await codegen
+            return search, codegen_done
+
+        (content, _), codegen_done = asyncio.run(run())
+
+        assert not codegen_done
+        assert json.loads(content[0].text)["count"] > 0
+
+    def test_snapshot_is_pinned_per_call(self):
+        """呼び出しの途中で再読み込みされても、応答全体が同じスナップショットを参照することを確認"""
+        original = get_snapshot()
+        replacement = DataSnapshot.from_documents(endpoints={"endpoints": []})
+
+        def reload_then_not_found(endpoint_name):
+            store.set_snapshot(replacement)
+
+        try:
+            with patch(
+                "j_quants_doc_mcp.server.describe_endpoint_impl",
+                reload_then_not_found,
+            ):
+                content, _ = asyncio.run(
+                    mcp.call_tool(
+                        "describe_endpoint", {"endpoint_name": "eq-bar-daily"}
+                    )
+                )
+        finally:
+            store.set_snapshot(original)
+
+        candidates = json.loads(content[0].text)["details"]["candidates"]
+        assert candidates[0]["name"] == "eq-bars-daily"
@@ -0,0 +1,85 @@
+"""起動時のインポート時間のテスト
+
+stdio ではセッションごとにサーバを起動するため、起動時間の悪化を
+`python -X importtime` の出力から検出する。
+"""
+
+import subprocess
+import sys
+
+# サーバモジュールのインポート時間の上限(ミリ秒、FastMCP 本体の読み込みは除く)
+SERVER_IMPORT_BUDGET_MS = 250
+
+# 計測を繰り返す回数(最小値で判定し、実行環境の揺らぎの影響を抑える)
+IMPORT_TIME_RUNS = 3
+
+
+def _import_times(statement: str) -> dict[str, int]:
+    """statement を新しいプロセスで実行し、モジュール名から累積インポート時間(マイクロ秒)への辞書を返す"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    # 形式: "import time: <自身の時間> | <累積時間> | <インデント><モジュール名>"
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative_us, name = line.removeprefix("import time:").split("|")
+        if cumulative_us.strip().isdigit():
+            times[name.strip()] = int(cumulative_us)
+    return times
+
+
+class TestImportTime:
+    """インポート時間と遅延インポートのテストクラス"""
+
+    def test_cli_does_not_import_server_dependencies(self):
+        """CLIモジュールのインポートでMCP・pydantic・Jinja2を読み込まないことを確認"""
+        modules = _import_times("import j_quants_doc_mcp.cli")
+
+        assert "j_quants_doc_mcp.cli" in modules
+        assert not {"mcp", "pydantic", "jinja2"} & modules.keys()
+
+    def test_server_defers_jinja2_and_workers(self):
+        """サーバモジュールのインポートでJinja2と複数ワーカー用のモジュールを読み込まないことを確認"""
+        modules = _import_times("import j_quants_doc_mcp.server")
+
+        assert "j_quants_doc_mcp.server" in modules
+        assert "jinja2" not in modules
+        assert "j_quants_doc_mcp.workers" not in modules
+
+    def test_server_import_within_budget(self):
+        """サーバモジュールのインポート時間が上限以内であることを確認"""
+        elapsed_ms = min(
+            _import_times("import mcp.server.fastmcp; import j_quants_doc_mcp.server")[
+                "j_quants_doc_mcp.server"
+            ]
+            / 1000
+            for _ in range(IMPORT_TIME_RUNS)
+        )
+
+        assert elapsed_ms < SERVER_IMPORT_BUDGET_MS, (
+            f"j_quants_doc_mcp.server のインポートに {elapsed_ms:.0f}ms かかりました"
+            f"(上限 {SERVER_IMPORT_BUDGET_MS}ms)"
+        )
+
+    def test_server_import_leaves_logging_unconfigured(self):
+        """サーバモジュールのインポートでルートロガーを設定しないことを確認"""
+        result = subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                (
+                    "import logging, j_quants_doc_mcp.server; "
+                    "print(len(logging.getLogger().handlers))"
+                ),
+            ],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+
+        assert result.stdout.strip() == "0"
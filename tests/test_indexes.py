@@ -0,0 +1,242 @@
+"""検索インデックスのユニットテスト"""
+
+from j_quants_doc_mcp.indexes.aho_corasick import AhoCorasick
+from j_quants_doc_mcp.indexes.faq import FaqIndex
+from j_quants_doc_mcp.indexes.fuzzy import (
+    FuzzyIndex,
+    canonicalize,
+    levenshtein,
+    similarity,
+)
+from j_quants_doc_mcp.indexes.substring import SubstringIndex
+from j_quants_doc_mcp.indexes.text import normalize, tokenize
+
+
+class TestText:
+    """テキスト正規化・トークン化のテストクラス"""
+
+    def test_normalize(self):
+        """全角英数字と大文字が正規化されることを確認"""
+        assert normalize("ＡＰＩキー　Token") == "apiキー token"
+
+    def test_tokenize_mixed_text(self):
+        """ASCII単語と日本語n-gramに分割されることを確認"""
+        tokens = tokenize("株価 API")
+
+        assert "api" in tokens
+        assert "株価" in tokens
+
+
+class TestAhoCorasick:
+    """AhoCorasick のテストクラス"""
+
+    def test_overlapping_patterns(self):
+        """重なり合うパターンを全て検出できることを確認"""
+        matcher = AhoCorasick(["he", "she", "his", "hers"])
+
+        found = {matcher.patterns[i] for i in matcher.find("ushers")}
+        assert found == {"he", "she", "hers"}
+
+    def test_match_positions(self):
+        """出現位置が正しく返ることを確認"""
+        matcher = AhoCorasick(["トークン", "リフレッシュトークン"])
+
+        matches = sorted(matcher.iter_matches("リフレッシュトークンの期限"))
+        found = [(end, matcher.patterns[i]) for end, i in matches]
+        assert (9, "トークン") in found
+        assert (9, "リフレッシュトークン") in found
+
+    def test_duplicate_and_empty_patterns(self):
+        """重複と空文字列のパターンが無視されることを確認"""
+        matcher = AhoCorasick(["api", "", "api", "key"])
+
+        assert len(matcher) == 2
+        assert matcher.pattern_id("api") == 0
+        assert matcher.pattern_id("") is None
+
+    def test_no_match(self):
+        """一致しない場合は空集合が返ることを確認"""
+        matcher = AhoCorasick(["認証"])
+
+        assert matcher.find("レート制限") == set()
+
+
+class TestSubstringIndex:
+    """SubstringIndex のテストクラス"""
+
+    def test_find(self):
+        """部分文字列を含む文書だけが返ることを確認"""
+        index = SubstringIndex([("eq-master", "/equities/master"), ("fin-summary",)])
+
+        assert index.find("master") == {0}
+        assert index.find("sum") == {1}
+        assert index.find("e") == {0}
+        assert index.find("nothing") == set()
+
+
+# FuzzyIndex のテスト用エンドポイント
+FUZZY_ENDPOINTS = [
+    {
+        "name": "eq-bars-daily",
+        "path": "/equities/bars/daily",
+        "path_old": "/prices/daily_quotes",
+        "name_en": "Stock Prices (OHLC)",
+    },
+    {
+        "name": "eq-bars-daily-am",
+        "path": "/equities/bars/daily/am",
+        "path_old": "/prices/prices_am",
+        "name_en": "Morning Session Stock Prices (OHLC)",
+    },
+    {
+        "name": "fin-summary",
+        "path": "/fins/summary",
+        "path_old": "/fins/statements",
+        "name_en": "Financial Data",
+    },
+    {"name": "mkt-short-ratio", "path": "/markets/short-ratio"},
+    {"name": "mkt-short-sale", "path": "/markets/short-sale-report"},
+]
+
+
+class TestFuzzyIndex:
+    """FuzzyIndex のテストクラス"""
+
+    def test_canonicalize(self):
+        """区切り文字・大文字・全角が統一されることを確認"""
+        assert canonicalize("/fins/summary") == "fins-summary"
+        assert canonicalize("Stock Prices (OHLC)") == "stock-prices-ohlc"
+        assert canonicalize("ＥＱ_Master") == "eq-master"
+
+    def test_levenshtein_and_similarity(self):
+        """編集距離と類似度を確認"""
+        assert levenshtein("kitten", "sitting") == 3
+        assert levenshtein("", "abc") == 3
+        assert similarity("abc", "abc") == 1.0
+        assert similarity("eq-bar-daily", "eq-bars-daily") == 1 - 1 / 13
+
+    def test_suggest_typo(self):
+        """綴り違いに対して最も似たエンドポイントが先頭になることを確認"""
+        index = FuzzyIndex(FUZZY_ENDPOINTS)
+
+        candidates = index.suggest("eq-bar-daily")
+
+        assert [name for name, _ in candidates] == ["eq-bars-daily", "eq-bars-daily-am"]
+        assert candidates[0][1] > candidates[1][1]
+
+    def test_suggest_matches_path_and_english_name(self):
+        """パス・旧パス・英語名でも候補が見つかることを確認"""
+        index = FuzzyIndex(FUZZY_ENDPOINTS)
+
+        assert index.suggest("fins-summary")[0] == ("fin-summary", 1.0)
+        assert index.suggest("prices/daily_quote")[0][0] == "eq-bars-daily"
+        assert index.suggest("financial data")[0] == ("fin-summary", 1.0)
+
+    def test_suggest_limit_and_no_match(self):
+        """件数の上限と、似たものがない場合に空になることを確認"""
+        index = FuzzyIndex(FUZZY_ENDPOINTS)
+
+        assert len(index.suggest("eq-bars", limit=1)) == 1
+        assert index.suggest("zzzz") == []
+        assert index.suggest("---") == []
+
+    def test_resolve(self):
+        """最上位の候補が明確な場合だけ補正されることを確認"""
+        index = FuzzyIndex(FUZZY_ENDPOINTS)
+
+        assert index.resolve("eq-bar-daily")[0] == "eq-bars-daily"
+        assert index.resolve("fins-summary") == ("fin-summary", 1.0)
+        # 2つの候補が同程度に似ている
+        assert index.resolve("mkt-short") is None
+        # 似ている候補がない
+        assert index.resolve("zzzz") is None
+
+
+class TestFaqIndex:
+    """FaqIndex のテストクラス"""
+
+    def test_keyword_score_and_order(self):
+        """一致キーワード数でスコアが付き、FAQ内の順序が保たれることを確認"""
+        index = FaqIndex(
+            [
+                {"question": "Q1", "keywords": ["認証", "トークン"]},
+                {"question": "Q2", "keywords": ["トークン", "期限", "認証"]},
+            ]
+        )
+
+        matches = index.match("認証トークンの期限")
+
+        assert [m["faq"]["question"] for m in matches] == ["Q2", "Q1"]
+        assert matches[0]["score"] == 30
+        assert matches[0]["matched_keywords"] == ["トークン", "期限", "認証"]
+
+    def test_question_substring_match(self):
+        """質問文がFAQ質問文に含まれる場合は最高スコアになることを確認"""
+        index = FaqIndex(
+            [
+                {"question": "レート制限はありますか？", "keywords": ["制限"]},
+                {"question": "APIキーの取得方法", "keywords": ["レート"]},
+            ]
+        )
+
+        matches = index.match("レート制限")
+
+        assert matches[0]["faq"]["question"] == "レート制限はありますか？"
+        assert matches[0]["score"] >= 100
+        assert "matched_keywords" not in matches[0]
+
+    def test_bm25_match_without_keywords(self):
+        """キーワードが一致しなくても質問文・回答の本文で見つかることを確認"""
+        index = FaqIndex(
+            [
+                {
+                    "question": "APIキーの取得方法",
+                    "answer": "ダッシュボードから取得します。",
+                },
+                {"question": "退会方法", "answer": "設定画面から退会できます。"},
+            ]
+        )
+
+        matches = index.match("設定画面で退会したい")
+
+        assert [m["faq"]["question"] for m in matches] == ["退会方法"]
+        assert 0 < matches[0]["score"] <= 10
+        assert "matched_keywords" not in matches[0]
+
+    def test_bm25_breaks_keyword_ties(self):
+        """キーワード数が同じ場合は本文の関連度が高いFAQが上位になることを確認"""
+        index = FaqIndex(
+            [
+                {
+                    "question": "料金について",
+                    "answer": "有料です。",
+                    "keywords": ["プラン"],
+                },
+                {
+                    "question": "プランの変更",
+                    "answer": "プラン変更はマイページから行えます。",
+                    "keywords": ["プラン"],
+                },
+            ]
+        )
+
+        matches = index.match("プランの変更方法")
+
+        assert matches[0]["faq"]["question"] == "プランの変更"
+        assert matches[0]["score"] > matches[1]["score"] >= 10
+
+    def test_particles_do_not_match(self):
+        """助詞などひらがなだけの一致では候補にならないことを確認"""
+        index = FaqIndex([{"question": "料金はいくらですか", "answer": "無料です。"}])
+
+        assert index.match("どのようにするのですか") == []
+
+    def test_limit(self):
+        """limit で件数を制限できることを確認"""
+        index = FaqIndex(
+            [{"question": f"質問{i}", "keywords": ["共通"]} for i in range(10)]
+        )
+
+        matches = index.match("共通", limit=3)
+
+        assert [m["faq"]["question"] for m in matches] == ["質問0", "質問1", "質問2"]
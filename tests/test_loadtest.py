@@ -0,0 +1,181 @@
+"""負荷生成(loadtest)のテスト"""
+
+import asyncio
+import json
+from contextlib import asynccontextmanager
+from unittest.mock import patch
+
+import pytest
+
+from j_quants_doc_mcp import server
+from j_quants_doc_mcp.cli import main
+from j_quants_doc_mcp.loadtest import (
+    DEFAULT_MIX,
+    LOAD_TESTED_TOOLS,
+    build_workloads,
+    format_report,
+    parse_mix,
+    run_load,
+)
+from j_quants_doc_mcp.resources.store import get_snapshot
+from tests.mcp_harness import memory_session
+
+
+class TestParseMix:
+    """parse_mix のテストクラス"""
+
+    def test_weights(self):
+        """ツール名と比率を解析し、比率の省略時は1になることを確認"""
+        assert parse_mix("search_endpoints=3, get_pattern") == {
+            "search_endpoints": 3.0,
+            "get_pattern": 1.0,
+        }
+
+    @pytest.mark.parametrize(
+        "spec", ["unknown_tool=1", "search_endpoints=abc", "search_endpoints=0"]
+    )
+    def test_invalid(self, spec):
+        """未知のツール名や不正な比率で ValueError になることを確認"""
+        with pytest.raises(ValueError):
+            parse_mix(spec)
+
+
+class TestBuildWorkloads:
+    """build_workloads のテストクラス"""
+
+    def test_sessions_and_calls(self):
+        """セッション数と呼び出し回数の通りに、比率を指定したツールだけが選ばれることを確認"""
+        mix = {"describe_endpoint": 1.0, "lookup_property": 1.0}
+        workloads = build_workloads(get_snapshot(), mix, 3, 10)
+
+        assert len(workloads) == 3
+        assert all(len(calls) == 10 for calls in workloads)
+        assert {name for calls in workloads for name, _ in calls} <= set(mix)
+
+    def test_deterministic(self):
+        """同じシードなら同じ呼び出し列になることを確認"""
+        snapshot = get_snapshot()
+
+        assert build_workloads(snapshot, DEFAULT_MIX, 2, 20, seed=1) == (
+            build_workloads(snapshot, DEFAULT_MIX, 2, 20, seed=1)
+        )
+
+    def test_arguments_are_valid(self):
+        """作成した引数でツールを呼び出してもエラーにならないことを確認"""
+        workloads = build_workloads(get_snapshot(), DEFAULT_MIX, 4, 50)
+
+        called = set()
+        for calls in workloads:
+            for name, arguments in calls:
+                result = getattr(server, name)(**arguments)
+                assert not (isinstance(result, dict) and result.get("error")), (
+                    name,
+                    arguments,
+                )
+                called.add(name)
+        assert called == set(LOAD_TESTED_TOOLS)
+
+
+class TestRunLoad:
+    """run_load のテストクラス"""
+
+    async def test_report(self):
+        """ツールごとの呼び出し回数・スループット・処理時間を集計できることを確認"""
+        workloads = build_workloads(get_snapshot(), DEFAULT_MIX, 3, 20)
+
+        report = await run_load(memory_session, workloads)
+
+        assert report["sessions"] == 3
+        assert report["calls"] == 60
+        assert report["errors"] == 0
+        assert sum(tool["calls"] for tool in report["tools"].values()) == 60
+        for measured in report["tools"].values():
+            assert measured["throughput_per_second"] > 0
+            latency = measured["latency_ms"]
+            assert latency["p50"] <= latency["p95"] <= latency["p99"] <= latency["max"]
+        for name in report["tools"]:
+            assert name in format_report(report)
+
+    async def test_errors_are_counted(self):
+        """エラーを返した呼び出しがツールごとに数えられることを確認"""
+        workloads = [[("describe_endpoint", {"endpoint_name": "no-such-endpoint"})]]
+
+        report = await run_load(memory_session, workloads)
+
+        assert report["errors"] == 1
+        assert report["tools"]["describe_endpoint"]["errors"] == 1
+
+    async def test_failed_session_cancels_others(self):
+        """1つのセッションが失敗したとき、残りのセッションを終了させて例外を送出することを確認"""
+        closed: list[str] = []
+
+        class FakeSession:
+            async def call_tool(self, name, arguments):
+                if name == "search_endpoints":
+                    raise RuntimeError("session failed")
+                await asyncio.Event().wait()
+
+        @asynccontextmanager
+        async def connect():
+            try:
+                yield FakeSession()
+            finally:
+                closed.append("closed")
+
+        workloads = [
+            [("search_endpoints", {"keyword": "株価"})],
+            [("describe_endpoint", {"endpoint_name": "eq-bars-daily"})],
+        ]
+
+        with pytest.raises(RuntimeError, match="session failed"):
+            await asyncio.wait_for(run_load(connect, workloads), timeout=5)
+
+        assert closed == ["closed", "closed"]
+
+
+class TestLoadTestCommand:
+    """loadtest コマンドのテストクラス"""
+
+    @pytest.mark.parametrize(
+        "argv",
+        [
+            ["--sessions", "0"],
+            ["--calls", "x"],
+            ["--seed", "-1"],
+            ["--mix", "unknown_tool=1"],
+            ["--url", "http://127.0.0.1:8000/mcp", "--command", "j-quants-doc-mcp"],
+        ],
+    )
+    def test_invalid_options(self, argv, capsys):
+        """不正なオプションで終了コード1になることを確認"""
+        assert main(["loadtest", *argv]) == 1
+        assert capsys.readouterr().err
+
+    def test_stdio(self, tmp_path, capsys):
+        """stdio でサーバを起動して負荷をかけ、レポートを書き出せることを確認"""
+        output = tmp_path / "report.json"
+
+        argv = ["loadtest", "--sessions", "2", "--calls", "5", "--output", str(output)]
+        assert main(argv) == 0
+
+        report = json.loads(output.read_text(encoding="utf-8"))
+        assert report["calls"] == 10
+        assert report["errors"] == 0
+        assert "req/s" in capsys.readouterr().out
+
+    def test_connection_error(self, capsys):
+        """サーバに接続できない場合に、元の例外を表示して終了コード1になることを確認"""
+        argv = ["loadtest", "--command", "no-such-command-for-loadtest", "--calls", "1"]
+
+        assert main(argv) == 1
+        assert "FileNotFoundError" in capsys.readouterr().err
+
+    def test_unexpected_error_is_raised(self):
+        """接続の失敗以外の例外はそのまま送出することを確認"""
+        with (
+            patch(
+                "j_quants_doc_mcp.loadtest.run_load", side_effect=RuntimeError("bug")
+            ),
+            pytest.raises(RuntimeError, match="bug"),
+        ):
+            main(["loadtest", "--sessions", "1", "--calls", "1"])
@@ -1,5 +1,7 @@
 """Tests for lookup_property tool."""
 
+import pytest
+
 from j_quants_doc_mcp.tools.lookup import lookup_property
 
 
@@ -170,3 +172,51 @@ def test_lookup_property_with_endpoint_name_response_field():
     assert result["endpoint_name"] == "mkt-cal"
     assert result["property_exists"] is True
     assert result["reference_data"]["name"] == "holiday_division"
+
+
+# プロパティインデックスのテスト
+
+
+def test_lookup_property_lists_all_endpoints():
+    """プロパティを含む全エンドポイントが返ることを確認"""
+    result = lookup_property("Code")
+
+    assert result["property_exists"] is True
+    endpoint_names = {item["endpoint"] for item in result["endpoints"]}
+    assert {"eq-master", "eq-bars-daily", "fin-summary"} <= endpoint_names
+    for item in result["endpoints"]:
+        assert item["direction"] in ["request", "response"]
+
+
+def test_lookup_property_lists_both_directions():
+    """リクエストとレスポンスの両方に現れる場合、両方の方向が返ることを確認"""
+    result = lookup_property("code", endpoint_name="eq-master")
+
+    directions = {
+        item["direction"]
+        for item in result["endpoints"]
+        if item["endpoint"] == "eq-master"
+    }
+    assert directions == {"request", "response"}
+
+
+def test_lookup_property_with_endpoint_path():
+    """endpoint_nameにパスを指定しても検証できることを確認"""
+    result = lookup_property("HolDiv", endpoint_name="/markets/calendar")
+
+    assert result["found"] is True
+    assert result["endpoint_name"] == "/markets/calendar"
+    assert result["reference_data"]["name"] == "holiday_division"
+
+
+def test_lookup_property_result_is_not_shared():
+    """戻り値の参照データを書き換えても、次の呼び出しに影響しないことを確認"""
+    first = lookup_property("Mkt")
+    first["reference_data"]["name"] = "changed"
+    with pytest.raises(TypeError):
+        first["reference_data"]["values"].clear()
+
+    second = lookup_property("Mkt")
+
+    assert second["reference_data"]["name"] == "market_codes"
+    assert len(second["reference_data"]["values"]) > 0
@@ -0,0 +1,190 @@
+"""ツールごとのメトリクス集計のテスト"""
+
+import asyncio
+import json
+import os
+import threading
+from unittest.mock import patch
+
+import pytest
+from starlette.testclient import TestClient
+
+from j_quants_doc_mcp.metrics import (
+    LATENCY_BUCKETS,
+    Histogram,
+    get_metrics,
+    record_call,
+    render_prometheus,
+    reset_metrics,
+)
+from j_quants_doc_mcp.server import mcp
+
+
+@pytest.fixture(autouse=True)
+def clean_metrics():
+    """テストごとに集計結果を破棄する"""
+    reset_metrics()
+    yield
+    reset_metrics()
+
+
+def _call_tool(name: str, arguments: dict) -> dict:
+    """MCP経由でツールを呼び出し、結果のJSONを返す"""
+    content, _ = asyncio.run(mcp.call_tool(name, arguments))
+    return json.loads(content[0].text)
+
+
+class TestHistogram:
+    """Histogram のテストクラス"""
+
+    def test_empty(self):
+        """記録がない場合はパーセンタイルがNoneになることを確認"""
+        histogram = Histogram(LATENCY_BUCKETS)
+
+        assert histogram.quantile(0.5) is None
+        assert histogram.summary() == {
+            "p50": None,
+            "p95": None,
+            "p99": None,
+            "mean": None,
+            "max": None,
+        }
+
+    def test_quantiles(self):
+        """パーセンタイルが値の属するバケット内で推定されることを確認"""
+        histogram = Histogram((1, 2, 4, 8))
+        for value in [0.5] * 90 + [3] * 9 + [6]:
+            histogram.observe(value)
+
+        assert 0 < histogram.quantile(0.5) <= 1
+        assert 2 < histogram.quantile(0.95) <= 4
+        assert 2 < histogram.quantile(0.99) <= 4
+        assert histogram.quantile(1.0) == 6
+        assert histogram.count == 100
+        assert histogram.max == 6
+
+    def test_overflow_bucket_bounded_by_max(self):
+        """上限を超えた値のパーセンタイルが最大値を超えないことを確認"""
+        histogram = Histogram((1,))
+        histogram.observe(50)
+
+        assert histogram.counts == [0, 1]
+        assert histogram.quantile(0.99) <= 50
+
+
+class TestRecordCall:
+    """record_call / get_metrics のテストクラス"""
+
+    def test_counts_calls_errors_and_payload(self):
+        """呼び出し回数、エラー種別、レスポンスサイズが集計されることを確認"""
+        record_call("describe_endpoint", 0.002, result={"name": "eq-master"})
+        record_call(
+            "describe_endpoint",
+            0.001,
+            result={"error": True, "error_type": "NotFoundError"},
+        )
+        record_call("describe_endpoint", 0.003, error_type="RuntimeError")
+
+        tool = get_metrics()["tools"]["describe_endpoint"]
+
+        assert tool["calls"] == 3
+        assert tool["errors"] == 2
+        assert tool["error_types"] == {"NotFoundError": 1, "RuntimeError": 1}
+        assert tool["latency_ms"]["max"] == 3.0
+        assert tool["payload_bytes"]["total"] == len(
+            json.dumps({"name": "eq-master"})
+        ) + len(json.dumps({"error": True, "error_type": "NotFoundError"}))
+
+    def test_string_payload_size_in_bytes(self):
+        """文字列の戻り値はUTF-8のバイト数で集計されることを確認"""
+        record_call("generate_sample_code", 0.01, result="# 日本語")
+
+        tool = get_metrics()["tools"]["generate_sample_code"]
+
+        assert tool["payload_bytes"]["total"] == len("# 日本語".encode())
+        assert tool["errors"] == 0
+
+
+class TestToolInstrumentation:
+    """MCP経由の呼び出しが集計されることのテストクラス"""
+
+    def test_tool_calls_are_recorded(self):
+        """成功とエラーの呼び出しがツールごとに記録されることを確認"""
+        _call_tool("search_endpoints", {"keyword": "equities"})
+        _call_tool("describe_endpoint", {"endpoint_name": "eq-master"})
+        _call_tool("describe_endpoint", {"endpoint_name": "no-such-endpoint"})
+        _call_tool("describe_endpoint", {"endpoint_name": ""})
+
+        result = _call_tool("metrics", {})
+
+        describe = result["tools"]["describe_endpoint"]
+        assert describe["calls"] == 3
+        assert describe["error_types"] == {"NotFoundError": 1, "ValidationError": 1}
+        assert describe["latency_ms"]["p50"] is not None
+        assert describe["payload_bytes"]["max"] > 0
+        assert result["tools"]["search_endpoints"]["calls"] == 1
+        assert result["tools"]["search_endpoints"]["errors"] == 0
+
+    def test_payload_size_computed_in_pool_thread(self):
+        """プールで実行するツールのレスポンスサイズは、イベントループ外で計算されることを確認"""
+        from j_quants_doc_mcp import server
+
+        threads = []
+
+        def spy(result):
+            threads.append(threading.current_thread())
+            return server_payload_size(result)
+
+        server_payload_size = server.payload_size
+        with patch.object(server, "payload_size", spy):
+            _call_tool("describe_endpoint", {"endpoint_name": "eq-master"})
+
+        assert threads
+        assert threading.main_thread() not in threads
+        assert get_metrics()["tools"]["describe_endpoint"]["payload_bytes"]["max"] > 0
+
+    def test_direct_calls_are_not_recorded(self):
+        """モジュール内からの直接呼び出しは集計されないことを確認"""
+        from j_quants_doc_mcp.server import describe_endpoint
+
+        describe_endpoint("eq-master")
+
+        assert get_metrics()["tools"] == {}
+
+
+class TestPrometheusEndpoint:
+    """Prometheus 形式の出力のテストクラス"""
+
+    def test_render_prometheus(self):
+        """カウンタとヒストグラムが Prometheus のテキスト形式で出力されることを確認"""
+        record_call("answer_question", 0.002, result={"matched": True})
+        record_call("answer_question", 20.0, error_type="TimeoutError")
+
+        labels = f'pid="{os.getpid()}",tool="answer_question"'
+        lines = render_prometheus().splitlines()
+
+        assert f"jquants_doc_mcp_tool_calls_total{{{labels}}} 2" in lines
+        assert (
+            f'jquants_doc_mcp_tool_errors_total{{{labels},error_type="TimeoutError"}} 1'
+        ) in lines
+        assert (
+            f'jquants_doc_mcp_tool_duration_seconds_bucket{{{labels},le="0.0025"}} 1'
+        ) in lines
+        assert (
+            f'jquants_doc_mcp_tool_duration_seconds_bucket{{{labels},le="+Inf"}} 2'
+        ) in lines
+        assert f"jquants_doc_mcp_tool_response_bytes_count{{{labels}}} 1" in lines
+        assert "# TYPE jquants_doc_mcp_tool_duration_seconds histogram" in lines
+
+    def test_metrics_route(self):
+        """HTTPアプリの /metrics で集計結果を取得できることを確認"""
+        _call_tool("describe_endpoint", {"endpoint_name": "eq-master"})
+
+        response = TestClient(mcp.streamable_http_app()).get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert (
+            f'jquants_doc_mcp_tool_calls_total{{pid="{os.getpid()}",'
+            'tool="describe_endpoint"} 1' in response.text
+        )
@@ -5,6 +5,7 @@ from pathlib import Path
 from unittest.mock import patch
 
 import pytest
+from j_quants_doc_mcp.resources.snapshot import DataSnapshot
 from j_quants_doc_mcp.server import answer_question
 
 
@@ -20,10 +21,10 @@ def mock_faq_data():
 class TestAnswerQuestionSuccess:
     """answer_question の正常系テスト"""
 
-    @patch("j_quants_doc_mcp.tools.qa.load_faqs")
+    @patch("j_quants_doc_mcp.tools.qa.get_snapshot")
     def test_match_by_keyword(self, mock_load, mock_faq_data):
         """キーワードでマッチすることを確認"""
-        mock_load.return_value = mock_faq_data
+        mock_load.return_value = DataSnapshot.from_documents(faqs=mock_faq_data)
 
         result = answer_question("APIキーの有効期限について")
 
@@ -33,10 +34,10 @@ class TestAnswerQuestionSuccess:
         # 最初の回答がAPIキーに関するものであることを確認
         assert "APIキー" in result["answers"][0]["answer"]
 
-    @patch("j_quants_doc_mcp.tools.qa.load_faqs")
+    @patch("j_quants_doc_mcp.tools.qa.get_snapshot")
     def test_match_multiple_keywords(self, mock_load, mock_faq_data):
         """複数のキーワードでマッチすることを確認"""
-        mock_load.return_value = mock_faq_data
+        mock_load.return_value = DataSnapshot.from_documents(faqs=mock_faq_data)
 
         result = answer_question("レート制限")
 
@@ -50,19 +51,19 @@ class TestAnswerQuestionSuccess:
             or "リクエスト" in result["answers"][0]["answer"]
         )
 
-    @patch("j_quants_doc_mcp.tools.qa.load_faqs")
+    @patch("j_quants_doc_mcp.tools.qa.get_snapshot")
     def test_case_insensitive_match(self, mock_load, mock_faq_data):
         """大文字小文字を区別せずマッチすることを確認"""
-        mock_load.return_value = mock_faq_data
+        mock_load.return_value = DataSnapshot.from_documents(faqs=mock_faq_data)
 
         result = answer_question("トークン")
 
         assert result["matched"] is True
 
-    @patch("j_quants_doc_mcp.tools.qa.load_faqs")
+    @patch("j_quants_doc_mcp.tools.qa.get_snapshot")
     def test_answer_structure(self, mock_load, mock_faq_data):
         """回答の構造が正しいことを確認"""
-        mock_load.return_value = mock_faq_data
+        mock_load.return_value = DataSnapshot.from_documents(faqs=mock_faq_data)
 
         result = answer_question("トークン")
 
@@ -77,10 +78,10 @@ class TestAnswerQuestionSuccess:
             assert "answer" in answer
             assert "related_endpoints" in answer
 
-    @patch("j_quants_doc_mcp.tools.qa.load_faqs")
+    @patch("j_quants_doc_mcp.tools.qa.get_snapshot")
     def test_no_match_returns_suggestion(self, mock_load, mock_faq_data):
         """マッチしない場合、提案が返ることを確認"""
-        mock_load.return_value = mock_faq_data
+        mock_load.return_value = DataSnapshot.from_documents(faqs=mock_faq_data)
 
         result = answer_question("全く関係ない質問")
 
@@ -89,10 +90,10 @@ class TestAnswerQuestionSuccess:
         assert "available_categories" in result
         assert len(result["available_categories"]) > 0
 
-    @patch("j_quants_doc_mcp.tools.qa.load_faqs")
+    @patch("j_quants_doc_mcp.tools.qa.get_snapshot")
     def test_returns_top_3_matches(self, mock_load, mock_faq_data):
         """最大3件の回答が返ることを確認"""
-        mock_load.return_value = mock_faq_data
+        mock_load.return_value = DataSnapshot.from_documents(faqs=mock_faq_data)
 
         result = answer_question("データ")
 
@@ -100,10 +101,10 @@ class TestAnswerQuestionSuccess:
             # マッチした場合、最大3件まで
             assert len(result["answers"]) <= 3
 
-    @patch("j_quants_doc_mcp.tools.qa.load_faqs")
+    @patch("j_quants_doc_mcp.tools.qa.get_snapshot")
     def test_matched_keywords_included(self, mock_load, mock_faq_data):
         """マッチしたキーワードが含まれることを確認"""
-        mock_load.return_value = mock_faq_data
+        mock_load.return_value = DataSnapshot.from_documents(faqs=mock_faq_data)
 
         result = answer_question("レート制限")
 
@@ -114,6 +115,37 @@ class TestAnswerQuestionSuccess:
             if "matched_keywords" in first_answer:
                 assert len(first_answer["matched_keywords"]) > 0
 
+    @patch("j_quants_doc_mcp.tools.qa.get_snapshot")
+    def test_answers_have_scores(self, mock_load, mock_faq_data):
+        """回答にスコアが含まれ、スコアの高い順に並ぶことを確認"""
+        mock_load.return_value = DataSnapshot.from_documents(faqs=mock_faq_data)
+
+        result = answer_question("APIのレート制限")
+
+        scores = [answer["score"] for answer in result["answers"]]
+        assert scores == sorted(scores, reverse=True)
+        assert result["answers"][0]["category"] == "レート制限"
+
+    @patch("j_quants_doc_mcp.tools.qa.get_snapshot")
+    def test_match_by_answer_text(self, mock_load, mock_faq_data):
+        """キーワードにない語でも回答本文から見つかることを確認"""
+        mock_load.return_value = DataSnapshot.from_documents(faqs=mock_faq_data)
+
+        result = answer_question("10年分取得したい")
+
+        assert result["matched"] is True
+        assert result["answers"][0]["category"] == "データ取得"
+
+    @patch("j_quants_doc_mcp.tools.qa.get_snapshot")
+    def test_limit(self, mock_load, mock_faq_data):
+        """limit で回答数を指定できることを確認"""
+        mock_load.return_value = DataSnapshot.from_documents(faqs=mock_faq_data)
+
+        result = answer_question("APIのレート制限と有効期限", limit=1)
+
+        assert result["count"] == 1
+        assert len(result["answers"]) == 1
+
 
 class TestAnswerQuestionError:
     """answer_question の異常系テスト"""
@@ -125,7 +157,13 @@ class TestAnswerQuestionError:
         assert "error" in result
         assert result["error_type"] == "ValidationError"
 
-    @patch("j_quants_doc_mcp.tools.qa.load_faqs")
+    def test_invalid_limit(self):
+        """limit が1未満の場合にバリデーションエラーになることを確認"""
+        result = answer_question("トークン", limit=0)
+
+        assert result["error_type"] == "ValidationError"
+
+    @patch("j_quants_doc_mcp.tools.qa.get_snapshot")
     def test_internal_error(self, mock_load):
         """内部エラーが適切にハンドリングされることを確認"""
         mock_load.side_effect = Exception("Test error")
@@ -135,10 +173,10 @@ class TestAnswerQuestionError:
         assert "error" in result
         assert result["error_type"] == "InternalError"
 
-    @patch("j_quants_doc_mcp.tools.qa.load_faqs")
+    @patch("j_quants_doc_mcp.tools.qa.get_snapshot")
     def test_empty_faq_data(self, mock_load):
         """FAQデータが空の場合の動作を確認"""
-        mock_load.return_value = {"faqs": []}
+        mock_load.return_value = DataSnapshot.from_documents(faqs={"faqs": []})
 
         result = answer_question("トークン")
 
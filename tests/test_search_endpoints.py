@@ -5,6 +5,8 @@ from pathlib import Path
 from unittest.mock import patch
 
 import pytest
+
+from j_quants_doc_mcp.resources.snapshot import DataSnapshot
 from j_quants_doc_mcp.server import search_endpoints
 
 
@@ -20,10 +22,12 @@ def mock_endpoints_data():
 class TestSearchEndpointsSuccess:
     """search_endpoints の正常系テスト"""
 
-    @patch("j_quants_doc_mcp.tools.search._load_endpoints")
+    @patch("j_quants_doc_mcp.tools.search.get_snapshot")
     def test_search_by_name(self, mock_load, mock_endpoints_data):
         """エンドポイント名で検索できることを確認"""
-        mock_load.return_value = mock_endpoints_data
+        mock_load.return_value = DataSnapshot.from_documents(
+            endpoints=mock_endpoints_data
+        )
 
         result = search_endpoints("eq-master")
 
@@ -31,10 +35,12 @@ class TestSearchEndpointsSuccess:
         assert result["results"][0]["name"] == "eq-master"
         assert result["results"][0]["path"] == "/equities/master"
 
-    @patch("j_quants_doc_mcp.tools.search._load_endpoints")
+    @patch("j_quants_doc_mcp.tools.search.get_snapshot")
     def test_search_by_path(self, mock_load, mock_endpoints_data):
         """パスで検索できることを確認"""
-        mock_load.return_value = mock_endpoints_data
+        mock_load.return_value = DataSnapshot.from_documents(
+            endpoints=mock_endpoints_data
+        )
 
         result = search_endpoints("equities")
 
@@ -44,20 +50,24 @@ class TestSearchEndpointsSuccess:
         assert "/equities/master" in paths
         assert "/equities/bars/daily" in paths
 
-    @patch("j_quants_doc_mcp.tools.search._load_endpoints")
+    @patch("j_quants_doc_mcp.tools.search.get_snapshot")
     def test_search_by_description(self, mock_load, mock_endpoints_data):
         """説明文で検索できることを確認"""
-        mock_load.return_value = mock_endpoints_data
+        mock_load.return_value = DataSnapshot.from_documents(
+            endpoints=mock_endpoints_data
+        )
 
         result = search_endpoints("銘柄")
 
         assert result["count"] == 1
         assert result["results"][0]["name"] == "eq-master"
 
-    @patch("j_quants_doc_mcp.tools.search._load_endpoints")
+    @patch("j_quants_doc_mcp.tools.search.get_snapshot")
     def test_search_by_name_ja(self, mock_load, mock_endpoints_data):
         """日本語名で検索できることを確認"""
-        mock_load.return_value = mock_endpoints_data
+        mock_load.return_value = DataSnapshot.from_documents(
+            endpoints=mock_endpoints_data
+        )
 
         result = search_endpoints("上場銘柄一覧")
 
@@ -65,10 +75,12 @@ class TestSearchEndpointsSuccess:
         assert result["results"][0]["name"] == "eq-master"
         assert result["results"][0]["name_ja"] == "上場銘柄一覧"
 
-    @patch("j_quants_doc_mcp.tools.search._load_endpoints")
+    @patch("j_quants_doc_mcp.tools.search.get_snapshot")
     def test_search_by_name_en(self, mock_load, mock_endpoints_data):
         """英語名で検索できることを確認"""
-        mock_load.return_value = mock_endpoints_data
+        mock_load.return_value = DataSnapshot.from_documents(
+            endpoints=mock_endpoints_data
+        )
 
         result = search_endpoints("Listed Issue")
 
@@ -76,10 +88,12 @@ class TestSearchEndpointsSuccess:
         assert result["results"][0]["name"] == "eq-master"
         assert result["results"][0]["name_en"] == "Listed Issue Information"
 
-    @patch("j_quants_doc_mcp.tools.search._load_endpoints")
+    @patch("j_quants_doc_mcp.tools.search.get_snapshot")
     def test_search_result_includes_name_ja_en(self, mock_load, mock_endpoints_data):
         """検索結果にname_ja/name_enが含まれることを確認"""
-        mock_load.return_value = mock_endpoints_data
+        mock_load.return_value = DataSnapshot.from_documents(
+            endpoints=mock_endpoints_data
+        )
 
         result = search_endpoints("eq-master")
 
@@ -87,30 +101,36 @@ class TestSearchEndpointsSuccess:
         assert "name_ja" in result["results"][0]
         assert "name_en" in result["results"][0]
 
-    @patch("j_quants_doc_mcp.tools.search._load_endpoints")
+    @patch("j_quants_doc_mcp.tools.search.get_snapshot")
     def test_search_with_category(self, mock_load, mock_endpoints_data):
         """カテゴリフィルタで検索できることを確認"""
-        mock_load.return_value = mock_endpoints_data
+        mock_load.return_value = DataSnapshot.from_documents(
+            endpoints=mock_endpoints_data
+        )
 
         result = search_endpoints("master", category="equities")
 
         assert result["count"] >= 1
         assert any(r["name"] == "eq-master" for r in result["results"])
 
-    @patch("j_quants_doc_mcp.tools.search._load_endpoints")
+    @patch("j_quants_doc_mcp.tools.search.get_snapshot")
     def test_search_case_insensitive(self, mock_load, mock_endpoints_data):
         """大文字小文字を区別せず検索できることを確認"""
-        mock_load.return_value = mock_endpoints_data
+        mock_load.return_value = DataSnapshot.from_documents(
+            endpoints=mock_endpoints_data
+        )
 
         result = search_endpoints("EQ-MASTER")
 
         assert result["count"] == 1
         assert result["results"][0]["name"] == "eq-master"
 
-    @patch("j_quants_doc_mcp.tools.search._load_endpoints")
+    @patch("j_quants_doc_mcp.tools.search.get_snapshot")
     def test_search_no_results(self, mock_load, mock_endpoints_data):
         """該当なしの場合、空の結果が返ることを確認"""
-        mock_load.return_value = mock_endpoints_data
+        mock_load.return_value = DataSnapshot.from_documents(
+            endpoints=mock_endpoints_data
+        )
 
         result = search_endpoints("nonexistent")
 
@@ -128,7 +148,7 @@ class TestSearchEndpointsError:
         assert "error" in result
         assert result["error_type"] == "ValidationError"
 
-    @patch("j_quants_doc_mcp.tools.search._load_endpoints")
+    @patch("j_quants_doc_mcp.tools.search.get_snapshot")
     def test_internal_error(self, mock_load):
         """内部エラーが適切にハンドリングされることを確認"""
         mock_load.side_effect = Exception("Test error")
@@ -137,3 +157,105 @@ class TestSearchEndpointsError:
 
         assert "error" in result
         assert result["error_type"] == "InternalError"
+
+
+class TestSearchEndpointsRanking:
+    """search_endpoints のランキングのテスト(実データ)"""
+
+    def test_multi_word_query(self):
+        """空白区切りの複数語で検索できることを確認"""
+        result = search_endpoints("株価 四本値")
+
+        assert result["count"] > 0
+        assert result["results"][0]["name"] == "eq-bars-daily"
+
+    def test_multi_word_query_with_unmatched_term(self):
+        """一部の語がどのエンドポイントにも含まれない場合も、他の語で検索できることを確認"""
+        result = search_endpoints("株価 日次")
+
+        assert result["results"] == search_endpoints("株価")["results"]
+        assert result["results"][0]["name"] == "eq-bars-daily"
+
+    def test_all_terms_required_when_possible(self):
+        """全ての語を含むエンドポイントがある場合はそれだけを返すことを確認"""
+        result = search_endpoints("信用 残高")
+
+        assert result["count"] > 0
+        for item in result["results"]:
+            text = item["name_ja"] + item["description"]
+            assert "信用" in text
+            assert "残高" in text
+
+    def test_fallback_ranks_by_matched_terms(self):
+        """全ての語を含むエンドポイントがない場合は、含む語の数が多い順に返すことを確認"""
+        result = search_endpoints("株価 四本値 zzz")
+
+        assert result["results"][0]["name"] == "eq-bars-daily"
+        matched = [
+            sum(
+                term in item["name_ja"] + item["description"]
+                for term in ("株価", "四本値")
+            )
+            for item in result["results"]
+        ]
+        assert matched == sorted(matched, reverse=True)
+        assert matched[0] == 2
+        assert matched[-1] == 1
+
+    def test_japanese_nonsense_query(self):
+        """どのエンドポイントにも含まれない日本語の語では結果が空になることを確認"""
+        assert search_endpoints("存在しないキーワード")["results"] == []
+
+    @pytest.mark.parametrize("keyword", ["株", "a"])
+    def test_single_character_query(self, keyword):
+        """1文字の検索でも、その文字を含むエンドポイントがスコア付きで返ることを確認"""
+        result = search_endpoints(keyword)
+
+        assert result["count"] > 0
+        for item in result["results"]:
+            assert item["score"] > 0
+            assert keyword in " ".join(
+                item[key].lower()
+                for key in ("name", "name_ja", "name_en", "path", "description")
+            )
+
+    def test_no_zero_score_results(self):
+        """部分文字列としてのみ一致した結果にもスコアが付くことを確認"""
+        result = search_endpoints("mast")
+
+        assert [item["name"] for item in result["results"]] == ["eq-master"]
+        assert result["results"][0]["score"] > 0
+
+    def test_results_sorted_by_score(self):
+        """結果がスコアの降順に並ぶことを確認"""
+        result = search_endpoints("equities")
+
+        scores = [item["score"] for item in result["results"]]
+        assert scores == sorted(scores, reverse=True)
+
+    def test_name_match_ranks_first(self):
+        """名前に一致するエンドポイントが説明のみの一致より上位になることを確認"""
+        result = search_endpoints("財務")
+
+        assert result["results"][0]["name"] in ["fin-summary", "fin-details"]
+
+    def test_limit(self):
+        """limit で件数を制限できることを確認"""
+        full = search_endpoints("equities")
+        limited = search_endpoints("equities", limit=2)
+
+        assert limited["count"] == 2
+        assert limited["results"] == full["results"][:2]
+
+    def test_invalid_limit(self):
+        """limit が1未満の場合にバリデーションエラーになることを確認"""
+        result = search_endpoints("equities", limit=0)
+
+        assert "error" in result
+        assert result["error_type"] == "ValidationError"
+
+    def test_full_width_query(self):
+        """全角英数字でも検索できることを確認"""
+        result = search_endpoints("ＴＯＰＩＸ")
+
+        assert any(r["name"] == "idx-bars-daily-topix" for r in result["results"])
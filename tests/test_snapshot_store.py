@@ -0,0 +1,371 @@
+"""データスナップショットとストアのユニットテスト"""
+
+import json
+import os
+import pickle
+from unittest.mock import patch
+
+import pytest
+
+from j_quants_doc_mcp.resources import store
+from j_quants_doc_mcp.resources.snapshot import DataSnapshot, FrozenDict, FrozenList
+from j_quants_doc_mcp.resources.specifications import (
+    COMPILED_SNAPSHOT_FILE,
+    DATA_FILES,
+    DataLoadError,
+    compile_snapshot,
+    get_data_directory,
+    load_snapshot,
+)
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    """同梱データをコピーした一時データディレクトリを返す"""
+    for file_name in DATA_FILES:
+        source = get_data_directory() / file_name
+        (tmp_path / file_name).write_bytes(source.read_bytes())
+    return tmp_path
+
+
+class TestDataSnapshot:
+    """DataSnapshot のテストクラス"""
+
+    def test_load_snapshot_default_path(self):
+        """デフォルトパスから全データを読み込めることを確認"""
+        snapshot = load_snapshot()
+
+        assert len(snapshot.endpoints) > 0
+        assert len(snapshot.faqs) > 0
+        assert len(snapshot.reference_data) > 0
+        assert len(snapshot.patterns) > 0
+        assert snapshot.version
+
+    def test_snapshot_is_frozen(self):
+        """スナップショットのデータが変更できないことを確認"""
+        snapshot = load_snapshot()
+        endpoint = snapshot.endpoints[0]
+
+        assert isinstance(endpoint, FrozenDict)
+        assert isinstance(endpoint["parameters"], FrozenList)
+        with pytest.raises(TypeError):
+            endpoint["name"] = "changed"
+        with pytest.raises(TypeError):
+            endpoint["parameters"].append({})
+        with pytest.raises(TypeError):
+            snapshot.faqs.clear()
+
+    def test_frozen_data_is_json_compatible(self):
+        """凍結したデータがそのままJSONシリアライズできることを確認"""
+        snapshot = load_snapshot()
+
+        dumped = json.loads(json.dumps(snapshot.endpoints[0], ensure_ascii=False))
+        assert dumped == snapshot.endpoints[0]
+
+    def test_snapshot_pickle_roundtrip(self):
+        """スナップショットがpickleで往復できることを確認"""
+        snapshot = load_snapshot()
+
+        restored = pickle.loads(pickle.dumps(snapshot))
+        assert restored == snapshot
+        assert isinstance(restored.endpoints[0], FrozenDict)
+        assert restored.find_endpoint("eq-master") == snapshot.find_endpoint(
+            "eq-master"
+        )
+        assert restored.property_index.get("Mkt") == snapshot.property_index.get("Mkt")
+
+    def test_version_changes_with_content(self, data_dir):
+        """データ内容が変わるとバージョンが変わることを確認"""
+        before = load_snapshot(data_dir)
+
+        faq_path = data_dir / "faq.json"
+        data = json.loads(faq_path.read_text(encoding="utf-8"))
+        data["faqs"] = data["faqs"][:1]
+        faq_path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+
+        after = load_snapshot(data_dir)
+        assert len(after.faqs) == 1
+        assert after.version != before.version
+
+    def test_load_snapshot_missing_file(self, data_dir):
+        """データファイルが欠けている場合にエラーになることを確認"""
+        (data_dir / "faq.json").unlink()
+
+        with pytest.raises(DataLoadError, match="not found"):
+            load_snapshot(data_dir)
+
+    def test_load_snapshot_invalid_patterns(self, data_dir):
+        """patterns.json の検証に失敗した場合にエラーになることを確認"""
+        (data_dir / "patterns.json").write_text(
+            json.dumps({"patterns": [{"pattern_name": "invalid"}]}), encoding="utf-8"
+        )
+
+        with pytest.raises(DataLoadError, match="validation failed"):
+            load_snapshot(data_dir)
+
+    def test_load_snapshot_unexpected_structure(self, data_dir):
+        """JSONとして正しくても構造が想定と異なる場合にエラーになることを確認"""
+        (data_dir / "endpoints.json").write_text(
+            json.dumps({"endpoints": ["eq-master"]}), encoding="utf-8"
+        )
+
+        with pytest.raises(DataLoadError, match="Unexpected data structure"):
+            load_snapshot(data_dir, use_compiled=False)
+
+    def test_endpoint_index(self):
+        """名前・パス・旧パスからエンドポイントを引けることを確認"""
+        snapshot = load_snapshot()
+
+        assert snapshot.find_endpoint("eq-bars-daily")["name"] == "eq-bars-daily"
+        assert snapshot.find_endpoint("/equities/bars/daily")["name"] == "eq-bars-daily"
+        assert snapshot.find_endpoint("/prices/daily_quotes")["name"] == "eq-bars-daily"
+        assert snapshot.find_endpoint("nonexistent") is None
+
+    def test_endpoint_index_prefers_name(self):
+        """キーが重複する場合は名前が優先されることを確認"""
+        snapshot = DataSnapshot.from_documents(
+            endpoints={
+                "endpoints": [
+                    {"name": "a", "path": "b"},
+                    {"name": "b", "path": "/b"},
+                ]
+            }
+        )
+
+        assert snapshot.find_endpoint("b")["path"] == "/b"
+        assert snapshot.find_endpoint("/b")["name"] == "b"
+
+    def test_from_documents_defaults(self):
+        """省略したドキュメントが空として扱われることを確認"""
+        snapshot = DataSnapshot.from_documents(faqs={"faqs": []})
+
+        assert snapshot.endpoints == []
+        assert snapshot.faqs == []
+        assert snapshot.version
+
+
+class TestCompiledSnapshot:
+    """コンパイル済みスナップショットのテストクラス"""
+
+    def test_compile_snapshot(self, data_dir):
+        """コンパイル済みスナップショットを書き出せることを確認"""
+        output_path = compile_snapshot(data_dir)
+
+        assert output_path == data_dir / COMPILED_SNAPSHOT_FILE
+        assert output_path.exists()
+
+    def test_load_uses_compiled_snapshot(self, data_dir):
+        """コンパイル済みスナップショットがあればJSONを解析しないことを確認"""
+        expected = load_snapshot(data_dir)
+        compile_snapshot(data_dir)
+
+        with patch(
+            "j_quants_doc_mcp.resources.specifications.json.loads",
+            side_effect=AssertionError("JSON should not be parsed"),
+        ):
+            snapshot = load_snapshot(data_dir)
+
+        assert snapshot == expected
+
+    def test_stale_compiled_snapshot_is_ignored(self, data_dir):
+        """データファイルが変更された場合はJSONから読み込むことを確認"""
+        compile_snapshot(data_dir)
+
+        faq_path = data_dir / "faq.json"
+        data = json.loads(faq_path.read_text(encoding="utf-8"))
+        data["faqs"] = data["faqs"][:1]
+        faq_path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+
+        snapshot = load_snapshot(data_dir)
+        assert len(snapshot.faqs) == 1
+
+    def test_old_format_is_ignored(self, data_dir):
+        """形式が異なるコンパイル済みスナップショットを無視することを確認"""
+        expected = load_snapshot(data_dir)
+        with open(data_dir / COMPILED_SNAPSHOT_FILE, "wb") as f:
+            pickle.dump({"format": -1, "snapshot": None}, f)
+
+        assert load_snapshot(data_dir) == expected
+
+    @pytest.mark.parametrize(
+        "content", [b"", b"not a pickle", pickle.dumps({"format": 1})[:-3]]
+    )
+    def test_unreadable_compiled_snapshot_is_ignored(self, data_dir, content):
+        """壊れたコンパイル済みスナップショットを無視してJSONから読み込むことを確認"""
+        expected = load_snapshot(data_dir, use_compiled=False)
+        (data_dir / COMPILED_SNAPSHOT_FILE).write_bytes(content)
+
+        assert load_snapshot(data_dir) == expected
+
+    def test_unexpected_unpickling_error_is_raised(self, data_dir):
+        """想定外の例外はJSONからの読み込みで隠さずに送出することを確認"""
+        compile_snapshot(data_dir)
+
+        with (
+            patch(
+                "j_quants_doc_mcp.resources.specifications.pickle.load",
+                side_effect=RuntimeError("bug"),
+            ),
+            pytest.raises(RuntimeError, match="bug"),
+        ):
+            load_snapshot(data_dir)
+
+    def test_compile_validates_endpoints(self, data_dir):
+        """endpoints.json の検証に失敗した場合は書き出さないことを確認"""
+        (data_dir / "endpoints.json").write_text(
+            json.dumps({"endpoints": [{"name": "invalid"}]}), encoding="utf-8"
+        )
+
+        with pytest.raises(DataLoadError):
+            compile_snapshot(data_dir)
+        assert not (data_dir / COMPILED_SNAPSHOT_FILE).exists()
+
+
+class TestStore:
+    """プロセス共有ストアのテストクラス"""
+
+    def test_get_snapshot_is_shared(self):
+        """複数回の取得で同じスナップショットが返ることを確認"""
+        assert store.get_snapshot() is store.get_snapshot()
+
+    def test_set_snapshot(self):
+        """スナップショットを差し替えられることを確認"""
+        original = store.get_snapshot()
+        replacement = DataSnapshot.from_documents()
+        try:
+            store.set_snapshot(replacement)
+            assert store.get_snapshot() is replacement
+        finally:
+            store.set_snapshot(original)
+
+    def test_pin_snapshot(self):
+        """固定中は差し替え後も同じスナップショットが返ることを確認"""
+        original = store.get_snapshot()
+        replacement = DataSnapshot.from_documents()
+        try:
+            with store.pin_snapshot() as pinned:
+                store.set_snapshot(replacement)
+                assert pinned is original
+                assert store.get_snapshot() is original
+            assert store.get_snapshot() is replacement
+        finally:
+            store.set_snapshot(original)
+
+
+class TestSnapshotWatcher:
+    """SnapshotWatcher のテストクラス"""
+
+    @pytest.fixture(autouse=True)
+    def restore_snapshot(self):
+        """テスト後に元のスナップショットへ戻す"""
+        original = store.get_snapshot()
+        yield
+        store.set_snapshot(original)
+
+    def _touch(self, path):
+        # 更新時刻の分解能に依存しないように明示的に進める
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    def _rewrite_faqs(self, data_dir, faqs):
+        faq_path = data_dir / "faq.json"
+        faq_path.write_text(
+            json.dumps({"faqs": faqs}, ensure_ascii=False), encoding="utf-8"
+        )
+        self._touch(faq_path)
+
+    def test_no_change_keeps_snapshot(self, data_dir):
+        """変更がない場合はスナップショットを差し替えないことを確認"""
+        store.set_snapshot(load_snapshot(data_dir))
+        current = store.get_snapshot()
+        watcher = store.SnapshotWatcher(data_dir=data_dir)
+
+        assert watcher.check() is False
+        assert store.get_snapshot() is current
+
+    def test_change_swaps_snapshot(self, data_dir):
+        """データファイルの変更を検知して差し替えることを確認"""
+        store.set_snapshot(load_snapshot(data_dir))
+        previous = store.get_snapshot()
+        watcher = store.SnapshotWatcher(data_dir=data_dir)
+
+        faqs = list(previous.faqs[:2])
+        self._rewrite_faqs(data_dir, faqs)
+
+        assert watcher.check() is True
+        current = store.get_snapshot()
+        assert current is not previous
+        assert len(current.faqs) == 2
+        assert current.version != previous.version
+        # 差し替え前に取得したスナップショットは変化しない
+        assert len(previous.faqs) > 2
+
+    def test_touch_without_content_change(self, data_dir):
+        """内容が同じ場合は差し替えないことを確認"""
+        store.set_snapshot(load_snapshot(data_dir))
+        current = store.get_snapshot()
+        watcher = store.SnapshotWatcher(data_dir=data_dir)
+
+        faq_path = data_dir / "faq.json"
+        faq_path.write_bytes(faq_path.read_bytes())
+        self._touch(faq_path)
+
+        assert watcher.check() is False
+        assert store.get_snapshot() is current
+
+    @pytest.mark.parametrize("interval", [0, -1.0, float("nan"), float("inf")])
+    def test_invalid_interval(self, data_dir, interval):
+        """チェック間隔が正の有限値でない場合に ValueError になることを確認"""
+        with pytest.raises(ValueError):
+            store.SnapshotWatcher(data_dir=data_dir, interval=interval)
+
+    def test_failed_reload_is_retried(self, data_dir):
+        """読み込みに失敗した変更は、ファイルが再び変わらなくても次回に読み込み直すことを確認"""
+        store.set_snapshot(load_snapshot(data_dir))
+        previous = store.get_snapshot()
+        watcher = store.SnapshotWatcher(data_dir=data_dir)
+        self._rewrite_faqs(data_dir, list(previous.faqs[:2]))
+
+        with patch.object(store, "load_snapshot", side_effect=DataLoadError("partial")):
+            assert watcher.check() is False
+        assert store.get_snapshot() is previous
+
+        assert watcher.check() is True
+        assert len(store.get_snapshot().faqs) == 2
+
+    def test_invalid_data_keeps_snapshot(self, data_dir):
+        """不正なデータに更新された場合は現在のスナップショットを維持することを確認"""
+        store.set_snapshot(load_snapshot(data_dir))
+        current = store.get_snapshot()
+        watcher = store.SnapshotWatcher(data_dir=data_dir)
+
+        (data_dir / "endpoints.json").write_text("{invalid", encoding="utf-8")
+
+        assert watcher.check() is False
+        assert store.get_snapshot() is current
+
+    def test_unexpected_structure_keeps_snapshot(self, data_dir):
+        """構造が想定と異なるデータに更新された場合も現在のスナップショットを維持することを確認"""
+        store.set_snapshot(load_snapshot(data_dir))
+        current = store.get_snapshot()
+        watcher = store.SnapshotWatcher(data_dir=data_dir)
+
+        endpoints_path = data_dir / "endpoints.json"
+        endpoints_path.write_text(
+            json.dumps({"endpoints": ["eq-master"]}), encoding="utf-8"
+        )
+        self._touch(endpoints_path)
+
+        assert watcher.check() is False
+        assert store.get_snapshot() is current
+
+    def test_unexpected_error_is_not_swallowed(self, data_dir):
+        """想定外の例外は握りつぶさずに送出することを確認"""
+        watcher = store.SnapshotWatcher(data_dir=data_dir)
+        self._rewrite_faqs(data_dir, [])
+
+        with (
+            patch.object(store, "load_snapshot", side_effect=RuntimeError("bug")),
+            pytest.raises(RuntimeError, match="bug"),
+        ):
+            watcher.check()
@@ -0,0 +1,107 @@
+"""コード生成テンプレートのレジストリのユニットテスト"""
+
+from unittest.mock import patch
+
+import pytest
+from jinja2 import ModuleLoader
+
+from j_quants_doc_mcp.resources import templates
+from j_quants_doc_mcp.resources.specifications import get_templates_directory
+from j_quants_doc_mcp.tools.codegen import (
+    PYTHON_TEMPLATE,
+    clear_sample_code_cache,
+    generate_sample_code,
+)
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """テストの前後でテンプレートと生成結果のキャッシュを破棄する"""
+    templates.clear_template_cache()
+    clear_sample_code_cache()
+    yield
+    templates.clear_template_cache()
+    clear_sample_code_cache()
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    """プリコンパイル済みテンプレートの出力先となるデータディレクトリを返す"""
+    with patch(
+        "j_quants_doc_mcp.resources.templates.get_data_directory",
+        return_value=tmp_path,
+    ):
+        yield tmp_path
+
+
+def _uses_module_loader() -> bool:
+    loader = templates._get_environment().loader
+    return any(
+        isinstance(item, ModuleLoader) for item in getattr(loader, "loaders", [])
+    )
+
+
+class TestTemplateRegistry:
+    """テンプレートレジストリのテストクラス"""
+
+    def test_template_is_compiled_once(self, data_dir):
+        """同じテンプレートは一度だけコンパイルされることを確認"""
+        first = templates.get_template(PYTHON_TEMPLATE)
+
+        with patch("jinja2.Environment.get_template") as mock_get_template:
+            second = templates.get_template(PYTHON_TEMPLATE)
+
+        assert second is first
+        mock_get_template.assert_not_called()
+
+    def test_clear_template_cache(self, data_dir):
+        """キャッシュを破棄するとテンプレートを読み込み直すことを確認"""
+        first = templates.get_template(PYTHON_TEMPLATE)
+        templates.clear_template_cache()
+
+        assert templates.get_template(PYTHON_TEMPLATE) is not first
+
+    def test_templates_version(self, tmp_path):
+        """テンプレートの内容が変わるとバージョンが変わることを確認"""
+        (tmp_path / "a.jinja2").write_text("{{ x }}", encoding="utf-8")
+        before = templates.compute_templates_version(tmp_path)
+
+        (tmp_path / "a.jinja2").write_text("{{ y }}", encoding="utf-8")
+
+        assert templates.compute_templates_version(tmp_path) != before
+        assert templates.compute_templates_version() == (
+            templates.compute_templates_version(get_templates_directory())
+        )
+
+
+class TestCompiledTemplates:
+    """プリコンパイル済みテンプレートのテストクラス"""
+
+    def test_compile_templates(self, data_dir):
+        """テンプレートとマニフェストが書き出されることを確認"""
+        output_dir = templates.compile_templates()
+
+        assert output_dir == data_dir / templates.COMPILED_TEMPLATES_DIR
+        assert (output_dir / templates.MANIFEST_FILE).exists()
+        assert list(output_dir.glob("tmpl_*.py"))
+
+    def test_uses_compiled_templates(self, data_dir):
+        """プリコンパイル済みテンプレートで同じコードが生成されることを確認"""
+        expected = generate_sample_code("eq-master")
+        templates.compile_templates()
+        templates.clear_template_cache()
+        clear_sample_code_cache()
+
+        assert _uses_module_loader()
+        assert generate_sample_code("eq-master") == expected
+
+    def test_stale_compiled_templates_are_ignored(self, data_dir):
+        """テンプレートの内容が変わった場合はプリコンパイル結果を使わないことを確認"""
+        templates.compile_templates()
+        templates.clear_template_cache()
+
+        with patch(
+            "j_quants_doc_mcp.resources.templates.compute_templates_version",
+            return_value="changed",
+        ):
+            assert not _uses_module_loader()
@@ -1,9 +1,15 @@
 """ツールの統合テスト(想定外入力のエラーメッセージ確認)。"""
 
+from unittest.mock import patch
+
+from j_quants_doc_mcp.resources import store
+from j_quants_doc_mcp.resources.snapshot import DataSnapshot
 from j_quants_doc_mcp.server import (
     answer_question,
     describe_endpoint,
+    describe_endpoints,
     generate_sample_code,
+    generate_sample_codes,
     search_endpoints,
 )
 
@@ -198,3 +204,82 @@ class TestErrorMessageQuality:
         assert "error_type" in not_found_error
         assert "message" in not_found_error
         assert "details" in not_found_error
+
+
+class TestBatchToolsIntegration:
+    """describe_endpoints / generate_sample_codes の統合テスト。"""
+
+    def test_describe_endpoints(self):
+        """結果がエンドポイント名をキーに返されることを確認。"""
+        result = describe_endpoints(["eq-master", "/equities/bars/daily"])
+
+        assert result["count"] == 2
+        assert result["error_count"] == 0
+        assert result["data_version"] == store.get_snapshot().version
+        assert result["results"]["eq-master"]["name"] == "eq-master"
+        assert result["results"]["/equities/bars/daily"]["name"] == "eq-bars-daily"
+
+    def test_per_item_errors(self):
+        """一部のエンドポイントのエラーが他の結果に影響しないことを確認。"""
+        result = describe_endpoints(["eq-master", "nonexistent", "  "])
+
+        assert result["count"] == 3
+        assert result["error_count"] == 2
+        assert result["results"]["eq-master"]["name"] == "eq-master"
+        assert result["results"]["nonexistent"]["error_type"] == "NotFoundError"
+        assert result["results"]["  "]["error_type"] == "ValidationError"
+
+    def test_duplicate_names(self):
+        """重複したエンドポイント名は1回だけ処理されることを確認。"""
+        result = describe_endpoints(["eq-master", "eq-master"])
+
+        assert result["count"] == 1
+
+    def test_empty_list_returns_validation_error(self):
+        """空のリストでバリデーションエラーが返されることを確認。"""
+        result = describe_endpoints([])
+
+        assert result["error_type"] == "ValidationError"
+        assert result["details"]["field"] == "endpoint_names"
+
+    def test_too_many_names_returns_validation_error(self):
+        """上限を超える件数でバリデーションエラーが返されることを確認。"""
+        result = describe_endpoints([f"endpoint-{i}" for i in range(51)])
+
+        assert result["error_type"] == "ValidationError"
+
+    def test_generate_sample_codes(self):
+        """複数のサンプルコードを共通の言語・追加パラメータで生成できることを確認。"""
+        result = generate_sample_codes(
+            ["eq-master", "eq-bars-daily", "nonexistent"],
+            language="python-async",
+            params={"plan": "Standard"},
+        )
+
+        assert result["error_count"] == 1
+        for name in ("eq-master", "eq-bars-daily"):
+            code = result["results"][name]
+            assert "httpx.AsyncClient" in code
+            assert 'PLAN = "Standard"' in code
+        assert result["results"]["nonexistent"]["error_type"] == "NotFoundError"
+
+    def test_uses_one_snapshot(self):
+        """途中でスナップショットが差し替えられても同じデータを参照することを確認。"""
+        original = store.get_snapshot()
+        calls = []
+
+        def describe_and_swap(endpoint_name):
+            calls.append(endpoint_name)
+            # 1件目の処理後にデータを空のスナップショットへ差し替える
+            store.set_snapshot(DataSnapshot.from_documents())
+            return describe_endpoint(endpoint_name)
+
+        try:
+            with patch("j_quants_doc_mcp.server.describe_endpoint", describe_and_swap):
+                result = describe_endpoints(["eq-master", "eq-bars-daily"])
+        finally:
+            store.set_snapshot(original)
+
+        assert calls == ["eq-master", "eq-bars-daily"]
+        assert result["error_count"] == 0
+        assert result["data_version"] == original.version